@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import List
 
 
 class Settings(BaseSettings):
@@ -8,15 +9,104 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./syllabus_parser.db"
+    database_echo: bool = False           # Log every SQL statement
+    database_pool_size: int = 5           # Pooled connections (concurrent readers)
+    database_max_overflow: int = 5
+    database_pool_timeout: float = 30.0
+
+    # SQLite pragmas applied to every new connection
+    sqlite_journal_mode: str = "WAL"      # Readers don't block the writer, and vice versa
+    sqlite_synchronous: str = "NORMAL"    # Safe with WAL; fsync at checkpoints, not every commit
+    sqlite_busy_timeout_ms: int = 5000    # Wait for the write lock instead of "database is locked"
+    sqlite_cache_size_kb: int = 64000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
 
     # Ollama
     ollama_base_url: str = "http://localhost:11434"
-    ollama_model: str = "llama3.1"
+    ollama_model: str = "llama3.1"        # Model name sent to whichever backend is in use
+    ollama_max_connections: int = 10      # Pooled connections shared by all jobs; raised to fit every endpoint's slots
+    ollama_max_keepalive: int = 5         # Idle connections kept open for reuse
+    ollama_keepalive_expiry: float = 60.0
+    ollama_connect_timeout: float = 5.0
+    ollama_read_timeout: float = 180.0
+    ollama_pool_timeout: float = 60.0     # Max wait for a free pooled connection
+    ollama_http2: bool = True             # Used only if the h2 package is installed
+    ollama_streaming: bool = True         # Read responses as they generate
+    ollama_fallback_strategy: str = "sequential"  # or "race": send both prompt variants at once
+    ollama_empty_abort_tokens: int = 20   # Give up on a whitespace-only JSON stream after this many tokens
+    ollama_chunking: bool = True          # Split long syllabi instead of truncating them
+    ollama_chunk_size: int = 12000        # Max characters of syllabus text per prompt
+    ollama_chunk_overlap: int = 500       # Characters repeated between neighbouring chunks
+    ollama_chunk_concurrency: int = 3     # Chunks of one syllabus sent to Ollama at once
+
+    # LLM backend
+    llm_backend: str = "ollama"           # "ollama", "openai" (llama.cpp / vLLM server) or "fake"
+    llm_base_url: str = ""                # Server for the chosen backend; defaults to ollama_base_url
+    ollama_endpoints: List[str] = []      # Several servers to balance across; overrides the single base URL
+    ollama_endpoint_concurrency: int = 4  # Requests in flight per endpoint
+    ollama_health_interval: float = 15.0  # Seconds between health checks of each endpoint
+    ollama_health_timeout: float = 3.0
+    ollama_breaker_failures: int = 3      # Failures in a row that eject an endpoint
+    ollama_breaker_cooldown: float = 30.0 # Seconds before an ejected endpoint gets a trial request
+    llm_api_key: str = ""                 # Bearer token for the openai backend, if the server wants one
+    llm_record_path: str = ""             # Append every prompt/response pair here (replayable by stub_llm_server.py)
+    fake_llm_latency: float = 0.5         # Fake backend: seconds before the first token
+    fake_llm_tokens_per_second: float = 200.0
 
     # File uploads
     upload_dir: Path = Path("uploads")
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_extensions: set = {".pdf", ".docx", ".doc", ".txt"}
+    upload_chunk_size: int = 1024 * 1024   # Bytes copied to disk per read when saving uploads
+    batch_max_files: int = 200             # Files accepted by one /upload/batch request (zip members included)
+
+    # API listing
+    assignments_page_size: int = 200      # Default page size for GET /api/assignments
+    assignments_max_page_size: int = 1000
+
+    stats_use_summary: bool = True        # Serve /api/assignments/stats from the trigger-maintained summary table
+    workload_default_days: int = 112      # /api/assignments/workload range when no end is given (16 weeks)
+    workload_max_days: int = 366
+
+    export_gzip: bool = True              # gzip exports for clients that send Accept-Encoding: gzip
+    export_cache_max_bytes: int = 20 * 1024 * 1024       # Rendered exports kept in memory
+    export_cache_max_entry_bytes: int = 5 * 1024 * 1024  # Larger exports are streamed but not cached
+
+    # Rule-based fast path: skip the LLM when a syllabus has a clearly dated schedule
+    rules_extractor_enabled: bool = True
+    rules_min_confidence: float = 0.8   # Share of assignment lines the rules could date
+    rules_min_assignments: int = 3      # Fewer items than this lowers confidence proportionally
+
+    # Relevance filter: send the LLM only the sections that look like they list assignments
+    relevance_filter_enabled: bool = True
+    relevance_min_score: float = 2.0    # Section score (weighted hits per 100 words) needed to be kept
+    relevance_max_chars: int = 24000    # Prompt budget for kept sections
+    relevance_min_chars: int = 4000     # Shorter syllabi are sent whole
+
+    # Document parsing
+    parse_workers: int = 2             # Processes in the parsing pool
+    parse_timeout: float = 120.0       # Seconds before a parse is killed
+    parse_pages_per_chunk: int = 10    # PDFs longer than this are split across workers
+    parse_page_cache_size: int = 2000  # Parsed PDF pages kept in memory so retries skip layout analysis
+
+    # Extraction cache
+    extraction_cache_enabled: bool = True
+    extraction_cache_max_bytes: int = 50 * 1024 * 1024  # 50MB, least recently used evicted first
+
+    # Background processing
+    worker_concurrency: int = 2      # Jobs processed at the same time
+    parse_concurrency: int = 2       # Documents parsed at the same time
+    llm_concurrency: int = 1         # Concurrent requests to Ollama
+    persist_concurrency: int = 1     # Concurrent result writes to the database
+    persist_batch_size: int = 50     # Streamed assignments written per INSERT; the rest commit with the final status
+    job_max_attempts: int = 3        # Restarts a job survives before it is failed
+    job_poll_interval: float = 5.0   # Seconds an idle worker waits before re-checking the queue
+    reestimate_batch_size: int = 1000  # Assignments re-estimated per read/UPDATE round trip
+
+    # Progress events (SSE)
+    events_queue_size: int = 256      # Events buffered per subscriber before the oldest are dropped
+    events_history_size: int = 1000   # Syllabi whose latest status is kept for late subscribers
+    events_heartbeat: float = 15.0    # Seconds between keep-alive comments on an idle stream
 
     class Config:
         env_file = ".env"
@@ -1,21 +1,24 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, or_
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
-from datetime import date, timedelta
-
-from .models import SyllabusDB, AssignmentDB
+from sqlalchemy import select, insert, delete, update, func, or_, and_, case, bindparam, cast, Integer
+from sqlalchemy.orm import selectinload, defer
+from typing import AsyncIterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import base64
+import binascii
+import json
+
+from .models import SyllabusDB, AssignmentDB, ProcessingJobDB, ExtractionCacheDB, AssignmentSummaryDB, DataVersionDB
 from app.models.assignment import SyllabusCreate, AssignmentCreate
 
 
-async def create_syllabus(db: AsyncSession, syllabus: SyllabusCreate) -> SyllabusDB:
+async def create_syllabus(db: AsyncSession, syllabus: SyllabusCreate, status: str = "processing") -> SyllabusDB:
     db_syllabus = SyllabusDB(
         filename=syllabus.filename,
         course_name=syllabus.course_name,
         instructor=syllabus.instructor,
         semester=syllabus.semester,
         raw_text=syllabus.raw_text,
-        processing_status="processing"
+        processing_status=status
     )
     db.add(db_syllabus)
     await db.commit()
@@ -32,17 +35,45 @@ async def get_syllabus(db: AsyncSession, syllabus_id: int) -> Optional[SyllabusD
     return result.scalar_one_or_none()
 
 
-async def get_all_syllabi(db: AsyncSession) -> List[SyllabusDB]:
+def _assignment_count():
+    return (
+        select(func.count(AssignmentDB.id))
+        .where(AssignmentDB.syllabus_id == SyllabusDB.id)
+        .correlate(SyllabusDB)
+        .scalar_subquery()
+        .label("assignment_count")
+    )
+
+
+async def list_syllabi(db: AsyncSession, limit: int = 100, offset: int = 0) -> List[Tuple[SyllabusDB, int]]:
+    """Newest-first page of syllabi with their assignment counts.
+
+    raw_text is deferred and assignments are counted in a subquery, so
+    neither the document text nor the assignment rows are loaded.
+    """
     result = await db.execute(
-        select(SyllabusDB)
-        .options(selectinload(SyllabusDB.assignments))
-        .order_by(SyllabusDB.upload_date.desc())
+        select(SyllabusDB, _assignment_count())
+        .options(defer(SyllabusDB.raw_text))
+        .order_by(SyllabusDB.upload_date.desc(), SyllabusDB.id.desc())
+        .limit(limit)
+        .offset(offset)
     )
-    return list(result.scalars().all())
+    return [(syllabus, count) for syllabus, count in result.all()]
+
+
+async def get_syllabus_summary(db: AsyncSession, syllabus_id: int) -> Optional[Tuple[SyllabusDB, int]]:
+    """A syllabus (without raw_text) and its assignment count."""
+    result = await db.execute(
+        select(SyllabusDB, _assignment_count())
+        .options(defer(SyllabusDB.raw_text))
+        .where(SyllabusDB.id == syllabus_id)
+    )
+    row = result.first()
+    return (row[0], row[1]) if row else None
 
 
 async def update_syllabus_status(db: AsyncSession, syllabus_id: int, status: str, course_name: str = None, instructor: str = None, semester: str = None):
-    syllabus = await get_syllabus(db, syllabus_id)
+    syllabus = await db.get(SyllabusDB, syllabus_id)
     if syllabus:
         syllabus.processing_status = status
         if course_name:
@@ -66,6 +97,87 @@ async def create_assignment(db: AsyncSession, syllabus_id: int, assignment_data:
     return db_assignment
 
 
+async def create_assignments_bulk(
+    db: AsyncSession,
+    syllabus_id: int,
+    assignments: List[dict],
+    status: str = None,
+    course_name: str = None,
+    instructor: str = None,
+    semester: str = None
+) -> int:
+    """Insert many assignments, and optionally update the syllabus, in one transaction.
+
+    Uses a single executemany INSERT and skips the per-row refresh that
+    create_assignment does. Returns the number of rows inserted.
+    """
+    columns = set(AssignmentDB.__table__.columns.keys()) - {"id", "syllabus_id", "created_at"}
+    now = datetime.utcnow()
+    rows = []
+    for assignment_data in assignments:
+        row = {key: assignment_data.get(key) for key in columns}
+        row["syllabus_id"] = syllabus_id
+        row["created_at"] = now
+        row["assignment_type"] = row["assignment_type"] or "other"
+        row["confidence_score"] = row["confidence_score"] or 0.0
+        row["hours_user_set"] = bool(row["hours_user_set"])
+        if isinstance(row["due_date"], str):
+            try:
+                row["due_date"] = date.fromisoformat(row["due_date"])
+            except ValueError:
+                row["due_date"] = None
+        rows.append(row)
+
+    if rows:
+        # Core insert on the table: the ORM bulk path would fill an explicit
+        # None from the column's Python default (estimated_hours=1.0)
+        await db.execute(insert(AssignmentDB.__table__), rows)
+
+    if status:
+        values = {"processing_status": status}
+        if course_name:
+            values["course_name"] = course_name
+        if instructor:
+            values["instructor"] = instructor
+        if semester:
+            values["semester"] = semester
+        await db.execute(
+            update(SyllabusDB).where(SyllabusDB.id == syllabus_id).values(**values)
+        )
+
+    await db.commit()
+    return len(rows)
+
+
+async def delete_assignments_for_syllabus(db: AsyncSession, syllabus_id: int) -> int:
+    """Remove assignments left over from an interrupted processing attempt."""
+    result = await db.execute(
+        delete(AssignmentDB).where(AssignmentDB.syllabus_id == syllabus_id)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def delete_assignments_by_titles(db: AsyncSession, syllabus_id: int, titles: List[str]) -> int:
+    """Remove a syllabus's assignments with these titles; committed by the caller's next write."""
+    result = await db.execute(
+        delete(AssignmentDB)
+        .where(AssignmentDB.syllabus_id == syllabus_id)
+        .where(AssignmentDB.title.in_(titles))
+    )
+    return result.rowcount
+
+
+async def fill_missing_course_name(db: AsyncSession, syllabus_id: int, course_name: str):
+    """Set the course name on rows saved before it was known; committed by the caller's next write."""
+    await db.execute(
+        update(AssignmentDB)
+        .where(AssignmentDB.syllabus_id == syllabus_id)
+        .where(AssignmentDB.course_name.is_(None))
+        .values(course_name=course_name)
+    )
+
+
 async def get_assignment(db: AsyncSession, assignment_id: int) -> Optional[AssignmentDB]:
     result = await db.execute(
         select(AssignmentDB).where(AssignmentDB.id == assignment_id)
@@ -81,6 +193,186 @@ async def get_all_assignments(db: AsyncSession, syllabus_id: Optional[int] = Non
     return list(result.scalars().all())
 
 
+async def stream_assignments(
+    db: AsyncSession,
+    syllabus_id: Optional[int] = None,
+    batch_size: int = 500
+) -> AsyncIterator[AssignmentDB]:
+    """Yield assignments in get_all_assignments order, fetching batch_size rows at a time."""
+    query = select(AssignmentDB).order_by(AssignmentDB.due_date.asc().nullslast(), AssignmentDB.id.asc())
+    if syllabus_id:
+        query = query.where(AssignmentDB.syllabus_id == syllabus_id)
+    result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+    async for assignment in result:
+        yield assignment
+
+
+# Sort keys accepted by list_assignments
+ASSIGNMENT_SORT_COLUMNS = {
+    "due_date": AssignmentDB.due_date,
+    "created_at": AssignmentDB.created_at,
+    "title": AssignmentDB.title,
+    "estimated_hours": AssignmentDB.estimated_hours,
+    "id": AssignmentDB.id,
+}
+
+
+def _encode_cursor(sort: str, descending: bool, value, last_id: int) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    payload = json.dumps({"s": sort, "d": descending, "v": value, "id": last_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> tuple:
+    """Return (value, id) from a cursor; raises ValueError if it is malformed or for another sort."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != sort or payload["d"] != descending:
+            raise ValueError("Cursor was created for a different sort order")
+        value, last_id = payload["v"], int(payload["id"])
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if value is not None and sort == "due_date":
+        value = date.fromisoformat(value)
+    elif value is not None and sort == "created_at":
+        value = datetime.fromisoformat(value)
+    return value, last_id
+
+
+async def list_assignments(
+    db: AsyncSession,
+    syllabus_id: Optional[int] = None,
+    assignment_type: Optional[str] = None,
+    course_name: Optional[str] = None,
+    due_after: Optional[date] = None,
+    due_before: Optional[date] = None,
+    sort: str = "due_date",
+    descending: bool = False,
+    limit: int = 200,
+    cursor: Optional[str] = None
+) -> Tuple[List[AssignmentDB], Optional[str]]:
+    """Filtered, sorted page of assignments using keyset pagination.
+
+    Rows are ordered by the sort column (NULLs last), then id as a
+    tiebreaker. Returns the page and a cursor for the next one, or None
+    when this is the last page.
+    """
+    column = ASSIGNMENT_SORT_COLUMNS[sort]
+    null_last = case((column.is_(None), 1), else_=0)
+    direction = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+    after = (lambda c, v: c < v) if descending else (lambda c, v: c > v)
+
+    query = select(AssignmentDB)
+    if syllabus_id:
+        query = query.where(AssignmentDB.syllabus_id == syllabus_id)
+    if assignment_type:
+        query = query.where(AssignmentDB.assignment_type == assignment_type)
+    if course_name:
+        query = query.where(AssignmentDB.course_name == course_name)
+    if due_after:
+        query = query.where(AssignmentDB.due_date >= due_after)
+    if due_before:
+        query = query.where(AssignmentDB.due_date <= due_before)
+
+    if cursor:
+        value, last_id = _decode_cursor(cursor, sort, descending)
+        if value is None:
+            # Already in the trailing NULL group: only id decides
+            query = query.where(and_(column.is_(None), after(AssignmentDB.id, last_id)))
+        else:
+            query = query.where(or_(
+                column.is_(None),
+                after(column, value),
+                and_(column == value, after(AssignmentDB.id, last_id))
+            ))
+
+    query = query.order_by(null_last.asc(), direction(column), direction(AssignmentDB.id)).limit(limit + 1)
+    result = await db.execute(query)
+    rows = list(result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(sort, descending, getattr(last, column.key), last.id)
+    return rows, next_cursor
+
+
+async def get_assignment_stats(db: AsyncSession, use_summary: bool = True) -> dict:
+    """Counts, overdue/upcoming and hours, aggregated in SQL per assignment type.
+
+    With use_summary the trigger-maintained assignment_summary table is
+    read instead of scanning assignments.
+    """
+    today = date.today()
+    if use_summary:
+        s = AssignmentSummaryDB
+        has_due = s.due_key != ""
+        query = select(
+            s.assignment_type,
+            func.sum(s.assignment_count),
+            func.sum(case((and_(has_due, s.due_key >= today.isoformat()), s.assignment_count), else_=0)),
+            func.sum(case((and_(has_due, s.due_key < today.isoformat()), s.assignment_count), else_=0)),
+            func.sum(s.total_hours)
+        ).group_by(s.assignment_type)
+    else:
+        a = AssignmentDB
+        assignment_type = func.coalesce(a.assignment_type, "other")
+        query = select(
+            assignment_type,
+            func.count(a.id),
+            func.sum(case((a.due_date >= today, 1), else_=0)),
+            func.sum(case((a.due_date < today, 1), else_=0)),
+            func.sum(func.coalesce(a.estimated_hours, 0))
+        ).group_by(assignment_type)
+
+    stats = {"total": 0, "upcoming": 0, "overdue": 0, "total_hours": 0.0, "by_type": {}}
+    for assignment_type, count, upcoming, overdue, hours in (await db.execute(query)).all():
+        if not count:
+            continue
+        stats["total"] += count
+        stats["upcoming"] += upcoming or 0
+        stats["overdue"] += overdue or 0
+        stats["total_hours"] += hours or 0
+        stats["by_type"][assignment_type] = count
+    stats["total_hours"] = round(stats["total_hours"], 1)
+    return stats
+
+
+async def get_workload_columns(
+    db: AsyncSession,
+    start: date,
+    end: date,
+    syllabus_id: Optional[int] = None
+) -> Tuple[list, list, list]:
+    """Day offsets from start, hours and course names of dated assignments in [start, end].
+
+    Returned as three plain column lists (no ORM objects) for vectorized
+    binning. The day offset is computed by SQLite, so due dates are never
+    parsed in Python.
+    """
+    a = AssignmentDB
+    query = (
+        select(
+            cast(func.julianday(a.due_date) - func.julianday(start.isoformat()), Integer),
+            func.coalesce(a.estimated_hours, 0.0),
+            func.coalesce(a.course_name, SyllabusDB.course_name, "Unknown course")
+        )
+        .select_from(a)
+        .outerjoin(SyllabusDB, SyllabusDB.id == a.syllabus_id)
+        .where(a.due_date >= start, a.due_date <= end)
+    )
+    if syllabus_id:
+        query = query.where(a.syllabus_id == syllabus_id)
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return [], [], []
+    day_offsets, hours, courses = zip(*rows)
+    return list(day_offsets), list(hours), list(courses)
+
+
 async def get_upcoming_assignments(db: AsyncSession, days: int = 14) -> List[AssignmentDB]:
     today = date.today()
     end_date = today + timedelta(days=days)
@@ -135,26 +427,74 @@ async def update_assignments_by_title(db: AsyncSession, syllabus_id: int, title:
     return assignments
 
 
-async def clear_quiz_time_estimates(db: AsyncSession) -> int:
-    """Clear time estimates for all quiz assignments."""
+def _reestimate_scope(query, syllabus_id: Optional[int], assignment_type: Optional[str]):
+    """Restrict a query to re-estimation candidates: not user-edited, optionally filtered."""
+    query = query.where(AssignmentDB.hours_user_set.is_(False))
+    if syllabus_id:
+        query = query.where(AssignmentDB.syllabus_id == syllabus_id)
+    if assignment_type:
+        query = query.where(AssignmentDB.assignment_type == assignment_type)
+    return query
+
+
+async def count_assignments_to_reestimate(
+    db: AsyncSession,
+    syllabus_id: Optional[int] = None,
+    assignment_type: Optional[str] = None
+) -> Tuple[int, int]:
+    """Return (candidates, user_edited) for a re-estimation scope."""
+    query = select(
+        func.count(),
+        func.coalesce(func.sum(case((AssignmentDB.hours_user_set.is_(True), 1), else_=0)), 0)
+    ).select_from(AssignmentDB)
+    if syllabus_id:
+        query = query.where(AssignmentDB.syllabus_id == syllabus_id)
+    if assignment_type:
+        query = query.where(AssignmentDB.assignment_type == assignment_type)
+    total, user_edited = (await db.execute(query)).one()
+    return total - user_edited, user_edited
+
+
+async def get_assignments_to_reestimate(
+    db: AsyncSession,
+    after_id: int,
+    limit: int,
+    syllabus_id: Optional[int] = None,
+    assignment_type: Optional[str] = None
+) -> list:
+    """Next batch of estimator inputs after after_id, in id order (keyset pagination)."""
+    query = _reestimate_scope(
+        select(
+            AssignmentDB.id,
+            AssignmentDB.assignment_type,
+            AssignmentDB.title,
+            AssignmentDB.description,
+            AssignmentDB.estimated_hours
+        ),
+        syllabus_id,
+        assignment_type
+    )
     result = await db.execute(
-        select(AssignmentDB).where(
-            or_(
-                AssignmentDB.assignment_type == "quiz",
-                AssignmentDB.title.ilike("%quiz%")
-            )
-        )
+        query.where(AssignmentDB.id > after_id).order_by(AssignmentDB.id.asc()).limit(limit)
     )
-    assignments = list(result.scalars().all())
+    return list(result.all())
 
-    count = 0
-    for assignment in assignments:
-        if assignment.estimated_hours is not None:
-            assignment.estimated_hours = None
-            count += 1
 
+async def update_estimated_hours_bulk(db: AsyncSession, estimates: List[Tuple[int, Optional[float]]]) -> int:
+    """Write (id, estimated_hours) pairs with one executemany UPDATE.
+
+    Rows a user edited since they were read are left alone.
+    """
+    table = AssignmentDB.__table__
+    result = await db.execute(
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .where(table.c.hours_user_set.is_(False))
+        .values(estimated_hours=bindparam("hours")),
+        [{"row_id": row_id, "hours": hours} for row_id, hours in estimates]
+    )
     await db.commit()
-    return count
+    return result.rowcount
 
 
 async def delete_syllabus(db: AsyncSession, syllabus_id: int) -> bool:
@@ -165,3 +505,212 @@ async def delete_syllabus(db: AsyncSession, syllabus_id: int) -> bool:
         await db.commit()
         return True
     return False
+
+
+async def create_syllabi_with_jobs(
+    db: AsyncSession,
+    files: List[Tuple[str, str]],
+    batch_id: Optional[str] = None
+) -> List[Tuple[SyllabusDB, ProcessingJobDB]]:
+    """Create a queued syllabus and its processing job for each (filename, file_path), in one transaction."""
+    syllabi = [
+        SyllabusDB(filename=filename, processing_status="queued", batch_id=batch_id)
+        for filename, _ in files
+    ]
+    db.add_all(syllabi)
+    await db.flush()
+
+    jobs = [
+        ProcessingJobDB(syllabus_id=syllabus.id, file_path=file_path, status="queued")
+        for syllabus, (_, file_path) in zip(syllabi, files)
+    ]
+    db.add_all(jobs)
+    await db.commit()
+    return list(zip(syllabi, jobs))
+
+
+async def get_batch_syllabi(db: AsyncSession, batch_id: str) -> List[Tuple[SyllabusDB, int]]:
+    """Syllabi of an upload batch (without raw_text) with their assignment counts."""
+    result = await db.execute(
+        select(SyllabusDB, _assignment_count())
+        .options(defer(SyllabusDB.raw_text))
+        .where(SyllabusDB.batch_id == batch_id)
+        .order_by(SyllabusDB.id.asc())
+    )
+    return [(syllabus, count) for syllabus, count in result.all()]
+
+
+async def get_latest_job(db: AsyncSession, syllabus_id: int) -> Optional[ProcessingJobDB]:
+    result = await db.execute(
+        select(ProcessingJobDB)
+        .where(ProcessingJobDB.syllabus_id == syllabus_id)
+        .order_by(ProcessingJobDB.id.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_next_job(db: AsyncSession) -> Optional[ProcessingJobDB]:
+    """Mark the oldest queued job as running and return it.
+
+    The conditional UPDATE makes the claim safe when several workers
+    look at the queue at the same time.
+    """
+    while True:
+        result = await db.execute(
+            select(ProcessingJobDB)
+            .where(ProcessingJobDB.status == "queued")
+            .order_by(ProcessingJobDB.id.asc())
+            .limit(1)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            return None
+
+        claimed = await db.execute(
+            update(ProcessingJobDB)
+            .where(ProcessingJobDB.id == job.id)
+            .where(ProcessingJobDB.status == "queued")
+            .values(
+                status="running",
+                attempts=ProcessingJobDB.attempts + 1,
+                started_at=datetime.utcnow()
+            )
+        )
+        await db.commit()
+        if claimed.rowcount:
+            await db.refresh(job)
+            return job
+
+
+async def finish_job(db: AsyncSession, job_id: int, status: str, error: str = None):
+    await db.execute(
+        update(ProcessingJobDB)
+        .where(ProcessingJobDB.id == job_id)
+        .values(status=status, error=error, finished_at=datetime.utcnow())
+    )
+    await db.commit()
+
+
+async def recover_interrupted_jobs(db: AsyncSession, max_attempts: int) -> tuple:
+    """Requeue jobs left running by a crash or shutdown.
+
+    Jobs that already used up their attempts are failed instead, along
+    with their syllabus, so nothing stays stuck at "processing". Either
+    way the rows the interrupted attempt wrote are deleted, so a retry
+    starts clean. Returns (requeued count, failed jobs).
+    """
+    result = await db.execute(
+        select(ProcessingJobDB).where(ProcessingJobDB.status == "running")
+    )
+    jobs = list(result.scalars().all())
+
+    if jobs:
+        await db.execute(
+            delete(AssignmentDB).where(AssignmentDB.syllabus_id.in_([job.syllabus_id for job in jobs]))
+        )
+
+    requeued = 0
+    failed = []
+    for job in jobs:
+        if job.attempts >= max_attempts:
+            job.status = "failed"
+            job.error = "Interrupted too many times"
+            job.finished_at = datetime.utcnow()
+            await db.execute(
+                update(SyllabusDB)
+                .where(SyllabusDB.id == job.syllabus_id)
+                .values(processing_status="failed: processing was interrupted")
+            )
+            failed.append(job)
+        else:
+            job.status = "queued"
+            requeued += 1
+
+    await db.commit()
+    return requeued, failed
+
+
+async def get_queue_position(db: AsyncSession, job: ProcessingJobDB) -> Optional[int]:
+    """1-based position of a queued job, 0 if it is running, None once finished."""
+    if job.status == "running":
+        return 0
+    if job.status != "queued":
+        return None
+    result = await db.execute(
+        select(func.count(ProcessingJobDB.id))
+        .where(ProcessingJobDB.status == "queued")
+        .where(ProcessingJobDB.id <= job.id)
+    )
+    return result.scalar_one()
+
+
+async def get_cache_entry(db: AsyncSession, kind: str, key: str) -> Optional[str]:
+    """Return the cached JSON payload and bump its LRU timestamp."""
+    entry = await db.get(ExtractionCacheDB, (kind, key))
+    if entry is None:
+        return None
+    entry.last_accessed = datetime.utcnow()
+    await db.commit()
+    return entry.value
+
+
+async def put_cache_entry(db: AsyncSession, kind: str, key: str, value: str):
+    entry = await db.get(ExtractionCacheDB, (kind, key))
+    if entry is None:
+        entry = ExtractionCacheDB(kind=kind, key=key)
+        db.add(entry)
+    entry.value = value
+    entry.size_bytes = len(value.encode("utf-8"))
+    entry.last_accessed = datetime.utcnow()
+    await db.commit()
+
+
+async def evict_cache_entries(db: AsyncSession, max_bytes: int) -> int:
+    """Delete least recently used cache entries until the cache fits in max_bytes."""
+    total = (await db.execute(
+        select(func.coalesce(func.sum(ExtractionCacheDB.size_bytes), 0))
+    )).scalar_one()
+    excess = total - max_bytes
+    if excess <= 0:
+        return 0
+
+    result = await db.stream(
+        select(ExtractionCacheDB.kind, ExtractionCacheDB.key, ExtractionCacheDB.size_bytes)
+        .order_by(ExtractionCacheDB.last_accessed.asc())
+    )
+    victims = []
+    async for kind, key, size in result:
+        victims.append((kind, key))
+        excess -= size or 0
+        if excess <= 0:
+            break
+    await result.close()
+
+    for kind, key in victims:
+        await db.execute(
+            delete(ExtractionCacheDB)
+            .where(ExtractionCacheDB.kind == kind)
+            .where(ExtractionCacheDB.key == key)
+        )
+    await db.commit()
+    return len(victims)
+
+
+async def get_cache_usage(db: AsyncSession) -> dict:
+    result = await db.execute(
+        select(
+            ExtractionCacheDB.kind,
+            func.count(ExtractionCacheDB.key),
+            func.coalesce(func.sum(ExtractionCacheDB.size_bytes), 0)
+        ).group_by(ExtractionCacheDB.kind)
+    )
+    return {kind: {"entries": count, "bytes": size} for kind, count, size in result.all()}
+
+
+async def get_data_version(db: AsyncSession) -> Tuple[int, int]:
+    """(version, unix seconds of last change) for assignments and syllabi."""
+    row = (await db.execute(
+        select(DataVersionDB.version, DataVersionDB.updated_at).where(DataVersionDB.id == 1)
+    )).first()
+    return (row[0], row[1]) if row else (0, 0)
@@ -1,8 +1,47 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import declarative_base
 from app.config import settings
+from app.db.migrations import run_migrations
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+
+def _create_engine():
+    url = make_url(settings.database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+    pool_options = {}
+    if not in_memory:
+        # SQLite allows one writer at a time; the pool is sized for concurrent
+        # readers and writers queue on busy_timeout rather than failing.
+        # aiosqlite file databases default to NullPool, which takes no sizing
+        pool_options = {
+            "poolclass": AsyncAdaptedQueuePool,
+            "pool_size": settings.database_pool_size,
+            "max_overflow": settings.database_max_overflow,
+            "pool_timeout": settings.database_pool_timeout,
+        }
+
+    engine = create_async_engine(settings.database_url, echo=settings.database_echo, **pool_options)
+
+    if is_sqlite:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.close()
+
+
+engine = _create_engine()
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
@@ -19,3 +58,4 @@ async def get_db():
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await run_migrations(conn)
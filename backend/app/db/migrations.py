@@ -0,0 +1,161 @@
+"""Versioned schema migrations, applied at startup after create_all.
+
+create_all builds new databases straight from the models but never alters
+existing tables, so every schema change to a model also gets a migration
+here. Migrations must be idempotent: on a fresh database the models have
+already done the work.
+"""
+from datetime import datetime
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+Migration = Callable[[AsyncConnection], Awaitable[None]]
+
+MIGRATIONS: List[Tuple[int, str, Migration]] = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function under a schema version."""
+    def register(func: Migration) -> Migration:
+        MIGRATIONS.append((version, description, func))
+        return func
+    return register
+
+
+async def _column_exists(conn: AsyncConnection, table: str, column: str) -> bool:
+    result = await conn.execute(text(f"PRAGMA table_info({table})"))
+    return any(row[1] == column for row in result.all())
+
+
+async def add_column_if_missing(conn: AsyncConnection, table: str, column: str, ddl: str):
+    if not await _column_exists(conn, table, column):
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+@migration(1, "Indexes for assignment listing, upcoming and by-title queries")
+async def _assignment_indexes(conn: AsyncConnection):
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS ix_assignments_syllabus_title ON assignments (syllabus_id, title)",
+        "CREATE INDEX IF NOT EXISTS ix_assignments_syllabus_due_date ON assignments (syllabus_id, due_date)",
+        "CREATE INDEX IF NOT EXISTS ix_assignments_due_date ON assignments (due_date)",
+        "CREATE INDEX IF NOT EXISTS ix_assignments_type_due_date ON assignments (assignment_type, due_date)",
+    ):
+        await conn.execute(text(statement))
+    await conn.execute(text("ANALYZE assignments"))
+
+
+# Summary key for an assignment row; NEW./OLD. is substituted in
+_SUMMARY_KEY = (
+    "COALESCE({row}.syllabus_id, 0), COALESCE({row}.assignment_type, 'other'), COALESCE({row}.due_date, '')"
+)
+
+
+def _summary_add(row: str) -> str:
+    return (
+        "INSERT INTO assignment_summary (syllabus_id, assignment_type, due_key, assignment_count, total_hours) "
+        f"VALUES ({_SUMMARY_KEY.format(row=row)}, 1, COALESCE({row}.estimated_hours, 0)) "
+        "ON CONFLICT (syllabus_id, assignment_type, due_key) DO UPDATE SET "
+        "assignment_count = assignment_count + 1, total_hours = total_hours + excluded.total_hours;"
+    )
+
+
+def _summary_remove(row: str) -> str:
+    match = (
+        f"syllabus_id = COALESCE({row}.syllabus_id, 0) "
+        f"AND assignment_type = COALESCE({row}.assignment_type, 'other') "
+        f"AND due_key = COALESCE({row}.due_date, '')"
+    )
+    return (
+        "UPDATE assignment_summary SET assignment_count = assignment_count - 1, "
+        f"total_hours = total_hours - COALESCE({row}.estimated_hours, 0) WHERE {match}; "
+        f"DELETE FROM assignment_summary WHERE {match} AND assignment_count <= 0;"
+    )
+
+
+@migration(2, "Trigger-maintained assignment_summary table for stats")
+async def _assignment_summary(conn: AsyncConnection):
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS assignment_summary ("
+        "syllabus_id INTEGER NOT NULL, assignment_type VARCHAR(50) NOT NULL, due_key VARCHAR(10) NOT NULL, "
+        "assignment_count INTEGER NOT NULL DEFAULT 0, total_hours FLOAT NOT NULL DEFAULT 0, "
+        "PRIMARY KEY (syllabus_id, assignment_type, due_key))"
+    ))
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS trg_assignment_summary_insert AFTER INSERT ON assignments "
+        f"BEGIN {_summary_add('NEW')} END"
+    ))
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS trg_assignment_summary_delete AFTER DELETE ON assignments "
+        f"BEGIN {_summary_remove('OLD')} END"
+    ))
+    await conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS trg_assignment_summary_update "
+        "AFTER UPDATE OF syllabus_id, assignment_type, due_date, estimated_hours ON assignments "
+        f"BEGIN {_summary_remove('OLD')} {_summary_add('NEW')} END"
+    ))
+    await rebuild_assignment_summary(conn)
+
+
+async def rebuild_assignment_summary(conn: AsyncConnection):
+    """Recompute assignment_summary from scratch."""
+    await conn.execute(text("DELETE FROM assignment_summary"))
+    await conn.execute(text(
+        "INSERT INTO assignment_summary (syllabus_id, assignment_type, due_key, assignment_count, total_hours) "
+        "SELECT COALESCE(syllabus_id, 0), COALESCE(assignment_type, 'other'), COALESCE(due_date, ''), "
+        "COUNT(*), COALESCE(SUM(estimated_hours), 0) FROM assignments GROUP BY 1, 2, 3"
+    ))
+
+
+@migration(3, "Trigger-maintained data_version counter for ETags and export caching")
+async def _data_version(conn: AsyncConnection):
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS data_version ("
+        "id INTEGER PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0, updated_at INTEGER NOT NULL DEFAULT 0)"
+    ))
+    await conn.execute(text(
+        "INSERT OR IGNORE INTO data_version (id, version, updated_at) "
+        "VALUES (1, 0, CAST(strftime('%s', 'now') AS INTEGER))"
+    ))
+    bump = (
+        "UPDATE data_version SET version = version + 1, "
+        "updated_at = CAST(strftime('%s', 'now') AS INTEGER) WHERE id = 1;"
+    )
+    for table in ("assignments", "syllabi"):
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            await conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS trg_data_version_{table}_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {bump} END"
+            ))
+
+
+@migration(4, "Track user-edited time estimates so re-estimation skips them")
+async def _hours_user_set(conn: AsyncConnection):
+    await add_column_if_missing(conn, "assignments", "hours_user_set", "BOOLEAN NOT NULL DEFAULT 0")
+
+
+@migration(5, "Batch id on syllabi for multi-file uploads")
+async def _syllabus_batch_id(conn: AsyncConnection):
+    await add_column_if_missing(conn, "syllabi", "batch_id", "VARCHAR(36)")
+    await conn.execute(text("CREATE INDEX IF NOT EXISTS ix_syllabi_batch_id ON syllabi (batch_id)"))
+
+
+async def run_migrations(conn: AsyncConnection):
+    """Apply every migration newer than the database's recorded version."""
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, description TEXT, applied_at TIMESTAMP)"
+    ))
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    applied = {row[0] for row in result.all()}
+
+    for version, description, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in applied:
+            continue
+        print(f"[DB] Applying migration {version}: {description}", flush=True)
+        await func(conn)
+        await conn.execute(
+            text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+            {"v": version, "d": description, "t": datetime.utcnow()}
+        )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -15,8 +15,10 @@ class SyllabusDB(Base):
     upload_date = Column(DateTime, default=datetime.utcnow)
     processing_status = Column(String(50), default="pending")
     raw_text = Column(Text)
+    batch_id = Column(String(36), index=True)  # Set for files uploaded through /upload/batch
 
     assignments = relationship("AssignmentDB", back_populates="syllabus", cascade="all, delete-orphan")
+    jobs = relationship("ProcessingJobDB", back_populates="syllabus", cascade="all, delete-orphan")
 
 
 class AssignmentDB(Base):
@@ -30,6 +32,7 @@ class AssignmentDB(Base):
     due_date = Column(Date)
     due_time = Column(String(10))
     estimated_hours = Column(Float, default=1.0)
+    hours_user_set = Column(Boolean, nullable=False, default=False, server_default="0")  # Re-estimation leaves these alone
     weight_percentage = Column(Float)
     course_name = Column(String(255))
     confidence_score = Column(Float, default=0.0)
@@ -37,3 +40,66 @@ class AssignmentDB(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     syllabus = relationship("SyllabusDB", back_populates="assignments")
+
+    # Existing databases get these through app/db/migrations.py
+    __table_args__ = (
+        Index("ix_assignments_syllabus_title", "syllabus_id", "title"),
+        Index("ix_assignments_syllabus_due_date", "syllabus_id", "due_date"),
+        Index("ix_assignments_due_date", "due_date"),
+        Index("ix_assignments_type_due_date", "assignment_type", "due_date"),
+    )
+
+
+class ProcessingJobDB(Base):
+    __tablename__ = "processing_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    syllabus_id = Column(Integer, ForeignKey("syllabi.id"), nullable=False)
+    file_path = Column(String(500), nullable=False)
+    status = Column(String(50), default="queued", index=True)  # queued, running, completed, failed
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    syllabus = relationship("SyllabusDB", back_populates="jobs")
+
+
+class ExtractionCacheDB(Base):
+    __tablename__ = "extraction_cache"
+
+    kind = Column(String(20), primary_key=True)  # "document" (file bytes) or "text" (parsed text)
+    key = Column(String(64), primary_key=True)   # SHA-256 hex digest
+    value = Column(Text, nullable=False)         # JSON payload
+    size_bytes = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class AssignmentSummaryDB(Base):
+    """Assignment counts and hours per syllabus / type / due date.
+
+    Maintained by SQLite triggers on the assignments table (see
+    app/db/migrations.py), so every insert, update and delete path keeps
+    it current without application code having to remember to.
+    """
+    __tablename__ = "assignment_summary"
+
+    syllabus_id = Column(Integer, primary_key=True)        # 0 when the assignment has none
+    assignment_type = Column(String(50), primary_key=True)
+    due_key = Column(String(10), primary_key=True)         # ISO due date, '' when there is none
+    assignment_count = Column(Integer, nullable=False, default=0)
+    total_hours = Column(Float, nullable=False, default=0.0)
+
+
+class DataVersionDB(Base):
+    """Single-row counter bumped by triggers on every assignment/syllabus change.
+
+    Used for ETags and to key cached exports (see app/db/migrations.py).
+    """
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(Integer, nullable=False, default=0)  # Unix seconds of the last change
@@ -5,6 +5,12 @@ from contextlib import asynccontextmanager
 from app.db.database import init_db
 from app.routers import upload, assignments, export
 from app.config import settings
+from app.services.processing import processing_queue
+from app.services.reestimation import reestimation_job
+from app.services.parser import parser
+from app.services.ollama_extractor import ollama_extractor
+from app.services.response_cache import export_cache
+from app.services.events import progress_broker
 
 
 @asynccontextmanager
@@ -12,8 +18,14 @@ async def lifespan(app: FastAPI):
     # Startup
     await init_db()
     settings.upload_dir.mkdir(exist_ok=True)
+    await ollama_extractor.start()
+    await processing_queue.start()
     yield
     # Shutdown
+    await processing_queue.stop()
+    await reestimation_job.stop()
+    await ollama_extractor.close()
+    parser.shutdown()
 
 
 app = FastAPI(
@@ -30,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 # Include routers
@@ -46,3 +59,17 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/api/metrics")
+async def metrics():
+    return {
+        "ollama_pool": ollama_extractor.pool_stats(),
+        "ollama_retries": ollama_extractor.retry_stats(),
+        "llm_endpoints": ollama_extractor.endpoint_stats(),
+        "processing": processing_queue.stats(),
+        "reestimation": reestimation_job.progress(),
+        "export_cache": export_cache.stats(),
+        "events": progress_broker.stats(),
+        "parser": parser.stats()
+    }
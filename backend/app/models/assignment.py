@@ -51,6 +51,7 @@ class Assignment(AssignmentBase):
     syllabus_id: int
     confidence_score: float = Field(default=0.0, ge=0.0, le=1.0)
     raw_text_snippet: Optional[str] = None
+    hours_user_set: bool = False
     created_at: datetime
 
     class Config:
@@ -79,6 +80,17 @@ class Syllabus(SyllabusBase):
         from_attributes = True
 
 
+class SyllabusSummary(SyllabusBase):
+    """Lightweight listing entry - no document text or assignment rows."""
+    id: int
+    upload_date: datetime
+    processing_status: str = "pending"
+    assignment_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+
 class ExtractionResult(BaseModel):
     syllabus_id: int
     assignments: List[Assignment]
@@ -1,64 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from datetime import date
+from datetime import date, timedelta
 
 from app.db.database import get_db
 from app.db import crud
 from app.models.assignment import Assignment, AssignmentCreate, AssignmentUpdate, AssignmentType
+from app.config import settings
+from app.services.response_cache import conditional_get
+from app.services.reestimation import reestimation_job
+from app.services.workload import ROLLING_WINDOW_DAYS, compute_workload
 
 router = APIRouter()
 
 
 @router.get("", response_model=List[Assignment])
 async def get_assignments(
+    request: Request,
+    response: Response,
     syllabus_id: Optional[int] = Query(None, description="Filter by syllabus"),
     assignment_type: Optional[str] = Query(None, description="Filter by type"),
+    course_name: Optional[str] = Query(None, description="Filter by course"),
+    due_after: Optional[date] = Query(None, description="Only assignments due on or after this date"),
+    due_before: Optional[date] = Query(None, description="Only assignments due on or before this date"),
+    sort: str = Query("due_date", description="Sort key", pattern="^(due_date|created_at|title|estimated_hours|id)$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(settings.assignments_page_size, ge=1, le=settings.assignments_max_page_size),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all assignments with optional filters."""
-    assignments = await crud.get_all_assignments(db, syllabus_id)
+    """Get a page of assignments with optional filters.
 
-    # Filter by type if specified
-    if assignment_type:
-        assignments = [a for a in assignments if a.assignment_type == assignment_type]
+    The body stays a plain list; when more rows exist the cursor for the
+    next page is returned in the X-Next-Cursor header.
+    """
+    _, not_modified = await conditional_get(request, response, db)
+    if not_modified is not None:
+        return not_modified
+
+    try:
+        assignments, next_cursor = await crud.list_assignments(
+            db,
+            syllabus_id=syllabus_id,
+            assignment_type=assignment_type,
+            course_name=course_name,
+            due_after=due_after,
+            due_before=due_before,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return assignments
 
 
 @router.get("/upcoming", response_model=List[Assignment])
 async def get_upcoming_assignments(
+    request: Request,
+    response: Response,
     days: int = Query(14, ge=1, le=365, description="Number of days ahead"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get assignments due in the next N days."""
+    _, not_modified = await conditional_get(request, response, db, daily=True)
+    if not_modified is not None:
+        return not_modified
     return await crud.get_upcoming_assignments(db, days)
 
 
 @router.get("/stats")
-async def get_assignment_stats(db: AsyncSession = Depends(get_db)):
+async def get_assignment_stats(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """Get summary statistics for all assignments."""
-    assignments = await crud.get_all_assignments(db)
-    today = date.today()
+    _, not_modified = await conditional_get(request, response, db, daily=True)
+    if not_modified is not None:
+        return not_modified
+    return await crud.get_assignment_stats(db, use_summary=settings.stats_use_summary)
+
+
+@router.get("/workload")
+async def get_workload(
+    request: Request,
+    response: Response,
+    start: Optional[date] = Query(None, description="First day (default today)"),
+    end: Optional[date] = Query(None, description="Last day (default start + workload_default_days)"),
+    syllabus_id: Optional[int] = Query(None, description="Filter by syllabus"),
+    peak_weeks: int = Query(3, ge=1, le=52, description="Number of peak-load weeks to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Hours due per day and per week for each course, with rolling 7-day load and peak weeks."""
+    start = start or date.today()
+    end = end or start + timedelta(days=settings.workload_default_days - 1)
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days >= settings.workload_max_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range is limited to {settings.workload_max_days} days"
+        )
 
-    total = len(assignments)
-    upcoming = sum(1 for a in assignments if a.due_date and a.due_date >= today)
-    overdue = sum(1 for a in assignments if a.due_date and a.due_date < today)
-    total_hours = sum(a.estimated_hours or 0 for a in assignments)
+    _, not_modified = await conditional_get(request, response, db, daily=True)
+    if not_modified is not None:
+        return not_modified
 
-    # Count by type
-    by_type = {}
-    for a in assignments:
-        t = a.assignment_type or "other"
-        by_type[t] = by_type.get(t, 0) + 1
+    # Read a window past end so the rolling load of the last days is complete
+    day_offsets, hours, courses = await crud.get_workload_columns(
+        db, start, end + timedelta(days=ROLLING_WINDOW_DAYS - 1), syllabus_id
+    )
+    return compute_workload(day_offsets, hours, courses, start, end, peak_weeks)
 
-    return {
-        "total": total,
-        "upcoming": upcoming,
-        "overdue": overdue,
-        "total_hours": round(total_hours, 1),
-        "by_type": by_type
-    }
+
+@router.post("/re-estimate", status_code=202)
+async def start_reestimation(
+    syllabus_id: Optional[int] = Query(None, description="Only this syllabus"),
+    assignment_type: Optional[AssignmentType] = Query(None, description="Only this type"),
+):
+    """Recompute time estimates with the current estimator, in the background.
+
+    Assignments whose hours were edited by hand are left alone.
+    Poll GET /re-estimate for progress.
+    """
+    started = reestimation_job.start(syllabus_id, assignment_type.value if assignment_type else None)
+    if not started:
+        raise HTTPException(status_code=409, detail="A re-estimation is already running")
+    return reestimation_job.progress()
+
+
+@router.get("/re-estimate")
+async def get_reestimation_progress():
+    """Progress of the current or last re-estimation run."""
+    return reestimation_job.progress()
 
 
 @router.get("/{assignment_id}", response_model=Assignment)
@@ -90,12 +165,14 @@ async def update_assignment(
         raise HTTPException(status_code=404, detail="Assignment not found")
 
     # If updating estimated_hours, update all assignments with same title
+    # and mark them user-edited so re-estimation keeps the value
     if "estimated_hours" in update_dict:
+        update_dict["hours_user_set"] = True
         await crud.update_assignments_by_title(
             db,
             assignment.syllabus_id,
             assignment.title,
-            {"estimated_hours": update_dict["estimated_hours"]}
+            {"estimated_hours": update_dict["estimated_hours"], "hours_user_set": True}
         )
 
     # Update the specific assignment with all fields
@@ -103,13 +180,6 @@ async def update_assignment(
     return assignment
 
 
-@router.post("/fix-quiz-times")
-async def fix_quiz_times(db: AsyncSession = Depends(get_db)):
-    """Clear time estimates for all quiz assignments."""
-    count = await crud.clear_quiz_time_estimates(db)
-    return {"message": f"Cleared time estimates for {count} quiz assignments"}
-
-
 @router.delete("/{assignment_id}")
 async def delete_assignment(assignment_id: int, db: AsyncSession = Depends(get_db)):
     """Delete an assignment."""
@@ -1,64 +1,122 @@
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import AsyncIterator, Optional
+import zlib
 
-from app.db.database import get_db
+from app.db.database import get_db, async_session
 from app.db import crud
-from app.services.calendar_export import create_ics_calendar, create_json_export, create_csv_export
+from app.services.calendar_export import iter_ics_calendar, iter_json_export, iter_csv_export
+from app.services.response_cache import export_cache, conditional_get
+from app.config import settings
 
 router = APIRouter()
 
 
+async def _assignments(syllabus_id: Optional[int]):
+    # The request's session is closed before a streaming body is sent,
+    # so the stream opens its own
+    async with async_session() as db:
+        async for assignment in crud.stream_assignments(db, syllabus_id):
+            yield assignment
+
+
+async def _gzip(chunks: AsyncIterator) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _export_response(
+    request: Request,
+    db: AsyncSession,
+    export_format: str,
+    syllabus_id: Optional[int],
+    render,
+    media_type: str,
+    filename: str
+) -> Response:
+    """Conditional, cached, optionally gzipped export.
+
+    ``render`` is a zero-argument callable returning the body iterator; it
+    is only called when neither a 304 nor a cached body can be sent.
+    """
+    response = Response(media_type=media_type)
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.headers["Vary"] = "Accept-Encoding"
+
+    version, not_modified = await conditional_get(request, response, db)
+    if not_modified is not None:
+        return not_modified
+
+    use_gzip = settings.export_gzip and "gzip" in request.headers.get("accept-encoding", "")
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+
+    # Carry over everything but the placeholder body's length and type
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-length", "content-type")}
+
+    key = (export_format, syllabus_id, version, use_gzip)
+    cached = export_cache.get(key)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type, headers=headers)
+
+    async def unchanged() -> bool:
+        async with async_session() as check_db:
+            return (await crud.get_data_version(check_db))[0] == version
+
+    body = render()
+    if use_gzip:
+        body = _gzip(body)
+    return StreamingResponse(export_cache.fill(key, body, unchanged), media_type=media_type, headers=headers)
+
+
 @router.get("/ics")
 async def export_ics(
+    request: Request,
     syllabus_id: Optional[int] = Query(None, description="Filter by syllabus"),
     db: AsyncSession = Depends(get_db)
 ):
     """Export assignments as ICS calendar file."""
-    assignments = await crud.get_all_assignments(db, syllabus_id)
-
     calendar_name = "Syllabus Assignments"
     if syllabus_id:
-        syllabus = await crud.get_syllabus(db, syllabus_id)
-        if syllabus and syllabus.course_name:
-            calendar_name = f"{syllabus.course_name} Assignments"
-
-    ics_content = create_ics_calendar(assignments, calendar_name)
+        summary = await crud.get_syllabus_summary(db, syllabus_id)
+        if summary and summary[0].course_name:
+            calendar_name = f"{summary[0].course_name} Assignments"
 
-    return Response(
-        content=ics_content,
-        media_type="text/calendar",
-        headers={"Content-Disposition": "attachment; filename=assignments.ics"}
+    return await _export_response(
+        request, db, "ics", syllabus_id,
+        lambda: iter_ics_calendar(_assignments(syllabus_id), calendar_name),
+        "text/calendar", "assignments.ics"
     )
 
 
 @router.get("/json")
 async def export_json(
+    request: Request,
     syllabus_id: Optional[int] = Query(None, description="Filter by syllabus"),
     db: AsyncSession = Depends(get_db)
 ):
     """Export assignments as JSON file."""
-    assignments = await crud.get_all_assignments(db, syllabus_id)
-    json_content = create_json_export(assignments)
-
-    return Response(
-        content=json_content,
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=assignments.json"}
+    return await _export_response(
+        request, db, "json", syllabus_id,
+        lambda: iter_json_export(_assignments(syllabus_id)),
+        "application/json", "assignments.json"
     )
 
 
 @router.get("/csv")
 async def export_csv(
+    request: Request,
     syllabus_id: Optional[int] = Query(None, description="Filter by syllabus"),
     db: AsyncSession = Depends(get_db)
 ):
     """Export assignments as CSV file."""
-    assignments = await crud.get_all_assignments(db, syllabus_id)
-    csv_content = create_csv_export(assignments)
-
-    return Response(
-        content=csv_content,
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=assignments.csv"}
+    return await _export_response(
+        request, db, "csv", syllabus_id,
+        lambda: iter_csv_export(_assignments(syllabus_id)),
+        "text/csv", "assignments.csv"
     )
@@ -1,88 +1,27 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
-import uuid
+from typing import BinaryIO, List, Tuple
 import asyncio
-import sys
+import uuid
+import zipfile
 
 from app.db.database import get_db, async_session
 from app.db import crud
-from app.models.assignment import Syllabus, SyllabusCreate
-from app.services.parser import parser
-from app.services.ollama_extractor import ollama_extractor
+from app.db.models import SyllabusDB
+from app.models.assignment import Syllabus, SyllabusSummary
+from app.services.processing import processing_queue
+from app.services.extraction_cache import extraction_cache
+from app.services.response_cache import conditional_get
+from app.services.events import progress_broker, format_sse, TERMINAL_STATUSES
 from app.config import settings
 
 router = APIRouter()
 
 
-def process_syllabus_sync(syllabus_id: int, file_path: Path):
-    """Background task wrapper that creates its own event loop and db session."""
-    print(f"[SYNC] Background task started for syllabus {syllabus_id}", flush=True)
-    try:
-        asyncio.run(_process_syllabus(syllabus_id, file_path))
-    except Exception as e:
-        print(f"[SYNC] Background task failed: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
-
-
-async def _process_syllabus(syllabus_id: int, file_path: Path):
-    """Background task to process uploaded syllabus."""
-    print(f"[BG] Starting processing for syllabus {syllabus_id}", flush=True)
-    async with async_session() as db:
-        try:
-            # Parse document
-            raw_text = parser.parse(file_path)
-            print(f"[BG] Parsed document, got {len(raw_text)} characters", flush=True)
-
-            # Extract assignments using Ollama
-            print("[BG] Calling Ollama...", flush=True)
-            extraction_result = await ollama_extractor.extract_assignments(raw_text)
-            print(f"[BG] Ollama returned {len(extraction_result.get('assignments', []))} assignments", flush=True)
-
-            # Get course info (with type safety)
-            course_info = extraction_result.get("course_info", {})
-            if not isinstance(course_info, dict):
-                print(f"[BG] Warning: course_info is not a dict, using empty dict", flush=True)
-                course_info = {}
-
-            # Create assignments in database
-            assignments = extraction_result.get("assignments", [])
-            if not isinstance(assignments, list):
-                print(f"[BG] Warning: assignments is not a list, using empty list", flush=True)
-                assignments = []
-
-            for assignment_data in assignments:
-                if not isinstance(assignment_data, dict):
-                    print(f"[BG] Warning: skipping non-dict assignment_data", flush=True)
-                    continue
-                assignment_data["course_name"] = course_info.get("course_name")
-                await crud.create_assignment(db, syllabus_id, assignment_data)
-
-            # Update syllabus status
-            await crud.update_syllabus_status(
-                db, syllabus_id, "completed",
-                course_name=course_info.get("course_name"),
-                instructor=course_info.get("instructor"),
-                semester=course_info.get("semester")
-            )
-            print(f"[BG] Processing complete for syllabus {syllabus_id}", flush=True)
-
-        except Exception as e:
-            print(f"[BG] Error processing syllabus: {e}", flush=True)
-            import traceback
-            traceback.print_exc()
-            await crud.update_syllabus_status(db, syllabus_id, f"failed: {str(e)}")
-
-        finally:
-            # Clean up uploaded file
-            if file_path.exists():
-                file_path.unlink()
-
-
 @router.post("/syllabus")
 async def upload_syllabus(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db)
 ):
@@ -96,30 +35,24 @@ async def upload_syllabus(
             detail=f"File type {file_ext} not supported. Use: {', '.join(settings.allowed_extensions)}"
         )
 
-    # Save file temporarily
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = settings.upload_dir / unique_filename
-
+    # Save file temporarily, in chunks, so the upload is never held in memory
+    file_path = settings.upload_dir / f"{uuid.uuid4()}{file_ext}"
     settings.upload_dir.mkdir(exist_ok=True)
 
     try:
-        content = await file.read()
-        if len(content) > settings.max_file_size:
-            raise HTTPException(status_code=400, detail="File too large (max 10MB)")
-
-        with open(file_path, "wb") as f:
-            f.write(content)
-
+        await _save_upload(file, file_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
-    # Create syllabus record
-    syllabus_data = SyllabusCreate(filename=file.filename)
-    db_syllabus = await crud.create_syllabus(db, syllabus_data)
-
-    # Process in background
-    print(f"[UPLOAD] Adding background task for syllabus {db_syllabus.id}", flush=True)
-    background_tasks.add_task(process_syllabus_sync, db_syllabus.id, file_path)
+    # Create the syllabus record and hand it to the processing queue
+    try:
+        db_syllabus, job = await processing_queue.enqueue(db, file.filename, file_path)
+    except Exception:
+        file_path.unlink(missing_ok=True)
+        raise
+    print(f"[UPLOAD] Queued job {job.id} for syllabus {db_syllabus.id}", flush=True)
 
     return {
         "id": db_syllabus.id,
@@ -129,12 +62,171 @@ async def upload_syllabus(
     }
 
 
+@router.post("/batch")
+async def upload_batch(
+    files: List[UploadFile] = File(...),
+    db: AsyncSession = Depends(get_db)
+):
+    """Upload many syllabus files, or .zip archives of them, in one request.
+
+    Every accepted file gets a syllabus row, all created in one
+    transaction and queued together. Files that are too large or of an
+    unsupported type are reported under "rejected" and don't fail the
+    batch. Follow progress with GET /batch/{batch_id}.
+    """
+    settings.upload_dir.mkdir(exist_ok=True)
+    saved: List[Tuple[str, Path]] = []
+    rejected: List[dict] = []
+
+    for upload in files:
+        filename = Path(upload.filename or "").name
+        file_ext = Path(filename).suffix.lower()
+        remaining = settings.batch_max_files - len(saved)
+        if remaining <= 0:
+            rejected.append({"filename": filename, "error": f"Batch limit of {settings.batch_max_files} files reached"})
+            continue
+
+        if file_ext == ".zip":
+            extracted, skipped = await asyncio.to_thread(_extract_zip, upload.file, filename, remaining)
+            saved.extend(extracted)
+            rejected.extend(skipped)
+            continue
+
+        if file_ext not in settings.allowed_extensions:
+            rejected.append({"filename": filename, "error": f"File type {file_ext} not supported"})
+            continue
+
+        file_path = settings.upload_dir / f"{uuid.uuid4()}{file_ext}"
+        try:
+            await _save_upload(upload, file_path)
+        except Exception as e:
+            rejected.append({"filename": filename, "error": str(e)})
+            continue
+        saved.append((filename, file_path))
+
+    if not saved:
+        raise HTTPException(status_code=400, detail={"message": "No files could be accepted", "rejected": rejected})
+
+    batch_id = str(uuid.uuid4())
+    try:
+        created = await processing_queue.enqueue_batch(db, saved, batch_id)
+    except Exception:
+        for _, file_path in saved:
+            file_path.unlink(missing_ok=True)
+        raise
+    print(f"[UPLOAD] Queued batch {batch_id} with {len(created)} files ({len(rejected)} rejected)", flush=True)
+
+    return {
+        **_batch_progress(batch_id, [(syllabus, 0) for syllabus, _ in created]),
+        "rejected": rejected
+    }
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_progress(batch_id: str, db: AsyncSession = Depends(get_db)):
+    """Aggregate processing progress of an upload batch."""
+    rows = await crud.get_batch_syllabi(db, batch_id)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return _batch_progress(batch_id, rows)
+
+
+def _batch_progress(batch_id: str, rows: List[Tuple[SyllabusDB, int]]) -> dict:
+    counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0}
+    for syllabus, _ in rows:
+        status = syllabus.processing_status or "queued"
+        counts["failed" if status.startswith("failed") else status if status in counts else "processing"] += 1
+
+    total = len(rows)
+    done = counts["completed"] + counts["failed"]
+    return {
+        "batch_id": batch_id,
+        "total": total,
+        **counts,
+        "percent_done": round(100 * done / total, 1) if total else 0.0,
+        "assignment_count": sum(count for _, count in rows),
+        "files": [
+            {
+                "id": syllabus.id,
+                "filename": syllabus.filename,
+                "status": syllabus.processing_status,
+                "assignment_count": count
+            }
+            for syllabus, count in rows
+        ]
+    }
+
+
+async def _save_upload(file: UploadFile, file_path: Path) -> int:
+    """Copy an upload to disk in chunks, stopping as soon as it passes max_file_size."""
+    size = 0
+    try:
+        with open(file_path, "wb") as f:
+            while chunk := await file.read(settings.upload_chunk_size):
+                size += len(chunk)
+                if size > settings.max_file_size:
+                    raise ValueError(f"File too large (max {settings.max_file_size // (1024 * 1024)}MB)")
+                f.write(chunk)
+    except BaseException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return size
+
+
+def _extract_zip(archive: BinaryIO, archive_name: str, limit: int) -> Tuple[list, list]:
+    """Save the supported files inside a zip archive; runs in a worker thread.
+
+    Sizes are counted while decompressing rather than trusted from the
+    archive's directory, so a zip bomb stops at max_file_size per file.
+    """
+    saved, rejected = [], []
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile:
+        return saved, [{"filename": archive_name, "error": "Not a valid zip archive"}]
+
+    with zf:
+        for member in zf.infolist():
+            filename = Path(member.filename).name
+            if member.is_dir() or not filename or filename.startswith(".") or "__MACOSX" in member.filename:
+                continue
+            display_name = f"{archive_name}/{member.filename}"
+            file_ext = Path(filename).suffix.lower()
+            if file_ext not in settings.allowed_extensions:
+                rejected.append({"filename": display_name, "error": f"File type {file_ext} not supported"})
+                continue
+            if len(saved) >= limit:
+                rejected.append({"filename": display_name, "error": f"Batch limit of {settings.batch_max_files} files reached"})
+                continue
+
+            file_path = settings.upload_dir / f"{uuid.uuid4()}{file_ext}"
+            size = 0
+            try:
+                with zf.open(member) as src, open(file_path, "wb") as f:
+                    while chunk := src.read(settings.upload_chunk_size):
+                        size += len(chunk)
+                        if size > settings.max_file_size:
+                            raise ValueError(f"File too large (max {settings.max_file_size // (1024 * 1024)}MB)")
+                        f.write(chunk)
+            except Exception as e:
+                file_path.unlink(missing_ok=True)
+                rejected.append({"filename": display_name, "error": str(e)})
+                continue
+            saved.append((filename, file_path))
+
+    return saved, rejected
+
+
 @router.get("/status/{syllabus_id}")
 async def get_upload_status(syllabus_id: int, db: AsyncSession = Depends(get_db)):
     """Check the processing status of an uploaded syllabus."""
-    syllabus = await crud.get_syllabus(db, syllabus_id)
-    if not syllabus:
+    summary = await crud.get_syllabus_summary(db, syllabus_id)
+    if not summary:
         raise HTTPException(status_code=404, detail="Syllabus not found")
+    syllabus, assignment_count = summary
+
+    job = await crud.get_latest_job(db, syllabus_id)
+    queue_position = await crud.get_queue_position(db, job) if job else None
 
     return {
         "id": syllabus.id,
@@ -142,14 +234,96 @@ async def get_upload_status(syllabus_id: int, db: AsyncSession = Depends(get_db)
         "status": syllabus.processing_status,
         "course_name": syllabus.course_name,
         "instructor": syllabus.instructor,
-        "assignment_count": len(syllabus.assignments)
+        "assignment_count": assignment_count,
+        "queue_position": queue_position
     }
 
 
-@router.get("/history", response_model=list[Syllabus])
-async def get_upload_history(db: AsyncSession = Depends(get_db)):
-    """Get all uploaded syllabi."""
-    return await crud.get_all_syllabi(db)
+@router.get("/events/{syllabus_id}")
+async def stream_upload_events(syllabus_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """Push processing progress for a syllabus as Server-Sent Events.
+
+    Sends the current status first, then "status" events for each stage
+    (queued, parsing, extracting, persisting, completed/failed) with
+    per-stage timings, and an "assignment" event for every assignment as
+    it is found. The stream ends after completed or failed.
+    """
+    if not await crud.get_syllabus_summary(db, syllabus_id):
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+
+    async def events():
+        with progress_broker.subscribe(syllabus_id) as subscription:
+            # Subscribed before the snapshot is taken, so nothing falls in between
+            snapshot = progress_broker.latest_status(syllabus_id) or await _status_snapshot(syllabus_id)
+            yield format_sse(snapshot)
+            if snapshot["data"]["status"] in TERMINAL_STATUSES:
+                return
+
+            while not await request.is_disconnected():
+                message = await subscription.get(timeout=settings.events_heartbeat)
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(message)
+                if message["event"] == "status" and message["data"]["status"] in TERMINAL_STATUSES:
+                    return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _status_snapshot(syllabus_id: int) -> dict:
+    """Status event built from the database, for syllabi the broker hasn't seen."""
+    async with async_session() as db:
+        summary = await crud.get_syllabus_summary(db, syllabus_id)
+    if not summary:
+        data = {"status": "failed", "error": "Syllabus not found"}
+    else:
+        syllabus, assignment_count = summary
+        status = syllabus.processing_status or "queued"
+        data = {"status": status, "assignment_count": assignment_count, "course_name": syllabus.course_name}
+        if status.startswith("failed"):
+            data.update(status="failed", error=status.removeprefix("failed: "))
+    return {"id": 0, "event": "status", "data": {"syllabus_id": syllabus_id, **data}}
+
+
+@router.get("/history", response_model=list[SyllabusSummary])
+async def get_upload_history(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get uploaded syllabi, newest first, with assignment counts."""
+    _, not_modified = await conditional_get(request, response, db)
+    if not_modified is not None:
+        return not_modified
+
+    history = []
+    for syllabus, assignment_count in await crud.list_syllabi(db, limit, offset):
+        summary = SyllabusSummary.model_validate(syllabus)
+        summary.assignment_count = assignment_count
+        history.append(summary)
+    return history
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(db: AsyncSession = Depends(get_db)):
+    """Hit/miss counters and size of the extraction cache."""
+    return await extraction_cache.stats(db)
+
+
+@router.get("/{syllabus_id}", response_model=Syllabus)
+async def get_syllabus_detail(syllabus_id: int, db: AsyncSession = Depends(get_db)):
+    """Get one syllabus with its document text and assignments."""
+    syllabus = await crud.get_syllabus(db, syllabus_id)
+    if not syllabus:
+        raise HTTPException(status_code=404, detail="Syllabus not found")
+    return syllabus
 
 
 @router.delete("/{syllabus_id}")
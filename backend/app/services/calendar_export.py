@@ -1,64 +1,77 @@
 from icalendar import Calendar, Event
 from datetime import datetime, timedelta
-from typing import List
+from typing import AsyncIterable, AsyncIterator
 import csv
 import json
 from io import StringIO
 
 from app.db.models import AssignmentDB
 
+# Rows written per yielded CSV piece
+CSV_BATCH_SIZE = 200
 
-def create_ics_calendar(assignments: List[AssignmentDB], calendar_name: str = "Syllabus Assignments") -> str:
-    """Create an ICS calendar file from assignments."""
+_ICS_FOOTER = b"END:VCALENDAR\r\n"
+
+
+async def iter_ics_calendar(
+    assignments: AsyncIterable[AssignmentDB],
+    calendar_name: str = "Syllabus Assignments"
+) -> AsyncIterator[bytes]:
+    """Stream an ICS calendar file built from assignments, one event at a time."""
     cal = Calendar()
     cal.add('prodid', '-//Syllabus Parser//EN')
     cal.add('version', '2.0')
     cal.add('x-wr-calname', calendar_name)
 
-    for assignment in assignments:
+    # Calendar header without its closing line; events go in between
+    yield cal.to_ical()[:-len(_ICS_FOOTER)]
+
+    async for assignment in assignments:
         if not assignment.due_date:
             continue
+        yield _ics_event(assignment).to_ical()
+
+    yield _ICS_FOOTER
 
-        event = Event()
-        event.add('summary', assignment.title)
-
-        # Set due date/time
-        if assignment.due_time:
-            try:
-                hour, minute = map(int, assignment.due_time.split(':'))
-                dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=hour, minute=minute))
-            except ValueError:
-                dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=23, minute=59))
-        else:
-            dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=23, minute=59))
 
-        event.add('dtstart', dt)
-        event.add('dtend', dt + timedelta(hours=1))
+def _ics_event(assignment: AssignmentDB) -> Event:
+    event = Event()
+    event.add('summary', assignment.title)
 
-        # Add description
-        description_parts = []
-        if assignment.description:
-            description_parts.append(assignment.description)
-        description_parts.append(f"Type: {assignment.assignment_type}")
-        description_parts.append(f"Estimated time: {assignment.estimated_hours} hours")
-        if assignment.weight_percentage:
-            description_parts.append(f"Weight: {assignment.weight_percentage * 100}%")
+    # Set due date/time
+    if assignment.due_time:
+        try:
+            hour, minute = map(int, assignment.due_time.split(':'))
+            dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=hour, minute=minute))
+        except ValueError:
+            dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=23, minute=59))
+    else:
+        dt = datetime.combine(assignment.due_date, datetime.min.time().replace(hour=23, minute=59))
 
-        event.add('description', "\n".join(description_parts))
+    event.add('dtstart', dt)
+    event.add('dtend', dt + timedelta(hours=1))
 
-        # Add unique ID
-        event.add('uid', f"assignment-{assignment.id}@syllabus-parser")
+    # Add description
+    description_parts = []
+    if assignment.description:
+        description_parts.append(assignment.description)
+    description_parts.append(f"Type: {assignment.assignment_type}")
+    description_parts.append(f"Estimated time: {assignment.estimated_hours} hours")
+    if assignment.weight_percentage:
+        description_parts.append(f"Weight: {assignment.weight_percentage * 100}%")
 
-        cal.add_component(event)
+    event.add('description', "\n".join(description_parts))
 
-    return cal.to_ical().decode('utf-8')
+    # Add unique ID
+    event.add('uid', f"assignment-{assignment.id}@syllabus-parser")
+    return event
 
 
-def create_json_export(assignments: List[AssignmentDB]) -> str:
-    """Create a JSON export of assignments."""
-    data = []
-    for assignment in assignments:
-        data.append({
+async def iter_json_export(assignments: AsyncIterable[AssignmentDB]) -> AsyncIterator[str]:
+    """Stream a JSON array of assignments (same layout as json.dumps(..., indent=2))."""
+    first = True
+    async for assignment in assignments:
+        item = json.dumps({
             "id": assignment.id,
             "title": assignment.title,
             "description": assignment.description,
@@ -69,13 +82,15 @@ def create_json_export(assignments: List[AssignmentDB]) -> str:
             "weight_percentage": assignment.weight_percentage,
             "course_name": assignment.course_name,
             "created_at": assignment.created_at.isoformat() if assignment.created_at else None
-        })
+        }, indent=2)
+        yield ("[\n  " if first else ",\n  ") + item.replace("\n", "\n  ")
+        first = False
 
-    return json.dumps(data, indent=2)
+    yield "[]" if first else "\n]"
 
 
-def create_csv_export(assignments: List[AssignmentDB]) -> str:
-    """Create a CSV export of assignments."""
+async def iter_csv_export(assignments: AsyncIterable[AssignmentDB]) -> AsyncIterator[str]:
+    """Stream a CSV export of assignments in batches of rows."""
     output = StringIO()
     writer = csv.writer(output)
 
@@ -85,7 +100,8 @@ def create_csv_export(assignments: List[AssignmentDB]) -> str:
         "Estimated Hours", "Weight %", "Course Name"
     ])
 
-    for assignment in assignments:
+    rows = 0
+    async for assignment in assignments:
         writer.writerow([
             assignment.id,
             assignment.title,
@@ -97,5 +113,10 @@ def create_csv_export(assignments: List[AssignmentDB]) -> str:
             assignment.weight_percentage * 100 if assignment.weight_percentage else "",
             assignment.course_name or ""
         ])
+        rows += 1
+        if rows % CSV_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
 
-    return output.getvalue()
+    yield output.getvalue()
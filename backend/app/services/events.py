@@ -0,0 +1,103 @@
+import asyncio
+import json
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+
+from app.config import settings
+
+# Statuses after which a syllabus publishes nothing more
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class Subscription:
+    """A subscriber's bounded queue of events for one syllabus (or all of them)."""
+
+    def __init__(self, syllabus_id: Optional[int]):
+        self.syllabus_id = syllabus_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.events_queue_size)
+
+    def push(self, event: Dict[str, Any]) -> bool:
+        """Queue an event; returns True if the oldest one had to be dropped for it."""
+        # A slow client loses its oldest events rather than blocking the pipeline
+        dropped = self.queue.full()
+        if dropped:
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+        return dropped
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBroker:
+    """In-process pub/sub for syllabus processing progress.
+
+    The processing pipeline publishes; each SSE connection subscribes to
+    one syllabus, or to every syllabus with ``syllabus_id=None``.
+    Publishing never awaits, so a slow or stalled subscriber can't hold
+    up processing. The latest status event of recent syllabi is kept, so
+    a client that subscribes mid-job starts from the current stage.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[Optional[int], Set[Subscription]] = {}
+        self._latest: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._sequence = 0
+        self.published = 0
+        self.dropped = 0
+
+    @contextmanager
+    def subscribe(self, syllabus_id: Optional[int] = None) -> Iterator[Subscription]:
+        subscription = Subscription(syllabus_id)
+        self._subscribers.setdefault(syllabus_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(syllabus_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[syllabus_id]
+
+    def publish(self, syllabus_id: int, event: str, data: Dict[str, Any]):
+        self._sequence += 1
+        message = {"id": self._sequence, "event": event, "data": {"syllabus_id": syllabus_id, **data}}
+        self.published += 1
+
+        if event == "status":
+            self._latest[syllabus_id] = message
+            self._latest.move_to_end(syllabus_id)
+            while len(self._latest) > settings.events_history_size:
+                self._latest.popitem(last=False)
+
+        for key in (syllabus_id, None):
+            for subscription in self._subscribers.get(key, ()):
+                if subscription.push(message):
+                    self.dropped += 1
+
+    def publish_status(self, syllabus_id: int, status: str, **details):
+        self.publish(syllabus_id, "status", {"status": status, **details})
+
+    def latest_status(self, syllabus_id: int) -> Optional[Dict[str, Any]]:
+        return self._latest.get(syllabus_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+def format_sse(message: Dict[str, Any]) -> str:
+    """Render an event in text/event-stream framing."""
+    return f"id: {message['id']}\nevent: {message['event']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+
+
+# Singleton instance
+progress_broker = ProgressBroker()
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import re
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import crud
+
+
+class ExtractionCache:
+    """Content-addressed cache of parsed text and extraction results.
+
+    Two layers, both stored in the ``extraction_cache`` table:
+    - "document": SHA-256 of the uploaded bytes -> parsed text + extraction
+    - "text": SHA-256 of normalized text + model + prompt version -> extraction
+
+    The text layer catches the same syllabus exported to a different file.
+    Entries are evicted least recently used first once the total size
+    exceeds ``settings.extraction_cache_max_bytes``.
+    """
+
+    DOCUMENT = "document"
+    TEXT = "text"
+
+    def __init__(self):
+        self.hits = {self.DOCUMENT: 0, self.TEXT: 0}
+        self.misses = {self.DOCUMENT: 0, self.TEXT: 0}
+
+    @staticmethod
+    def document_key(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def text_key(text: str, model: str, prompt_version: int) -> str:
+        normalized = re.sub(r'\s+', ' ', text).strip()
+        return hashlib.sha256(f"{model}\0{prompt_version}\0{normalized}".encode("utf-8")).hexdigest()
+
+    async def get_document(self, db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+        """Return {"raw_text": ..., "extraction": ...} for previously seen bytes."""
+        return await self._get(db, self.DOCUMENT, key)
+
+    async def put_document(self, db: AsyncSession, key: str, raw_text: str, extraction: Dict[str, Any]):
+        await self._put(db, self.DOCUMENT, key, {"raw_text": raw_text, "extraction": extraction})
+
+    async def get_extraction(self, db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+        return await self._get(db, self.TEXT, key)
+
+    async def put_extraction(self, db: AsyncSession, key: str, extraction: Dict[str, Any]):
+        await self._put(db, self.TEXT, key, extraction)
+
+    async def stats(self, db: AsyncSession) -> Dict[str, Any]:
+        usage = await crud.get_cache_usage(db)
+        layers = {}
+        for kind in (self.DOCUMENT, self.TEXT):
+            hits, misses = self.hits[kind], self.misses[kind]
+            layers[kind] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                **usage.get(kind, {"entries": 0, "bytes": 0})
+            }
+        return {
+            "enabled": settings.extraction_cache_enabled,
+            "max_bytes": settings.extraction_cache_max_bytes,
+            "layers": layers
+        }
+
+    async def _get(self, db: AsyncSession, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        if not settings.extraction_cache_enabled:
+            return None
+        value = await crud.get_cache_entry(db, kind, key)
+        if value is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        return json.loads(value)
+
+    async def _put(self, db: AsyncSession, kind: str, key: str, payload: Dict[str, Any]):
+        if not settings.extraction_cache_enabled:
+            return
+        await crud.put_cache_entry(db, kind, key, json.dumps(payload))
+        evicted = await crud.evict_cache_entries(db, settings.extraction_cache_max_bytes)
+        if evicted:
+            print(f"[CACHE] Evicted {evicted} entries", flush=True)
+
+
+# Singleton instance
+extraction_cache = ExtractionCache()
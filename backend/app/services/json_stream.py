@@ -0,0 +1,72 @@
+import json
+from typing import List, Optional
+
+
+class AssignmentStreamParser:
+    """Pull assignment titles out of a JSON object while it is still being generated.
+
+    Understands the shape the prompt asks for:
+        {"course_name": "...", "assignments": ["Homework 1", "Quiz 1", ...]}
+    and returns each title from ``feed`` as soon as its closing quote
+    arrives. Anything else (objects inside the array, prose around the
+    JSON) is ignored here and left to the full parse once the stream ends.
+    """
+
+    def __init__(self):
+        self.course_name: Optional[str] = None
+        self._stack: List[str] = []     # open '{' / '[' containers
+        self._keys: List[Optional[str]] = []  # key each container was opened under
+        self._key: Optional[str] = None  # last key seen in the current object
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._buffer: List[str] = []
+
+    def feed(self, text: str) -> List[str]:
+        """Consume the next piece of output and return titles completed by it."""
+        titles = []
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(titles)
+                    continue
+                self._buffer.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._buffer = []
+            elif char in '{[':
+                self._keys.append(self._key if self._stack and self._stack[-1] == '{' else None)
+                self._stack.append(char)
+                self._key = None
+                self._expect_key = char == '{'
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                    self._key = self._keys.pop()
+                self._expect_key = False
+            elif char == ',':
+                self._expect_key = bool(self._stack) and self._stack[-1] == '{'
+        return titles
+
+    def _end_string(self, titles: List[str]):
+        try:
+            value = json.loads('"' + "".join(self._buffer) + '"')
+        except json.JSONDecodeError:
+            return
+
+        if self._stack == ['{']:
+            if self._expect_key:
+                self._key = value
+                self._expect_key = False
+            elif self._key == "course_name" and value.strip():
+                self.course_name = value.strip()
+        elif self._stack == ['{', '['] and self._keys[-1] == "assignments":
+            if value.strip():
+                titles.append(value.strip())
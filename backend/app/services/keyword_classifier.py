@@ -0,0 +1,141 @@
+import re
+from typing import Callable, Dict, FrozenSet, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+# Assignment type by title keyword, in priority order (first matching type wins)
+TYPE_KEYWORDS = [
+    ("quiz", ["quiz"]),
+    ("exam", ["exam", "midterm", "final"]),
+    ("project", ["project"]),
+    ("paper", ["paper", "essay", "report"]),
+    ("reading", ["reading", "chapter"]),
+    ("presentation", ["presentation"]),
+    ("lab", ["lab"]),
+    ("homework", ["homework", "hw", "assignment"]),
+]
+
+# Items to exclude (not real assignments)
+EXCLUDE_KEYWORDS = ["participation", "attendance", "class participation", "class attendance"]
+
+# Keyword combinations are few in practice; cap the memo tables anyway
+MEMO_SIZE = 4096
+
+
+class KeywordMatcher:
+    """Which of a fixed set of lowercase keywords occur in a lowercase text.
+
+    Each keyword is a plain substring test, so keywords sharing letters
+    ("finalab" has both "final" and "lab") or nested in one another
+    ("term" in "midterm") are all found; on texts as short as assignment
+    titles that is cheaper than a regex trying every position. Callers
+    memoise what they derive from the returned set, which repeats far
+    more often than the texts do.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+
+    def find(self, text: str) -> FrozenSet[str]:
+        return frozenset([keyword for keyword in self.keywords if keyword in text])
+
+
+_type_matcher = KeywordMatcher(word for _, words in TYPE_KEYWORDS for word in words)
+_types: Dict[FrozenSet[str], str] = {}
+
+
+def detect_type(title: str) -> str:
+    """Assignment type from keywords in a title, "other" if none match."""
+    found = _type_matcher.find(title.lower())
+    assignment_type = _types.get(found)
+    if assignment_type is None:
+        assignment_type = next(
+            (atype for atype, words in TYPE_KEYWORDS if any(word in found for word in words)), "other"
+        )
+        if len(_types) < MEMO_SIZE:
+            _types[found] = assignment_type
+    return assignment_type
+
+
+def title_key(title: str) -> str:
+    """Normalized title used to spot the same assignment twice."""
+    return re.sub(r'\s+', ' ', title).strip().lower()
+
+
+class Classification(NamedTuple):
+    no_time: bool                  # A no-prep-time keyword was present
+    multiplier: float              # Complexity multiplier, 1.0 if none matched or a length was found
+    length_hours: Optional[float]  # Hours from the first matching length unit
+
+
+class KeywordClassifier:
+    """Classify complexity and length of an assignment from its text.
+
+    Built once from the estimator's tables and evaluated in the
+    estimator's order, stopping as soon as the estimate is decided: a
+    no-time keyword skips the rest, and a length skips the complexity
+    keywords. Length units go into one "<number> <unit>" regex whose
+    matches are ranked by unit priority, instead of a ``re.search`` per
+    unit, and the multiplier is memoised per set of keywords found.
+    Results equal the substring checks this replaced.
+    """
+
+    def __init__(
+        self,
+        no_time_keywords: Iterable[str],
+        complexity_multipliers: Dict[str, float],
+        length_units: Sequence[Tuple[str, Callable[[str], float]]]
+    ):
+        self._no_time = tuple(no_time_keywords)
+        self._factors = dict(complexity_multipliers)
+        self._complexity = KeywordMatcher(complexity_multipliers)
+
+        self._length_regex = re.compile(r'(\d+)\s*(' + "|".join(unit for unit, _ in length_units) + ")")
+        self._calculators = [calculator for _, calculator in length_units]
+        # Priority of each spelling a unit pattern matches, e.g. "page" and "pages"
+        self._unit_rank: Dict[str, int] = {}
+        for rank, (unit, _) in enumerate(length_units):
+            for spelling in (unit.rstrip("?")[:-1], unit.rstrip("?")):
+                self._unit_rank.setdefault(spelling, rank)
+
+        self._multipliers: Dict[FrozenSet[str], float] = {}
+
+    def classify(self, text: str) -> Classification:
+        text = text.lower()
+        for keyword in self._no_time:
+            if keyword in text:
+                return Classification(True, 1.0, None)
+
+        length_hours = self._length_hours(text)
+        if length_hours:
+            return Classification(False, 1.0, length_hours)
+        return Classification(False, self._multiplier(self._complexity.find(text)), length_hours)
+
+    def _length_hours(self, text: str) -> Optional[float]:
+        matches = self._length_regex.findall(text)
+        if not matches:
+            return None
+        # Leftmost number of the highest priority unit, like a re.search per unit
+        rank = self._unit_rank
+        for number, unit in sorted(matches, key=lambda match: rank[match[1]]):
+            try:
+                return self._calculators[rank[unit]](number)
+            except (ValueError, IndexError):
+                continue
+        return None
+
+    def _multiplier(self, found: FrozenSet[str]) -> float:
+        multiplier = self._multipliers.get(found)
+        if multiplier is not None:
+            return multiplier
+
+        # Same order-dependent rule as applying the multipliers one by one
+        multiplier = 1.0
+        for keyword, factor in self._factors.items():
+            if keyword in found:
+                if factor > 1 and factor > multiplier:
+                    multiplier = factor
+                elif factor < 1 and factor < multiplier:
+                    multiplier = factor
+
+        if len(self._multipliers) < MEMO_SIZE:
+            self._multipliers[found] = multiplier
+        return multiplier
@@ -0,0 +1,191 @@
+import abc
+import asyncio
+import hashlib
+import json
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.keyword_classifier import TYPE_KEYWORDS
+
+Messages = List[Dict[str, str]]
+
+# Characters per streamed piece when faking token-by-token output
+FAKE_TOKEN_CHARS = 4
+
+_TYPE_WORD = re.compile(
+    r"\b(?:" + "|".join(word for _, words in TYPE_KEYWORDS for word in words) + ")",
+    re.IGNORECASE
+)
+
+
+class LLMBackend(abc.ABC):
+    """One chat-completion protocol, as used by the extractor.
+
+    ``stream`` yields pieces of the assistant message as they generate and
+    ``complete`` returns the whole message. ``json_mode`` asks the server
+    to constrain its output to JSON where the protocol supports it.
+    """
+
+    name = "base"
+    # GET this on a server to see whether it is up; None for backends without a server
+    health_path: Optional[str] = None
+
+    @abc.abstractmethod
+    def stream(self, model: str, messages: Messages, json_mode: bool) -> AsyncIterator[str]:
+        """Async generator of the assistant message's pieces."""
+
+    async def complete(self, model: str, messages: Messages, json_mode: bool) -> str:
+        return "".join([piece async for piece in self.stream(model, messages, json_mode)])
+
+
+class OllamaBackend(LLMBackend):
+    """Ollama's native ``/api/chat``, streamed as NDJSON."""
+
+    name = "ollama"
+    health_path = "/api/tags"
+    path = "/api/chat"
+
+    def __init__(self, request: Callable):
+        # request is the extractor's POST context manager, which picks the server
+        self._request = request
+
+    @staticmethod
+    def _payload(model: str, messages: Messages, json_mode: bool, stream: bool) -> Dict[str, Any]:
+        payload = {"model": model, "messages": messages, "stream": stream}
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+
+    async def complete(self, model: str, messages: Messages, json_mode: bool) -> str:
+        async with self._request(self.path, self._payload(model, messages, json_mode, False)) as response:
+            response.raise_for_status()
+            await response.aread()
+            return response.json().get("message", {}).get("content", "")
+
+    async def stream(self, model: str, messages: Messages, json_mode: bool) -> AsyncIterator[str]:
+        async with self._request(self.path, self._payload(model, messages, json_mode, True)) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message.get("error"):
+                    raise RuntimeError(f"Ollama API error: {message['error']}")
+                piece = message.get("message", {}).get("content", "")
+                if piece:
+                    yield piece
+                if message.get("done"):
+                    return
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """``/v1/chat/completions`` as served by llama.cpp, vLLM and friends, streamed as SSE."""
+
+    name = "openai"
+    health_path = "/v1/models"
+    path = "/v1/chat/completions"
+
+    def __init__(self, request: Callable, api_key: str = ""):
+        self._request = request
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+    @staticmethod
+    def _payload(model: str, messages: Messages, json_mode: bool, stream: bool) -> Dict[str, Any]:
+        payload = {"model": model, "messages": messages, "stream": stream}
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    async def complete(self, model: str, messages: Messages, json_mode: bool) -> str:
+        payload = self._payload(model, messages, json_mode, False)
+        async with self._request(self.path, payload, self.headers) as response:
+            response.raise_for_status()
+            await response.aread()
+            choices = response.json().get("choices") or [{}]
+            return choices[0].get("message", {}).get("content") or ""
+
+    async def stream(self, model: str, messages: Messages, json_mode: bool) -> AsyncIterator[str]:
+        payload = self._payload(model, messages, json_mode, True)
+        async with self._request(self.path, payload, self.headers) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                chunk = json.loads(data)
+                if chunk.get("error"):
+                    raise RuntimeError(f"LLM server error: {chunk['error']}")
+                for choice in chunk.get("choices", []):
+                    piece = (choice.get("delta") or {}).get("content")
+                    if piece:
+                        yield piece
+                    if choice.get("finish_reason"):
+                        return
+
+
+class FakeBackend(LLMBackend):
+    """Deterministic in-process stand-in for a model, for load tests without a GPU.
+
+    Answers with ``fake_response`` for the prompt, after ``latency``
+    seconds and at ``tokens_per_second`` (0 for no delay).
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0, tokens_per_second: float = 0.0):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+
+    async def stream(self, model: str, messages: Messages, json_mode: bool) -> AsyncIterator[str]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for piece in split_tokens(fake_response(messages)):
+            if delay:
+                await asyncio.sleep(delay)
+            yield piece
+
+
+def fake_response(messages: Messages) -> str:
+    """The JSON answer a well-behaved model would give, built from the prompt with keyword rules.
+
+    Every line (or " | " / ";" separated part of one) of the syllabus that
+    contains an assignment type keyword becomes a title. The same prompt
+    always gets the same answer.
+    """
+    prompt = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+    # Drop the instruction line above the syllabus text
+    syllabus = prompt.split("\n\n", 1)[-1]
+    lines = [line.strip() for line in syllabus.splitlines() if line.strip()]
+
+    titles: Dict[str, str] = {}
+    for line in lines:
+        for part in re.split(r"\s*(?:\||;)\s*", line):
+            if _TYPE_WORD.search(part) and len(part) <= 80:
+                titles.setdefault(part.lower(), part)
+    return json.dumps({
+        "course_name": lines[0][:100] if lines else "",
+        "assignments": list(titles.values())
+    })
+
+
+def split_tokens(text: str) -> List[str]:
+    return [text[i:i + FAKE_TOKEN_CHARS] for i in range(0, len(text), FAKE_TOKEN_CHARS)]
+
+
+def prompt_key(messages: Messages) -> str:
+    """Hash identifying a prompt in recorded responses, whatever the backend."""
+    return hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def create_backend(name: str, request: Callable) -> LLMBackend:
+    if name == "ollama":
+        return OllamaBackend(request)
+    if name == "openai":
+        return OpenAICompatibleBackend(request, settings.llm_api_key)
+    if name == "fake":
+        return FakeBackend(settings.fake_llm_latency, settings.fake_llm_tokens_per_second)
+    raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import httpx
+
+from app.config import settings
+
+
+def is_node_failure(error: BaseException) -> bool:
+    """Whether an error says something about the server rather than the request."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    # A pool timeout means our own connection limit was full, not that the server failed
+    return isinstance(error, httpx.TransportError) and not isinstance(error, httpx.PoolTimeout)
+
+
+class Endpoint:
+    """One LLM server: its outstanding requests, health, circuit breaker and counters."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.breaker = "closed"        # "closed", "open" (ejected) or "half_open" (one trial request)
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.ewma_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_health_check: Optional[str] = None
+        self.counters = {
+            "requests": 0,
+            "errors": 0,
+            "connect_errors": 0,
+            "breaker_opens": 0,
+            "total_seconds": 0.0,
+            "max_seconds": 0.0,
+        }
+
+    def usable(self, now: float) -> bool:
+        """Healthy, and not ejected by an open breaker still cooling down."""
+        if not self.healthy:
+            return False
+        return self.breaker != "open" or now - self.opened_at >= settings.ollama_breaker_cooldown
+
+    def ready(self, now: float) -> bool:
+        """Usable with room for one more request right now."""
+        if not self.usable(now):
+            return False
+        if self.breaker == "closed":
+            return self.outstanding < settings.ollama_endpoint_concurrency
+        # After the cooldown, one trial request decides whether the node comes back
+        return self.outstanding == 0
+
+    def stats(self) -> Dict[str, Any]:
+        counters = self.counters
+        requests = counters["requests"]
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "breaker": self.breaker,
+            "outstanding": self.outstanding,
+            **counters,
+            "total_seconds": round(counters["total_seconds"], 3),
+            "max_seconds": round(counters["max_seconds"], 3),
+            "avg_seconds": round(counters["total_seconds"] / (requests - counters["errors"]), 3)
+            if requests > counters["errors"] else None,
+            "error_rate": round(counters["errors"] / requests, 3) if requests else 0.0,
+            "last_error": self.last_error,
+            "last_health_check": self.last_health_check,
+        }
+
+
+class EndpointPool:
+    """Route LLM requests across several servers.
+
+    Each request goes to the ready endpoint with the fewest outstanding
+    requests (ties to the one with the lower recent latency), at most
+    ``ollama_endpoint_concurrency`` at a time per endpoint; when all of
+    them are busy the request waits for a slot. An endpoint is ejected
+    when its health check (``health_path``, every ``ollama_health_interval``
+    seconds) fails, or when its circuit breaker opens after
+    ``ollama_breaker_failures`` failures in a row. After
+    ``ollama_breaker_cooldown`` seconds one trial request decides whether
+    it comes back. With nothing usable left, ``acquire`` fails fast with
+    ConnectionError instead of queueing jobs behind a dead server.
+    """
+
+    def __init__(self, urls: List[str], get_client: Callable[[], httpx.AsyncClient], health_path: Optional[str]):
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._get_client = get_client
+        self.health_path = health_path
+        self.retries = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.health_path and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+
+    async def acquire(self, exclude: Set[Endpoint]) -> Endpoint:
+        """Reserve a slot on the best endpoint not in exclude."""
+        while True:
+            now = time.monotonic()
+            candidates = [e for e in self.endpoints if e not in exclude and e.usable(now)]
+            if not candidates:
+                raise ConnectionError("No healthy LLM endpoint available")
+
+            ready = [e for e in candidates if e.ready(now)]
+            if ready:
+                endpoint = min(ready, key=lambda e: (e.outstanding, e.ewma_seconds or 0.0))
+                if endpoint.breaker == "open":
+                    endpoint.breaker = "half_open"
+                    print(f"[LLM] {endpoint.url} cooled down, sending a trial request", flush=True)
+                endpoint.outstanding += 1
+                endpoint.counters["requests"] += 1
+                return endpoint
+
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            await self._changed.wait()
+
+    def release(self, endpoint: Endpoint, seconds: float, error: Optional[BaseException] = None):
+        """Give back a slot and feed the outcome to the endpoint's breaker and counters."""
+        endpoint.outstanding -= 1
+        counters = endpoint.counters
+
+        if error is None:
+            counters["total_seconds"] += seconds
+            counters["max_seconds"] = max(counters["max_seconds"], seconds)
+            endpoint.ewma_seconds = seconds if endpoint.ewma_seconds is None else 0.8 * endpoint.ewma_seconds + 0.2 * seconds
+            endpoint.consecutive_failures = 0
+            if endpoint.breaker != "closed":
+                print(f"[LLM] {endpoint.url} is back, closing its breaker", flush=True)
+                endpoint.breaker = "closed"
+        elif is_node_failure(error):
+            counters["errors"] += 1
+            counters["connect_errors"] += isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+            endpoint.last_error = f"{type(error).__name__}: {error}"
+            endpoint.consecutive_failures += 1
+            if endpoint.breaker == "half_open" or endpoint.consecutive_failures >= settings.ollama_breaker_failures:
+                if endpoint.breaker != "open":
+                    counters["breaker_opens"] += 1
+                    print(f"[LLM] Ejecting {endpoint.url} after {endpoint.consecutive_failures} failures", flush=True)
+                endpoint.breaker = "open"
+                endpoint.opened_at = time.monotonic()
+        elif endpoint.breaker == "half_open":
+            # Trial was cancelled or failed for a request-specific reason; let the next one try
+            endpoint.breaker = "open"
+
+        self._notify()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries_on_other_endpoint": self.retries,
+            "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+        }
+
+    def _notify(self):
+        # Wake every waiting acquire; each re-checks for a free slot
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.gather(*(self._check(endpoint) for endpoint in self.endpoints))
+            await asyncio.sleep(settings.ollama_health_interval)
+
+    async def _check(self, endpoint: Endpoint):
+        try:
+            response = await self._get_client().get(
+                f"{endpoint.url}{self.health_path}", timeout=settings.ollama_health_timeout
+            )
+            healthy = response.status_code == 200
+            error = None if healthy else f"Health check returned {response.status_code}"
+        except httpx.HTTPError as e:
+            healthy, error = False, f"Health check failed: {type(e).__name__}"
+
+        endpoint.last_health_check = datetime.utcnow().isoformat()
+        if healthy != endpoint.healthy:
+            print(f"[LLM] {endpoint.url} is {'healthy again' if healthy else 'unhealthy'}", flush=True)
+            endpoint.healthy = healthy
+            if error:
+                endpoint.last_error = error
+            self._notify()
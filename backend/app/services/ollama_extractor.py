@@ -1,84 +1,500 @@
+import asyncio
 import httpx
 import json
 import re
-from typing import Dict, Any, List
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Callable, Awaitable
 from app.config import settings
+from app.services.json_stream import AssignmentStreamParser
+from app.services.keyword_classifier import EXCLUDE_KEYWORDS, detect_type, title_key
+from app.services.llm_backends import LLMBackend, Messages, create_backend, prompt_key
+from app.services.llm_endpoints import EndpointPool
 from app.services.time_estimator import time_estimator
 
 
 class OllamaExtractor:
-    """Extract assignments from syllabus text using Ollama."""
+    """Extract assignments from syllabus text using Ollama.
+
+    The chat protocol is pluggable (``settings.llm_backend``): Ollama's
+    own API, an OpenAI-compatible server such as llama.cpp or vLLM, or a
+    fake in-process model for load tests.
+    """
+
+    # Bump whenever the prompt or response processing changes, so cached
+    # extractions made with the old prompt are not reused
+    PROMPT_VERSION = 2
 
     def __init__(self):
-        self.base_url = settings.ollama_base_url
+        self.base_url = settings.llm_base_url or settings.ollama_base_url
         self.model = settings.ollama_model
+        self._client: Optional[httpx.AsyncClient] = None
+        self.backend: LLMBackend = create_backend(settings.llm_backend, self._request)
+        self.endpoints = EndpointPool(
+            settings.ollama_endpoints or [self.base_url], self._get_client, self.backend.health_path
+        )
+        self._pool_metrics = {
+            "requests": 0,
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "new_connections": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        # Prompt variant ("json" / "plain") that last produced a usable answer, per model
+        self._preferred_variant: Dict[str, str] = {}
+        self._retry_stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def model_key(self) -> str:
+        """Model identity for cache keys; other backends never share Ollama's cached results."""
+        return self.model if self.backend.name == "ollama" else f"{self.backend.name}/{self.model}"
+
+    async def start(self):
+        """Open the shared HTTP client and start endpoint health checks (called from the app lifespan)."""
+        self._get_client()
+        self.endpoints.start()
+
+    async def close(self):
+        """Stop health checks and close the shared HTTP client and its pooled connections."""
+        await self.endpoints.stop()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily too, so the extractor still works outside the app
+        if self._client is None:
+            if self.max_connections > settings.ollama_max_connections:
+                print(
+                    f"[OLLAMA] ollama_max_connections={settings.ollama_max_connections} is below "
+                    f"{len(self.endpoints.endpoints)} endpoints x {settings.ollama_endpoint_concurrency} slots, "
+                    f"using {self.max_connections}",
+                    flush=True
+                )
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(
+                    settings.ollama_read_timeout,
+                    connect=settings.ollama_connect_timeout,
+                    pool=settings.ollama_pool_timeout
+                ),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=settings.ollama_max_keepalive,
+                    keepalive_expiry=settings.ollama_keepalive_expiry
+                ),
+                http2=settings.ollama_http2 and _h2_available()
+            )
+        return self._client
+
+    @property
+    def max_connections(self) -> int:
+        """Client connection limit: the configured one, or enough for every endpoint's slots.
+
+        Requests should queue for an endpoint slot in ``EndpointPool.acquire``
+        rather than on the client pool, so the pool holds each endpoint's
+        ``ollama_endpoint_concurrency`` requests plus its health check.
+        """
+        slots = len(self.endpoints.endpoints) * (settings.ollama_endpoint_concurrency + 1)
+        return max(settings.ollama_max_connections, slots)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Connection pool utilization for the shared Ollama client."""
+        metrics = self._pool_metrics
+        stats = {
+            **metrics,
+            "total_wait_seconds": round(metrics["total_wait_seconds"], 3),
+            "max_wait_seconds": round(metrics["max_wait_seconds"], 3),
+            "avg_wait_seconds": round(metrics["total_wait_seconds"] / metrics["requests"], 3) if metrics["requests"] else 0.0,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": settings.ollama_max_keepalive,
+            "open_connections": None,
+            "idle_connections": None,
+        }
+        # httpx doesn't expose its pool; read httpcore's when it is reachable
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["open_connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+    @asynccontextmanager
+    async def _request(self, path: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        """POST through the shared client and yield the (streamed) response.
+
+        The endpoint pool picks the server. A request that can't connect is
+        retried on another endpoint, and the outcome feeds that endpoint's
+        breaker and latency stats. A pool timeout is not retried: the
+        connection limit is the client's, shared by every endpoint. Records how long the request waited for a pooled connection;
+        it counts as in flight until the body has been consumed.
+        """
+        metrics = self._pool_metrics
+        started = time.perf_counter()
+        waited = None
+
+        async def trace(event_name: str, info: dict):
+            nonlocal waited
+            if event_name == "connection.connect_tcp.started":
+                metrics["new_connections"] += 1
+            # The first of these marks the moment we got a connection from the pool
+            if waited is None and event_name in ("connection.connect_tcp.started",
+                                                 "http11.send_request_headers.started",
+                                                 "http2.send_request_headers.started"):
+                waited = time.perf_counter() - started
+
+        metrics["requests"] += 1
+        metrics["in_flight"] += 1
+        metrics["peak_in_flight"] = max(metrics["peak_in_flight"], metrics["in_flight"])
+        try:
+            client = self._get_client()
+            tried = set()
+            connect_error = None
+            while True:
+                try:
+                    endpoint = await self.endpoints.acquire(tried)
+                except ConnectionError:
+                    if connect_error is not None:
+                        raise connect_error
+                    raise
+                if connect_error is not None:
+                    self.endpoints.retries += 1
+                request = client.build_request(
+                    "POST", f"{endpoint.url}{path}", json=payload, headers=headers, extensions={"trace": trace}
+                )
+                sent = time.perf_counter()
+                try:
+                    response = await client.send(request, stream=True)
+                except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                    # Nothing was generated yet, so another endpoint can take it
+                    self.endpoints.release(endpoint, time.perf_counter() - sent, e)
+                    print(f"[OLLAMA] Cannot connect to {endpoint.url}, trying another endpoint", flush=True)
+                    tried.add(endpoint)
+                    connect_error = e
+                    continue
+                except BaseException as e:
+                    self.endpoints.release(endpoint, time.perf_counter() - sent, e)
+                    raise
+                break
+
+            error = None
+            try:
+                yield response
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                await response.aclose()
+                self.endpoints.release(endpoint, time.perf_counter() - sent, error)
+        finally:
+            metrics["in_flight"] -= 1
+            if waited is not None:
+                metrics["total_wait_seconds"] += waited
+                metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], waited)
+
+    async def extract_assignments(
+        self,
+        syllabus_text: str,
+        on_assignment: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Send text to Ollama and extract structured assignment data.
+
+        Text longer than ``settings.ollama_chunk_size`` is split into
+        overlapping chunks that are extracted concurrently and merged.
+
+        If ``on_assignment`` is given it is awaited exactly once for every
+        assignment in the result - as soon as its title has streamed in
+        where possible, otherwise once the full response has been parsed.
+        Titles streamed from a prompt variant that is then discarded have
+        been passed on too, but are left out of the returned result.
+        """
+        chunks = self._split_into_chunks(syllabus_text) if settings.ollama_chunking else [syllabus_text]
+
+        emitted: Dict[str, Dict[str, Any]] = {}
+        emit_lock = asyncio.Lock()
+
+        async def emit(assignment: Dict[str, Any]):
+            key = title_key(assignment["title"])
+            # Chunks stream concurrently; callbacks run one at a time
+            async with emit_lock:
+                if key in emitted:
+                    return
+                emitted[key] = assignment
+                await on_assignment(assignment)
+
+        async def on_title(title: str):
+            item = {"title": title, "type": self._detect_type(title), "due_date": None, "estimated_hours": None}
+            for assignment in self._process_assignments({"assignments": [item]})["assignments"]:
+                await emit(assignment)
+
+        on_title = on_title if on_assignment else None
 
-    async def extract_assignments(self, syllabus_text: str) -> Dict[str, Any]:
-        """Send text to Ollama and extract structured assignment data."""
+        try:
+            if len(chunks) == 1:
+                raw_response = await self._chat(chunks[0], on_title)
 
-        system_msg, user_msg = self._build_chat_messages(syllabus_text)
+                # Check for empty or near-empty responses
+                if len(raw_response.strip()) < 30:
+                    print(f"[OLLAMA] ERROR: Model returned empty/minimal response after retry.", flush=True)
+                    print(f"[OLLAMA] Response was: '{raw_response}'", flush=True)
+                    raise RuntimeError("Model returned empty response - the syllabus may be too complex")
 
-        try:
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                # First try with JSON format
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": system_msg},
-                            {"role": "user", "content": user_msg}
-                        ],
-                        "stream": False,
-                        "format": "json"
-                    }
-                )
-                response.raise_for_status()
-                result = response.json()
-                raw_response = result.get("message", {}).get("content", "")
-
-                # If JSON format gives empty response, retry without it
-                if len(raw_response.strip()) < 50:
-                    print("[OLLAMA] JSON format gave minimal response, retrying without format constraint...", flush=True)
-                    response = await client.post(
-                        f"{self.base_url}/api/chat",
-                        json={
-                            "model": self.model,
-                            "messages": [
-                                {"role": "system", "content": system_msg},
-                                {"role": "user", "content": user_msg}
-                            ],
-                            "stream": False
-                        }
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    raw_response = result.get("message", {}).get("content", "")
-            print(f"[OLLAMA] Raw response length: {len(raw_response)} chars", flush=True)
-            print(f"[OLLAMA] Full raw response: {raw_response}", flush=True)
-
-            # Check for empty or near-empty responses
-            if len(raw_response.strip()) < 30:
-                print(f"[OLLAMA] ERROR: Model returned empty/minimal response after retry.", flush=True)
-                print(f"[OLLAMA] Response was: '{raw_response}'", flush=True)
-                raise RuntimeError("Model returned empty response - the syllabus may be too complex")
+                parsed = self._parse_response(raw_response)
+            else:
+                parsed = await self._extract_chunks(chunks, on_title)
 
-            parsed = self._parse_response(raw_response)
             print(f"[OLLAMA] Parsed {len(parsed.get('assignments', []))} assignments from response", flush=True)
 
             processed = self._process_assignments(parsed)
             print(f"[OLLAMA] After processing: {len(processed.get('assignments', []))} assignments", flush=True)
+
+            if on_assignment:
+                # Emit whatever the stream parser could not pick up (e.g. dict items)
+                for assignment in processed["assignments"]:
+                    await emit(assignment)
+                # Only what the kept responses contain, as first emitted
+                kept = {title_key(a["title"]): emitted[title_key(a["title"])] for a in processed["assignments"]}
+                processed["assignments"] = list(kept.values())
             return processed
 
-        except httpx.ConnectError:
-            raise ConnectionError(
-                "Cannot connect to Ollama. Make sure Ollama is running: 'ollama serve'"
-            )
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if self.backend.name == "ollama":
+                raise ConnectionError(
+                    "Cannot connect to Ollama. Make sure Ollama is running: 'ollama serve'"
+                )
+            raise ConnectionError(f"Cannot connect to the LLM server at {self.base_url}")
+        except httpx.TransportError as e:
+            # Read/write/pool timeouts and connections dropped mid-response
+            raise ConnectionError(f"LLM request failed ({self.backend.name}): {type(e).__name__} {e}".rstrip())
         except httpx.HTTPStatusError as e:
-            raise RuntimeError(f"Ollama API error: {e.response.status_code}")
+            raise RuntimeError(f"LLM API error ({self.backend.name}): {e.response.status_code}")
+
+    async def _chat(self, syllabus_text: str, on_title: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
+        """Run one chat completion and return the raw message content.
+
+        There are two prompt variants: "json" (``format: "json"``) and
+        "plain" (no format constraint), since some models answer the JSON
+        variant with an empty response. By default the variant that last
+        worked for this model goes first and the other is the fallback;
+        with ``ollama_fallback_strategy = "race"`` both are sent at once
+        and the first useful answer wins.
+        """
+        system_msg, user_msg = self._build_chat_messages(syllabus_text)
+        messages = [
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_msg}
+        ]
+        stats = self._model_retry_stats()
+        stats["requests"] += 1
+
+        if settings.ollama_fallback_strategy == "race":
+            raw_response, variant = await self._race_variants(messages, on_title)
+        else:
+            variant = self._preferred_variant.get(self.model, "json")
+            raw_response = await self._complete(messages, variant == "json", on_title, abort_if_empty=True)
+
+            # If the first variant gives an empty response, retry with the other
+            if len(raw_response.strip()) < 50:
+                variant = "plain" if variant == "json" else "json"
+                print(f"[OLLAMA] Minimal response, retrying with the {variant} prompt variant...", flush=True)
+                stats["retries"] += 1
+                raw_response = await self._complete(messages, variant == "json", on_title)
+
+        if len(raw_response.strip()) >= 50:
+            # Later requests for this model start with whichever variant worked
+            self._preferred_variant[self.model] = variant
+            stats[f"{variant}_wins"] += 1
+
+        print(f"[OLLAMA] Raw response length: {len(raw_response)} chars", flush=True)
+        print(f"[OLLAMA] Full raw response: {raw_response}", flush=True)
+        if settings.llm_record_path:
+            await asyncio.to_thread(self._record_response, messages, variant == "json", raw_response)
+        return raw_response
+
+    def _record_response(self, messages: Messages, json_mode: bool, content: str):
+        """Append a prompt/response pair for the stub LLM server to replay."""
+        record = {"prompt_key": prompt_key(messages), "json_mode": json_mode, "model": self.model, "content": content}
+        with open(settings.llm_record_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    async def _race_variants(self, messages: Messages, on_title) -> tuple:
+        """Send both prompt variants at once; return (content, variant) of the first useful one.
+
+        Only the json variant streams titles to ``on_title`` - the plain
+        one is rarely clean JSON until it is finished.
+        """
+        tasks = {
+            asyncio.create_task(self._complete(messages, True, on_title, abort_if_empty=True)): "json",
+            asyncio.create_task(self._complete(messages, False)): "plain",
+        }
+        best, best_variant, error = "", "json", None
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    content = task.result()
+                    if len(content.strip()) >= 50:
+                        return content, tasks[task]
+                    if len(content.strip()) > len(best.strip()):
+                        best, best_variant = content, tasks[task]
+            if error is not None and not best.strip():
+                raise error
+            return best, best_variant
+        finally:
+            # Cancelling closes the loser's stream, which stops its generation
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _complete(
+        self,
+        messages: Messages,
+        json_mode: bool,
+        on_title: Optional[Callable[[str], Awaitable[None]]] = None,
+        abort_if_empty: bool = False
+    ) -> str:
+        """Run one completion on the backend and return the message content.
+
+        With ``settings.ollama_streaming`` the response is read piece by
+        piece and each assignment title is passed to ``on_title`` as soon as
+        its string closes. With ``abort_if_empty``, a stream that is still
+        only whitespace after ``ollama_empty_abort_tokens`` tokens is cut
+        off and "" returned, rather than waiting for the whole generation.
+        """
+        if not settings.ollama_streaming:
+            return await self.backend.complete(self.model, messages, json_mode)
+
+        stream_parser = AssignmentStreamParser()
+        parts = []
+        has_content = False
+        pieces = self.backend.stream(self.model, messages, json_mode)
+        try:
+            async for piece in pieces:
+                parts.append(piece)
+                has_content = has_content or bool(piece.strip())
+                if on_title:
+                    for title in stream_parser.feed(piece):
+                        await on_title(title)
+                if abort_if_empty and not has_content and len(parts) >= settings.ollama_empty_abort_tokens:
+                    print(f"[OLLAMA] Only whitespace after {len(parts)} tokens, aborting", flush=True)
+                    self._model_retry_stats()["early_aborts"] += 1
+                    return ""
+        finally:
+            # Closes the response, which stops the generation on the server
+            await pieces.aclose()
+        return "".join(parts)
+
+    def endpoint_stats(self) -> Dict[str, Any]:
+        """Per-endpoint health, breaker state, latency and error rate."""
+        return self.endpoints.stats()
+
+    def _model_retry_stats(self) -> Dict[str, int]:
+        return self._retry_stats.setdefault(self.model, {
+            "requests": 0, "retries": 0, "early_aborts": 0, "json_wins": 0, "plain_wins": 0
+        })
+
+    def retry_stats(self) -> Dict[str, Any]:
+        """Per-model fallback counters and the prompt variant currently preferred."""
+        return {
+            model: {
+                **stats,
+                "retry_rate": round(stats["retries"] / stats["requests"], 3) if stats["requests"] else 0.0,
+                "preferred_variant": self._preferred_variant.get(model, "json"),
+            }
+            for model, stats in self._retry_stats.items()
+        }
+
+    async def _extract_chunks(self, chunks: List[str], on_title: Optional[Callable[[str], Awaitable[None]]] = None) -> Dict[str, Any]:
+        """Extract every chunk concurrently and merge the parsed results."""
+        limit = asyncio.Semaphore(settings.ollama_chunk_concurrency)
 
-    # Items to exclude (not real assignments)
-    EXCLUDE_KEYWORDS = ["participation", "attendance", "class participation", "class attendance"]
+        async def extract_chunk(index: int, chunk: str) -> Dict[str, Any]:
+            async with limit:
+                print(f"[OLLAMA] Extracting chunk {index + 1}/{len(chunks)} ({len(chunk)} chars)", flush=True)
+                raw_response = await self._chat(chunk, on_title)
+            # A chunk of pure boilerplate can legitimately have nothing to list
+            if len(raw_response.strip()) < 30:
+                return None
+            return self._parse_response(raw_response)
+
+        tasks = [asyncio.create_task(extract_chunk(i, c)) for i, c in enumerate(chunks)]
+        try:
+            results = await asyncio.gather(*tasks)
+        finally:
+            # One failed chunk fails the syllabus; stop the rest before the caller
+            # rolls back, or their on_title callbacks would keep persisting rows
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        results = [r for r in results if r is not None]
+        if not results:
+            raise RuntimeError("Model returned empty response - the syllabus may be too complex")
+        return self._merge_chunk_results(results)
+
+    def _split_into_chunks(self, text: str) -> List[str]:
+        """Split text on paragraph/page boundaries into overlapping chunks.
+
+        Each chunk starts with the tail (up to ``ollama_chunk_overlap``
+        characters) of the previous one, so an assignment split across a
+        boundary still appears whole in one of them.
+        """
+        size = settings.ollama_chunk_size
+        overlap = settings.ollama_chunk_overlap
+        if len(text) <= size:
+            return [text]
+
+        # Paragraphs too long to fit after an overlap are hard-split
+        max_paragraph = max(1, size - overlap - 2)
+        paragraphs = []
+        for paragraph in re.split(r'\n\s*\n', text):
+            paragraph = paragraph.strip()
+            while len(paragraph) > max_paragraph:
+                paragraphs.append(paragraph[:max_paragraph])
+                paragraph = paragraph[max_paragraph:]
+            if paragraph:
+                paragraphs.append(paragraph)
+
+        chunks = []
+        current = ""
+        for paragraph in paragraphs:
+            if current and len(current) + len(paragraph) + 2 > size:
+                chunks.append(current)
+                tail = current[-overlap:] if overlap else ""
+                # Start the overlap on a line boundary when there is one
+                if "\n" in tail:
+                    tail = tail[tail.index("\n") + 1:].lstrip()
+                current = f"{tail}\n\n{paragraph}" if tail else paragraph
+            else:
+                current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _merge_chunk_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-chunk results, dropping assignments repeated by the overlap."""
+        merged = {"assignments": [], "course_info": {}}
+        seen = set()
+
+        for result in results:
+            for key, value in result.get("course_info", {}).items():
+                if value and not merged["course_info"].get(key):
+                    merged["course_info"][key] = value
+
+            for item in result.get("assignments", []):
+                if not isinstance(item, dict):
+                    continue
+                key = title_key(str(item.get("title", "")))
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                merged["assignments"].append(item)
+
+        print(f"[OLLAMA] Merged {len(results)} chunks into {len(merged['assignments'])} assignments", flush=True)
+        return merged
 
     def _build_chat_messages(self, syllabus_text: str) -> tuple:
         """Build system and user messages for chat API."""
@@ -95,10 +511,14 @@ Rules:
 
         user_msg = f"""List all assignments from this syllabus:
 
-{syllabus_text[:12000]}"""
+{syllabus_text[:settings.ollama_chunk_size]}"""
 
         return system_msg, user_msg
 
+    def _detect_type(self, title: str) -> str:
+        """Determine assignment type from keywords in the title."""
+        return detect_type(title)
+
     def _parse_response(self, response_text: str) -> Dict[str, Any]:
         """Parse and validate the LLM response."""
         default_response = {"assignments": [], "course_info": {}}
@@ -124,26 +544,7 @@ Rules:
                 if isinstance(item, str):
                     # Simple string title - determine type from keywords
                     title = item.strip()
-                    title_lower = title.lower()
-
-                    if "quiz" in title_lower:
-                        atype = "quiz"
-                    elif "exam" in title_lower or "midterm" in title_lower or "final" in title_lower:
-                        atype = "exam"
-                    elif "project" in title_lower:
-                        atype = "project"
-                    elif "paper" in title_lower or "essay" in title_lower or "report" in title_lower:
-                        atype = "paper"
-                    elif "reading" in title_lower or "chapter" in title_lower:
-                        atype = "reading"
-                    elif "presentation" in title_lower:
-                        atype = "presentation"
-                    elif "lab" in title_lower:
-                        atype = "lab"
-                    elif "homework" in title_lower or "hw" in title_lower or "assignment" in title_lower:
-                        atype = "homework"
-                    else:
-                        atype = "other"
+                    atype = self._detect_type(title)
 
                     result["assignments"].append({
                         "title": title,
@@ -241,7 +642,7 @@ Rules:
             title = assignment.get("title", "").strip().lower()
 
             # Skip participation/attendance items
-            if any(keyword in title for keyword in self.EXCLUDE_KEYWORDS):
+            if any(keyword in title for keyword in EXCLUDE_KEYWORDS):
                 continue
 
             assignment_type = assignment.get("type", "other").lower()
@@ -258,27 +659,27 @@ Rules:
             if "quiz" in title:
                 assignment_type = "quiz"
 
-            # Use time estimator to refine or fill in time estimates
-            estimated_hours = time_estimator.estimate(
-                assignment_type=assignment_type,
-                title=assignment.get("title", ""),
-                description=assignment.get("description"),
-                llm_estimate=assignment.get("estimated_hours")
-            )
-
             processed = {
                 "title": assignment.get("title", "").strip(),
                 "description": assignment.get("description"),
                 "assignment_type": assignment_type,
                 "due_date": self._parse_date(assignment.get("due_date")),
                 "due_time": assignment.get("due_time"),
-                "estimated_hours": estimated_hours,
+                "estimated_hours": None,
                 "weight_percentage": assignment.get("weight"),
                 "confidence_score": 0.8  # Default confidence
             }
 
             processed_assignments.append(processed)
 
+        # Use time estimator to fill in time estimates, in one pass over all titles
+        estimates = time_estimator.estimate_batch([
+            {"assignment_type": a["assignment_type"], "title": a["title"], "description": a["description"]}
+            for a in processed_assignments
+        ])
+        for processed, estimated_hours in zip(processed_assignments, estimates):
+            processed["estimated_hours"] = estimated_hours
+
         return {
             "course_info": course_info,
             "assignments": processed_assignments
@@ -296,5 +697,14 @@ Rules:
         return None
 
 
+def _h2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
 # Singleton instance
 ollama_extractor = OllamaExtractor()
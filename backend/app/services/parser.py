@@ -1,54 +1,298 @@
+import asyncio
+import hashlib
+import multiprocessing
 import pdfplumber
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from docx import Document
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
 
 
 class DocumentParser:
-    """Extract text from various document formats."""
+    """Extract text from various document formats.
+
+    ``parse_structured`` returns ``{"pages": [{"page": n, "blocks": [...]}]}``
+    where each block is ``{"type": "text", "text": ...}`` or
+    ``{"type": "table", "rows": [[cell, ...], ...]}``, in reading order.
+    ``parse`` is the same document flattened by ``render_text``, with table
+    rows written as " | "-joined lines.
+    """
 
     SUPPORTED_TYPES = {'.pdf', '.docx', '.doc', '.txt'}
 
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # (content hash, page index) -> parsed page, so retries skip layout analysis
+        self._page_cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+        self.page_cache_hits = 0
+        self.page_cache_misses = 0
+
     def parse(self, file_path: Path) -> str:
         """Main entry point - routes to appropriate parser."""
+        return render_text(self.parse_structured(file_path))
+
+    def parse_structured(self, file_path: Path) -> Dict[str, Any]:
         suffix = file_path.suffix.lower()
 
         if suffix == '.pdf':
-            return self._parse_pdf(file_path)
+            return {"pages": self._parse_pdf(file_path)}
         elif suffix in {'.docx', '.doc'}:
-            return self._parse_docx(file_path)
+            return {"pages": [self._parse_docx(file_path)]}
         elif suffix == '.txt':
-            return self._parse_txt(file_path)
+            return {"pages": [self._parse_txt(file_path)]}
         else:
             raise ValueError(f"Unsupported file type: {suffix}")
 
-    def _parse_pdf(self, file_path: Path) -> str:
-        """Extract text from PDF using pdfplumber for better accuracy."""
-        text_parts = []
+    async def parse_structured_async(self, file_path: Path, content_key: Optional[str] = None) -> Dict[str, Any]:
+        """Parse in the process pool so layout analysis never blocks the event loop.
+
+        Large PDFs are split into page ranges that are parsed in parallel
+        and reassembled in page order. Parsed PDF pages are cached by
+        ``content_key`` (SHA-256 of the file, computed if not given), so a
+        retried job only parses pages it hasn't seen. Raises TimeoutError if
+        parsing takes longer than ``settings.parse_timeout``; the pool is
+        killed and rebuilt so a pathological file can't hold a worker forever,
+        and other jobs caught in the killed pool run again on the new one.
+        """
+        suffix = file_path.suffix.lower()
+        if suffix not in self.SUPPORTED_TYPES:
+            raise ValueError(f"Unsupported file type: {suffix}")
+
+        try:
+            return await asyncio.wait_for(
+                self._parse_in_pool(file_path, content_key),
+                timeout=settings.parse_timeout
+            )
+        except asyncio.TimeoutError:
+            print(f"[PARSER] Parsing {file_path.name} timed out, restarting pool", flush=True)
+            self._kill_pool()
+            raise TimeoutError(f"Parsing took longer than {settings.parse_timeout:.0f}s")
+
+    async def _parse_in_pool(self, file_path: Path, content_key: Optional[str]) -> Dict[str, Any]:
+        path = str(file_path)
+
+        if file_path.suffix.lower() != '.pdf':
+            return await self._run_in_pool(_parse_file, path)
+
+        if content_key is None:
+            content_key = hashlib.sha256(await asyncio.to_thread(file_path.read_bytes)).hexdigest()
+
+        page_count = await self._run_in_pool(_count_pdf_pages, path)
+        pages: Dict[int, Dict[str, Any]] = {}
+        missing = []
+        for index in range(page_count):
+            page = self._cached_page(content_key, index)
+            if page is None:
+                missing.append(index)
+            else:
+                pages[index] = page
+
+        async def parse_range(start: int, end: int):
+            # Cache each range as it lands, so a timeout keeps the finished ones
+            for index, page in enumerate(
+                await self._run_in_pool(_parse_pdf_pages, path, start, end), start
+            ):
+                pages[index] = page
+                self._cache_page(content_key, index, page)
+
+        if missing:
+            await asyncio.gather(*(
+                parse_range(start, end) for start, end in _page_ranges(missing, max(1, settings.parse_pages_per_chunk))
+            ))
+        if len(missing) < page_count:
+            print(f"[PARSER] Reused {page_count - len(missing)}/{page_count} cached pages of {file_path.name}", flush=True)
+
+        return {"pages": [pages[index] for index in range(page_count)]}
+
+    async def _run_in_pool(self, fn, *args):
+        """Run fn in the pool, again on a fresh pool if another job's timeout killed this one."""
+        loop = asyncio.get_running_loop()
+        while True:
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                if executor is self._executor:
+                    # A worker died on its own (crash, OOM kill): fail this call, start clean next time
+                    self._executor = None
+                    raise
+                print(f"[PARSER] Pool restarted under {fn.__name__}, running it again", flush=True)
+
+    def _cached_page(self, content_key: str, index: int) -> Optional[Dict[str, Any]]:
+        page = self._page_cache.get((content_key, index))
+        if page is None:
+            self.page_cache_misses += 1
+            return None
+        self._page_cache.move_to_end((content_key, index))
+        self.page_cache_hits += 1
+        return page
+
+    def _cache_page(self, content_key: str, index: int, page: Dict[str, Any]):
+        self._page_cache[(content_key, index)] = page
+        self._page_cache.move_to_end((content_key, index))
+        while len(self._page_cache) > settings.parse_page_cache_size:
+            self._page_cache.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.page_cache_hits + self.page_cache_misses
+        return {
+            "page_cache_pages": len(self._page_cache),
+            "page_cache_hits": self.page_cache_hits,
+            "page_cache_misses": self.page_cache_misses,
+            "page_cache_hit_rate": round(self.page_cache_hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: the parent runs an event loop and worker threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.parse_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def _kill_pool(self):
+        """Terminate every worker process, including ones stuck mid-parse.
+
+        Calls from other jobs still in the pool, running or queued, fail
+        with BrokenProcessPool and ``_run_in_pool`` sends them to the next
+        pool. Their futures are not cancelled, which would look to those
+        jobs like being cancelled themselves.
+        """
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list((executor._processes or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False)
+
+    def shutdown(self):
+        """Stop the process pool (called on app shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _parse_pdf(self, file_path: Path, start: int = 0, end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Extract text blocks and tables from PDF pages using pdfplumber.
+
+        Tables found by pdfplumber's table finder come back as row arrays
+        instead of being flattened into run-on lines; the text around them
+        is split into blocks above, between and below the tables.
+        """
         with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-        return "\n\n".join(text_parts)
+            return [
+                self._parse_pdf_page(page, number)
+                for number, page in enumerate(pdf.pages[start:end], start + 1)
+            ]
+
+    def _parse_pdf_page(self, page, number: int) -> Dict[str, Any]:
+        tables = []
+        for table in page.find_tables():
+            rows = _clean_rows(table.extract())
+            # One-row or one-column "tables" are usually boxed headings or callouts
+            if len(rows) > 1 and max(len(row) for row in rows) > 1:
+                tables.append((table.bbox, rows))
+        if not tables:
+            text = page.extract_text()
+            return {"page": number, "blocks": [{"type": "text", "text": text}] if text else []}
+
+        tables.sort(key=lambda table: table[0][1])
+        text_page = page
+        for bbox, _ in tables:
+            text_page = text_page.outside_bbox(bbox)
+
+        x0, top, x1, bottom = page.bbox
+        blocks = []
+        band_top = top
+        for (_, table_top, _, table_bottom), rows in tables:
+            self._append_text_band(blocks, text_page, (x0, band_top, x1, max(band_top, table_top)))
+            blocks.append({"type": "table", "rows": rows})
+            # Text beside the table, then carry on below it
+            band_top = max(band_top, table_top)
+            self._append_text_band(blocks, text_page, (x0, band_top, x1, max(band_top, table_bottom)))
+            band_top = max(band_top, table_bottom)
+        self._append_text_band(blocks, text_page, (x0, band_top, x1, bottom))
+        return {"page": number, "blocks": blocks}
 
-    def _parse_docx(self, file_path: Path) -> str:
+    @staticmethod
+    def _append_text_band(blocks: List[Dict[str, Any]], text_page, bbox: Tuple[float, float, float, float]):
+        if bbox[3] <= bbox[1]:
+            return
+        text = text_page.crop(bbox).extract_text()
+        if text and text.strip():
+            blocks.append({"type": "text", "text": text})
+
+    def _parse_docx(self, file_path: Path) -> Dict[str, Any]:
         """Extract text from Word documents."""
         doc = Document(file_path)
         paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+        blocks = [{"type": "text", "text": "\n\n".join(paragraphs)}] if paragraphs else []
 
         # Also extract from tables (common in syllabi)
         for table in doc.tables:
-            for row in table.rows:
-                row_text = " | ".join(cell.text.strip() for cell in row.cells if cell.text.strip())
-                if row_text.strip():
-                    paragraphs.append(row_text)
+            rows = _clean_rows([cell.text for cell in row.cells] for row in table.rows)
+            if rows:
+                blocks.append({"type": "table", "rows": rows})
 
-        return "\n\n".join(paragraphs)
+        return {"page": 1, "blocks": blocks}
 
-    def _parse_txt(self, file_path: Path) -> str:
+    def _parse_txt(self, file_path: Path) -> Dict[str, Any]:
         """Read plain text file."""
-        return file_path.read_text(encoding='utf-8')
+        text = file_path.read_text(encoding='utf-8')
+        return {"page": 1, "blocks": [{"type": "text", "text": text}] if text else []}
+
+
+def render_text(document: Dict[str, Any]) -> str:
+    """Flatten a structured document to text, one " | "-joined line per table row."""
+    parts = []
+    for page in document["pages"]:
+        for block in page["blocks"]:
+            if block["type"] == "table":
+                parts.append("\n".join(" | ".join(cell for cell in row if cell) for row in block["rows"]))
+            else:
+                parts.append(block["text"])
+    return "\n\n".join(part for part in parts if part)
+
+
+def _clean_rows(rows) -> List[List[str]]:
+    """Normalise table cells to single-line strings and drop empty rows."""
+    cleaned = []
+    for row in rows:
+        cells = [" ".join((cell or "").split()) for cell in row]
+        if any(cells):
+            cleaned.append(cells)
+    return cleaned
+
+
+def _page_ranges(indexes: List[int], chunk: int) -> List[Tuple[int, int]]:
+    """Group sorted page indexes into contiguous [start, end) runs of at most chunk pages."""
+    ranges = []
+    for index in indexes:
+        if ranges and ranges[-1][1] == index and ranges[-1][1] - ranges[-1][0] < chunk:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([index, index + 1])
+    return [(start, end) for start, end in ranges]
+
+
+# Process pool entry points (module-level so they can be pickled)
+
+def _parse_file(file_path: str) -> Dict[str, Any]:
+    return parser.parse_structured(Path(file_path))
+
+
+def _parse_pdf_pages(file_path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    return parser._parse_pdf(Path(file_path), start, end)
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
 
 
 # Singleton instance
@@ -0,0 +1,413 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.config import settings
+from app.db.database import async_session
+from app.db import crud
+from app.db.models import ProcessingJobDB, SyllabusDB
+from app.services.parser import parser, render_text
+from app.services.ollama_extractor import ollama_extractor
+from app.services.rule_extractor import rule_extractor
+from app.services.relevance_filter import CHARS_PER_TOKEN, relevance_filter
+from app.services.extraction_cache import extraction_cache
+from app.services.events import progress_broker
+from app.services.keyword_classifier import title_key
+
+
+class ProcessingQueue:
+    """Durable, bounded worker pool for syllabus processing.
+
+    Jobs live in the ``processing_jobs`` table so they survive restarts.
+    A fixed number of workers share the app's event loop, and each
+    pipeline stage (parse / LLM / persist) has its own concurrency cap.
+    """
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._parse_limit: Optional[asyncio.Semaphore] = None
+        self._llm_limit: Optional[asyncio.Semaphore] = None
+        self._persist_limit: Optional[asyncio.Semaphore] = None
+        self._metrics = {
+            "first_assignment_count": 0,
+            "first_assignment_total_seconds": 0.0,
+            "first_assignment_max_seconds": 0.0,
+            "first_assignment_last_seconds": 0.0,
+        }
+        # Which extractor produced each result, and the time spent in it;
+        # "rules_rejected" is time the rule pass spent before falling back to the LLM,
+        # "llm_filtered" is an LLM call on a prompt the relevance filter shrank
+        self._paths = {
+            path: {"count": 0, "seconds": 0.0}
+            for path in ("rules", "rules_rejected", "llm", "llm_filtered")
+        }
+        self._prompt_chars = {"before": 0, "after": 0}
+
+    async def start(self):
+        """Recover interrupted jobs and launch the workers."""
+        self._wakeup = asyncio.Event()
+        self._parse_limit = asyncio.Semaphore(settings.parse_concurrency)
+        self._llm_limit = asyncio.Semaphore(settings.llm_concurrency)
+        self._persist_limit = asyncio.Semaphore(settings.persist_concurrency)
+
+        async with async_session() as db:
+            requeued, failed = await crud.recover_interrupted_jobs(db, settings.job_max_attempts)
+        if requeued or failed:
+            print(f"[QUEUE] Recovered {requeued} interrupted jobs, failed {len(failed)}", flush=True)
+        # Failed jobs never reach a worker, so drop their uploads here
+        for job in failed:
+            Path(job.file_path).unlink(missing_ok=True)
+
+        self._workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(settings.worker_concurrency)
+        ]
+        print(f"[QUEUE] Started {len(self._workers)} workers", flush=True)
+
+    async def stop(self):
+        """Cancel the workers. Running jobs are picked up again on next start."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self):
+        """Wake idle workers after a job has been enqueued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def enqueue(self, db, filename: str, file_path: Path) -> Tuple[SyllabusDB, ProcessingJobDB]:
+        """Create a syllabus and its job in one transaction, so no syllabus is left without a job."""
+        [(syllabus, job)] = await crud.create_syllabi_with_jobs(db, [(filename, str(file_path))])
+        progress_broker.publish_status(syllabus.id, "queued")
+        self.notify()
+        return syllabus, job
+
+    async def enqueue_batch(self, db, files: List[Tuple[str, Path]], batch_id: str) -> list:
+        """Create syllabi and jobs for (filename, file_path) pairs in one transaction."""
+        created = await crud.create_syllabi_with_jobs(
+            db, [(filename, str(file_path)) for filename, file_path in files], batch_id
+        )
+        for syllabus, _ in created:
+            progress_broker.publish_status(syllabus.id, "queued", batch_id=batch_id)
+        self.notify()
+        return created
+
+    async def _worker(self, worker_id: int):
+        while True:
+            try:
+                async with async_session() as db:
+                    job = await crud.claim_next_job(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[QUEUE] Worker {worker_id} failed to claim a job: {e}", flush=True)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.job_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            print(f"[QUEUE] Worker {worker_id} picked up job {job.id} (attempt {job.attempts})", flush=True)
+            try:
+                await self._process_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Recording the job's outcome failed too (e.g. the database went away);
+                # keep the worker alive, the job is recovered on the next start
+                print(f"[QUEUE] Worker {worker_id} failed on job {job.id}: {e}", flush=True)
+
+    async def _extract(self, db, file_path: Path, on_assignment, on_stage) -> tuple:
+        """Parse and extract a document, reusing cached results where possible.
+
+        Returns (raw_text, extraction_result, streamed); when streamed is
+        True every assignment was already handed to ``on_assignment``.
+        ``on_stage`` is called as the parsing and extracting stages start;
+        cache hits skip them.
+        """
+        document_key = extraction_cache.document_key(await asyncio.to_thread(file_path.read_bytes))
+        cached = await extraction_cache.get_document(db, document_key)
+        if cached is not None:
+            print(f"[BG] Document cache hit {document_key[:12]}", flush=True)
+            return cached["raw_text"], cached["extraction"], False
+
+        # Parse document
+        on_stage("parsing")
+        async with self._parse_limit:
+            document = await parser.parse_structured_async(file_path, document_key)
+        raw_text = render_text(document)
+        table_count = sum(block["type"] == "table" for page in document["pages"] for block in page["blocks"])
+        print(
+            f"[BG] Parsed document, got {len(raw_text)} characters, "
+            f"{len(document['pages'])} pages, {table_count} tables",
+            flush=True
+        )
+
+        streamed = False
+        text_key = extraction_cache.text_key(
+            raw_text, ollama_extractor.model_key, ollama_extractor.PROMPT_VERSION
+        )
+        extraction_result = await extraction_cache.get_extraction(db, text_key)
+        if extraction_result is not None:
+            print(f"[BG] Text cache hit {text_key[:12]}", flush=True)
+        else:
+            on_stage("extracting")
+            decision = {}
+            rules_result = None
+            if settings.rules_extractor_enabled:
+                # Well-structured schedules don't need the LLM at all
+                started = time.perf_counter()
+                try:
+                    rules_result = await asyncio.to_thread(rule_extractor.extract, raw_text)
+                except Exception as e:
+                    # The rules are only a shortcut; the LLM still gets the document
+                    self._record_path("rules_rejected", time.perf_counter() - started)
+                    print(f"[BG] Rule extractor failed, falling back to Ollama: {e}", flush=True)
+                else:
+                    elapsed = time.perf_counter() - started
+                    accepted = rules_result["confidence"] >= settings.rules_min_confidence
+                    self._record_path("rules" if accepted else "rules_rejected", elapsed)
+                    decision = {"rules_confidence": rules_result["confidence"], "rules_seconds": round(elapsed, 4)}
+                    print(
+                        f"[BG] Rule extractor found {len(rules_result['assignments'])} assignments "
+                        f"(confidence {rules_result['confidence']:.2f}) in {elapsed * 1000:.0f}ms, "
+                        f"{'using them' if accepted else 'falling back to Ollama'}",
+                        flush=True
+                    )
+                    if accepted:
+                        extraction_result = rules_result
+
+            if extraction_result is None:
+                prompt_text, filtered = raw_text, False
+                if settings.relevance_filter_enabled:
+                    prompt_text, filtered = self._filter_prompt(raw_text, rules_result, decision)
+
+                # Extract assignments using Ollama, persisting them as they stream in
+                started = time.perf_counter()
+                async with self._llm_limit:
+                    print("[BG] Calling Ollama...", flush=True)
+                    extraction_result = await ollama_extractor.extract_assignments(prompt_text, on_assignment)
+                elapsed = time.perf_counter() - started
+                path = "llm_filtered" if filtered else "llm"
+                self._record_path(path, elapsed)
+                decision.update(path=path, seconds=round(elapsed, 4))
+                streamed = True
+                print(f"[BG] Ollama returned {len(extraction_result.get('assignments', []))} assignments", flush=True)
+            else:
+                decision.update(path="rules", seconds=decision["rules_seconds"])
+
+            extraction_result = {**extraction_result, "extraction": decision}
+            await extraction_cache.put_extraction(db, text_key, extraction_result)
+
+        await extraction_cache.put_document(db, document_key, raw_text, extraction_result)
+        return raw_text, extraction_result, streamed
+
+    async def _process_job(self, job: ProcessingJobDB):
+        """Run the parse / extract / persist pipeline for one job."""
+        syllabus_id = job.syllabus_id
+        file_path = Path(job.file_path)
+        started = time.perf_counter()
+        first_assignment_at = None
+        assignment_count = 0
+        stage_seconds = {}
+        current_stage = [None, started]
+
+        def enter_stage(status: str, **details):
+            """Close the timing of the current stage and publish the next one."""
+            now = time.perf_counter()
+            stage, since = current_stage
+            if stage is not None:
+                stage_seconds[stage] = round(now - since, 3)
+            current_stage[:] = [status, now]
+            progress_broker.publish_status(
+                syllabus_id, status,
+                stage_seconds=dict(stage_seconds),
+                elapsed_seconds=round(now - started, 3),
+                **details
+            )
+
+        async with async_session() as db:
+            # Streamed assignments not written yet; the last partial batch
+            # goes in with the final status update
+            pending: List[dict] = []
+            flushed: List[str] = []  # Titles already written
+
+            async def persist(assignment_data: dict):
+                # Called one assignment at a time as the LLM streams them in
+                nonlocal first_assignment_at, assignment_count
+                assignment_count += 1
+                progress_broker.publish(syllabus_id, "assignment", {"assignment": assignment_data})
+                if first_assignment_at is None:
+                    first_assignment_at = time.perf_counter() - started
+                    self._record_first_assignment(first_assignment_at)
+                    print(f"[BG] First assignment streamed after {first_assignment_at:.2f}s", flush=True)
+
+                pending.append(assignment_data)
+                if len(pending) >= settings.persist_batch_size:
+                    batch = pending[:]
+                    del pending[:]
+                    async with self._persist_limit:
+                        await crud.create_assignments_bulk(db, syllabus_id, batch)
+                    flushed.extend(row["title"] for row in batch)
+
+            try:
+                await crud.update_syllabus_status(db, syllabus_id, "processing")
+
+                raw_text, extraction_result, streamed = await self._extract(db, file_path, persist, enter_stage)
+                enter_stage("persisting")
+
+                # Get course info (with type safety)
+                course_info = extraction_result.get("course_info", {})
+                if not isinstance(course_info, dict):
+                    print(f"[BG] Warning: course_info is not a dict, using empty dict", flush=True)
+                    course_info = {}
+
+                assignments = extraction_result.get("assignments", [])
+                if not isinstance(assignments, list):
+                    print(f"[BG] Warning: assignments is not a list, using empty list", flush=True)
+                    assignments = []
+
+                stale = []
+                if streamed:
+                    # A prompt variant that lost the fallback or the race may have
+                    # streamed titles the kept answer doesn't have
+                    kept = {title_key(a["title"]) for a in assignments if isinstance(a, dict) and a.get("title")}
+                    stale = [title for title in flushed if title_key(title) not in kept]
+                    dropped = len(stale) + sum(title_key(row["title"]) not in kept for row in pending)
+                    if dropped:
+                        print(f"[BG] Dropping {dropped} assignments streamed from a discarded response", flush=True)
+                        pending[:] = [row for row in pending if title_key(row["title"]) in kept]
+                        assignment_count -= dropped
+
+                course_name = course_info.get("course_name")
+                # Streamed rows were collected before the course name was known
+                rows = [{**row, "course_name": row.get("course_name") or course_name} for row in pending]
+                if not streamed:
+                    for assignment_data in assignments:
+                        if not isinstance(assignment_data, dict):
+                            print(f"[BG] Warning: skipping non-dict assignment_data", flush=True)
+                            continue
+                        rows.append({**assignment_data, "course_name": course_name})
+
+                async with self._persist_limit:
+                    if stale:
+                        await crud.delete_assignments_by_titles(db, syllabus_id, stale)
+                    if flushed and course_name:
+                        await crud.fill_missing_course_name(db, syllabus_id, course_name)
+
+                    # All remaining rows and the status change in one transaction
+                    await crud.create_assignments_bulk(
+                        db, syllabus_id, rows, status="completed",
+                        course_name=course_name,
+                        instructor=course_info.get("instructor"),
+                        semester=course_info.get("semester")
+                    )
+                    await crud.finish_job(db, job.id, "completed")
+                if not streamed:
+                    if rows and first_assignment_at is None:
+                        first_assignment_at = time.perf_counter() - started
+                        self._record_first_assignment(first_assignment_at)
+                    for row in rows:
+                        progress_broker.publish(syllabus_id, "assignment", {"assignment": row})
+                    assignment_count += len(rows)
+                enter_stage(
+                    "completed",
+                    assignment_count=assignment_count,
+                    course_name=course_name,
+                    extraction=extraction_result.get("extraction")
+                )
+                print(f"[BG] Processing complete for syllabus {syllabus_id}", flush=True)
+
+            except asyncio.CancelledError:
+                # Shutdown: leave the job "running" so it is requeued on restart
+                raise
+
+            except Exception as e:
+                print(f"[BG] Error processing syllabus: {e}", flush=True)
+                import traceback
+                traceback.print_exc()
+                await db.rollback()
+                # Don't leave a partial set of streamed assignments behind
+                await crud.delete_assignments_for_syllabus(db, syllabus_id)
+                await crud.update_syllabus_status(db, syllabus_id, f"failed: {str(e)}")
+                await crud.finish_job(db, job.id, "failed", error=str(e))
+                enter_stage("failed", error=str(e))
+
+            # Clean up uploaded file once the job has reached a final state
+            if file_path.exists():
+                file_path.unlink()
+
+    def _record_first_assignment(self, seconds: float):
+        metrics = self._metrics
+        metrics["first_assignment_count"] += 1
+        metrics["first_assignment_total_seconds"] += seconds
+        metrics["first_assignment_max_seconds"] = max(metrics["first_assignment_max_seconds"], seconds)
+        metrics["first_assignment_last_seconds"] = seconds
+
+    def _filter_prompt(self, raw_text: str, rules_result: Optional[dict], decision: dict) -> Tuple[str, bool]:
+        """Cut the LLM prompt down to assignment-relevant sections, noting the savings in decision."""
+        started = time.perf_counter()
+        relevance = relevance_filter.select(raw_text)
+        elapsed = time.perf_counter() - started
+        self._prompt_chars["before"] += relevance.chars_before
+        self._prompt_chars["after"] += relevance.chars_after
+        decision.update(
+            prompt_chars_before=relevance.chars_before,
+            prompt_chars=relevance.chars_after,
+            estimated_tokens_saved=relevance.estimated_tokens_saved,
+            sections_kept=f"{relevance.sections_kept}/{relevance.sections_total}",
+            filter_seconds=round(elapsed, 4)
+        )
+        if relevance.filtered and rules_result and rules_result["assignments"]:
+            # Whatever the rules spotted should have survived the filter
+            decision["rules_title_coverage"] = relevance_filter.coverage(
+                relevance.text, (a["title"] for a in rules_result["assignments"])
+            )
+        print(
+            f"[BG] Relevance filter kept {relevance.sections_kept}/{relevance.sections_total} sections, "
+            f"{relevance.chars_after}/{relevance.chars_before} chars "
+            f"(~{relevance.estimated_tokens_saved} tokens saved) in {elapsed * 1000:.0f}ms",
+            flush=True
+        )
+        return relevance.text, relevance.filtered
+
+    def _record_path(self, path: str, seconds: float):
+        self._paths[path]["count"] += 1
+        self._paths[path]["seconds"] += seconds
+
+    def stats(self) -> dict:
+        """Time-to-first-assignment, measured from the moment a worker picks up a job,
+        and how often each extraction path was taken."""
+        metrics = self._metrics
+        count = metrics["first_assignment_count"]
+        return {
+            "extraction_paths": {
+                path: {
+                    "count": totals["count"],
+                    "avg_seconds": round(totals["seconds"] / totals["count"], 4) if totals["count"] else None,
+                }
+                for path, totals in self._paths.items()
+            },
+            "prompt_filter": {
+                "chars_before": self._prompt_chars["before"],
+                "chars_after": self._prompt_chars["after"],
+                "estimated_tokens_saved": (self._prompt_chars["before"] - self._prompt_chars["after"]) // CHARS_PER_TOKEN,
+            },
+            "time_to_first_assignment": {
+                "count": count,
+                "avg_seconds": round(metrics["first_assignment_total_seconds"] / count, 3) if count else None,
+                "max_seconds": round(metrics["first_assignment_max_seconds"], 3) if count else None,
+                "last_seconds": round(metrics["first_assignment_last_seconds"], 3) if count else None,
+            }
+        }
+
+
+# Singleton instance
+processing_queue = ProcessingQueue()
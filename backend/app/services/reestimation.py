@@ -0,0 +1,119 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.db.database import async_session
+from app.db import crud
+from app.services.time_estimator import time_estimator
+
+
+class ReestimationJob:
+    """Re-run the time estimator over stored assignments in the background.
+
+    Walks the assignments table in id order, ``reestimate_batch_size`` rows
+    at a time, so memory stays flat however many rows there are. Each batch
+    is scored with ``time_estimator.estimate_batch`` and only rows whose
+    estimate changed are written back, in one executemany UPDATE per batch.
+    Rows whose hours were edited by a user are never touched.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._progress: Dict[str, Any] = {"status": "idle"}
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, syllabus_id: Optional[int] = None, assignment_type: Optional[str] = None) -> bool:
+        """Launch a run. Returns False if one is already in progress."""
+        if self.is_running():
+            return False
+        self._progress = {
+            "status": "running",
+            "syllabus_id": syllabus_id,
+            "assignment_type": assignment_type,
+            "total": None,
+            "processed": 0,
+            "updated": 0,
+            "skipped_user_edited": None,
+            "started_at": datetime.utcnow().isoformat(),
+            "finished_at": None,
+            "elapsed_seconds": 0.0,
+            "error": None,
+        }
+        self._task = asyncio.create_task(self._run(syllabus_id, assignment_type))
+        return True
+
+    async def stop(self):
+        if self.is_running():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def progress(self) -> Dict[str, Any]:
+        progress = dict(self._progress)
+        if progress.get("total"):
+            progress["percent"] = round(100 * progress["processed"] / progress["total"], 1)
+        return progress
+
+    async def _run(self, syllabus_id: Optional[int], assignment_type: Optional[str]):
+        progress = self._progress
+        start_time = time.perf_counter()
+        print(f"[REESTIMATE] Starting (syllabus={syllabus_id}, type={assignment_type})", flush=True)
+        try:
+            async with async_session() as db:
+                progress["total"], progress["skipped_user_edited"] = await crud.count_assignments_to_reestimate(
+                    db, syllabus_id, assignment_type
+                )
+
+            last_id = 0
+            while True:
+                # A fresh session per batch, so no transaction stays open between batches
+                async with async_session() as db:
+                    rows = await crud.get_assignments_to_reestimate(
+                        db, last_id, settings.reestimate_batch_size, syllabus_id, assignment_type
+                    )
+                    if not rows:
+                        break
+                    last_id = rows[-1].id
+
+                    estimates = time_estimator.estimate_batch([
+                        {
+                            "assignment_type": row.assignment_type or "other",
+                            "title": row.title,
+                            "description": row.description
+                        }
+                        for row in rows
+                    ])
+                    changed = [
+                        (row.id, hours)
+                        for row, hours in zip(rows, estimates)
+                        if hours != row.estimated_hours
+                    ]
+                    if changed:
+                        progress["updated"] += await crud.update_estimated_hours_bulk(db, changed)
+
+                progress["processed"] += len(rows)
+                progress["elapsed_seconds"] = round(time.perf_counter() - start_time, 2)
+
+            progress["status"] = "completed"
+            print(
+                f"[REESTIMATE] Done: {progress['processed']} checked, {progress['updated']} updated "
+                f"in {time.perf_counter() - start_time:.1f}s",
+                flush=True
+            )
+        except asyncio.CancelledError:
+            progress["status"] = "cancelled"
+            raise
+        except Exception as e:
+            print(f"[REESTIMATE] Failed: {e}", flush=True)
+            progress["status"] = "failed"
+            progress["error"] = str(e)
+        finally:
+            progress["finished_at"] = datetime.utcnow().isoformat()
+            progress["elapsed_seconds"] = round(time.perf_counter() - start_time, 2)
+
+
+# Singleton instance
+reestimation_job = ReestimationJob()
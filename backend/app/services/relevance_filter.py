@@ -0,0 +1,147 @@
+import re
+from typing import Iterable, List, NamedTuple, Tuple
+
+from app.config import settings
+from app.services.keyword_classifier import TYPE_KEYWORDS, title_key
+from app.services.rule_extractor import DATE_PATTERN
+from app.services.time_estimator import TimeEstimator
+
+# Rough size of a token for llama-family tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+# Words that name an assignment: the type classifier's keywords and the
+# estimator's types, minus the ones it treats as attendance
+_STRONG_WORDS = sorted(
+    {word for _, words in TYPE_KEYWORDS for word in words}
+    | (set(TimeEstimator.BASE_HOURS) - set(TimeEstimator.NO_TIME_TYPES) - {"other"})
+    | {"due", "deadline", "submit", "problem set", "pset", "worksheet", "deliverable", "milestone"},
+    key=len, reverse=True
+)
+_STRONG = re.compile(r"\b(?:" + "|".join(map(re.escape, _STRONG_WORDS)) + ")", re.IGNORECASE)
+# The estimator's complexity words ("research", "group", "draft") hint at work but also show up in prose
+_WEAK = re.compile(r"\b(?:" + "|".join(map(re.escape, TimeEstimator.COMPLEXITY_MULTIPLIERS)) + r")\b", re.IGNORECASE)
+# Policy boilerplate that mentions exams and deadlines without listing any
+_BOILERPLATE = re.compile(
+    r"\b(?:office hours?|academic (?:integrity|honesty|misconduct)|plagiari[sz]\w*|honou?r code|"
+    r"disabilit\w*|accommodations?|title ix|counseling|mental health|late (?:work|policy)|"
+    r"make-?up polic\w*|cheating|email|e-mail|textbooks?|prerequisites?|learning outcomes?|"
+    r"diversity|inclusion|copyright)\b",
+    re.IGNORECASE
+)
+
+
+class RelevanceResult(NamedTuple):
+    text: str             # Text to send to the LLM
+    filtered: bool        # False if the original text was passed through
+    sections_total: int
+    sections_kept: int
+    chars_before: int
+    chars_after: int
+
+    @property
+    def estimated_tokens_saved(self) -> int:
+        return (self.chars_before - self.chars_after) // CHARS_PER_TOKEN
+
+
+class RelevanceFilter:
+    """Shrink syllabus text to the sections likely to list assignments.
+
+    The text is split into sections at blank lines and heading-like lines.
+    Each section is scored per 100 words: assignment words count 1,
+    estimator complexity words 0.5, dates 1.5, and policy boilerplate
+    -2. Sections scoring at least ``min_score`` are kept best first until
+    ``max_chars``, then put back in document order. The first paragraph is
+    always kept since it names the course.
+
+    Short texts, and texts where the filter would keep nearly everything
+    or nothing but the header, are passed through unchanged.
+    """
+
+    MAX_SECTION_CHARS = 1500
+
+    def __init__(self, min_score: float = 2.0, max_chars: int = 24000, min_chars: int = 4000):
+        self.min_score = min_score
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+
+    def select(self, text: str) -> RelevanceResult:
+        sections, header = self._sections(text)
+        passthrough = RelevanceResult(text, False, len(sections), len(sections), len(text), len(text))
+        if len(text) <= self.min_chars or len(sections) < 2:
+            return passthrough
+
+        scores = [self.score(section) for section in sections]
+        keep = set(range(header))
+        used = sum(len(sections[i]) for i in keep)
+        for index in sorted(range(header, len(sections)), key=lambda i: -scores[i]):
+            if scores[index] < self.min_score:
+                break
+            if used + len(sections[index]) > self.max_chars:
+                continue
+            keep.add(index)
+            used += len(sections[index])
+
+        kept_text = "\n\n".join(sections[i] for i in sorted(keep))
+        if len(keep) == header or len(kept_text) >= 0.9 * len(text):
+            return passthrough
+        return RelevanceResult(kept_text, True, len(sections), len(keep), len(text), len(kept_text))
+
+    @staticmethod
+    def score(section: str) -> float:
+        words = max(len(section.split()), 1)
+        points = (
+            len(_STRONG.findall(section))
+            + 0.5 * len(_WEAK.findall(section))
+            + 1.5 * len(DATE_PATTERN.findall(section))
+            - 2 * len(_BOILERPLATE.findall(section))
+        )
+        return 100 * points / words
+
+    @staticmethod
+    def coverage(text: str, titles: Iterable[str]) -> float:
+        """Share of titles that still appear in text; a recall proxy for the filter."""
+        keys = [title_key(title) for title in titles]
+        if not keys:
+            return 1.0
+        haystack = title_key(text)
+        return round(sum(key in haystack for key in keys) / len(keys), 3)
+
+    def _sections(self, text: str) -> Tuple[List[str], int]:
+        """Sections in document order, and how many of them make up the first paragraph."""
+        sections = []
+        header = 0
+        for paragraph in re.split(r"\n\s*\n", text):
+            current: List[str] = []
+            size = 0
+            for line in paragraph.strip().splitlines():
+                if current and (self._is_heading(line) or size + len(line) > self.MAX_SECTION_CHARS):
+                    sections.append("\n".join(current))
+                    current, size = [], 0
+                current.append(line)
+                size += len(line) + 1
+            if current:
+                sections.append("\n".join(current))
+            if not header:
+                header = len(sections)
+        return sections, header
+
+    @staticmethod
+    def _is_heading(line: str) -> bool:
+        line = line.strip()
+        if not line or len(line) > 60 or line.endswith(".") or " | " in line:
+            return False
+        if line.endswith(":") or (line.isupper() and any(c.isalpha() for c in line)):
+            return True
+        if any(c.isdigit() for c in line):
+            # "Quiz 3 Feb 14" is a schedule entry, not a heading
+            return False
+        words = [word for word in line.split() if word[0].isalpha()]
+        return 0 < len(words) <= 8 and sum(word[0].isupper() for word in words) >= 0.6 * len(words)
+
+
+# Singleton instance
+relevance_filter = RelevanceFilter(
+    settings.relevance_min_score,
+    settings.relevance_max_chars,
+    settings.relevance_min_chars
+)
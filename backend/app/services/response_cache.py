@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import crud
+
+
+class ExportCache:
+    """In-process LRU of rendered export bodies, bounded by total size.
+
+    Keys include the data version, so a mutation makes old entries
+    unreachable; they age out as new ones are added.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        content = self._entries.get(key)
+        if content is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return content
+
+    def put(self, key: Hashable, content: bytes):
+        if len(content) > settings.export_cache_max_entry_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key))
+        self._entries[key] = content
+        self._bytes += len(content)
+        while self._bytes > settings.export_cache_max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    async def fill(
+        self,
+        key: Hashable,
+        chunks: AsyncIterator,
+        is_current: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[bytes]:
+        """Pass a streamed body through, caching it once it has been sent in full.
+
+        ``is_current`` is asked after the last chunk whether the data the
+        key was built from is unchanged; a write that landed while the
+        body was rendering may be in it, so it is not cached then.
+        """
+        parts = []
+        size = 0
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if parts is not None:
+                parts.append(chunk)
+                size += len(chunk)
+                if size > settings.export_cache_max_entry_bytes:
+                    parts = None
+            yield chunk
+        if parts is not None and (is_current is None or await is_current()):
+            self.put(key, b"".join(parts))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": settings.export_cache_max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    daily: bool = False
+) -> tuple:
+    """Set ETag / Last-Modified from the data version and check the client's copy.
+
+    ``daily`` is for responses that also depend on today's date (upcoming,
+    overdue); their ETag changes at midnight and they carry no
+    Last-Modified. Returns (version, not_modified) where not_modified is a
+    304 response to send back, or None.
+    """
+    version, updated_at = await crud.get_data_version(db)
+    etag = f'W/"{version}.{updated_at}' + (f'.{date.today().isoformat()}"' if daily else '"')
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    last_modified = None
+    if not daily and updated_at:
+        last_modified = datetime.fromtimestamp(updated_at, tz=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if _client_is_current(request, etag, last_modified):
+        vary = response.headers.get("Vary")
+        if vary:
+            headers["Vary"] = vary
+        return version, Response(status_code=304, headers=headers)
+    return version, None
+
+
+def _client_is_current(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+# Singleton instance
+export_cache = ExportCache()
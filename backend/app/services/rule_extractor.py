@@ -0,0 +1,220 @@
+import re
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+from app.config import settings
+from app.services.keyword_classifier import EXCLUDE_KEYWORDS, TYPE_KEYWORDS, detect_type, title_key
+from app.services.time_estimator import time_estimator
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+DATE_PATTERN = re.compile(
+    r"\b(?:"
+    r"\d{4}-\d{1,2}-\d{1,2}"                                            # 2025-02-14
+    r"|\d{1,2}/\d{1,2}(?:/(?:\d{4}|\d{2}))?"                            # 2/14, 2/14/25
+    rf"|{_MONTH}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?"       # Feb 14, February 14th, 2025
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTH}\.?(?:,?\s+\d{{4}})?(?!\s+\d)"  # 14 Feb (not "1 Feb 20")
+    r")(?![\w/])",
+    re.IGNORECASE
+)
+_HAS_YEAR = re.compile(r"\d{4}|/\d+/\d+")
+_TIME = re.compile(r"\b(\d{1,2})(?::(\d{2}))?\s*([ap])\.?m\b\.?|\b(\d{1,2}):(\d{2})\b", re.IGNORECASE)
+_WEIGHT = re.compile(r"\(?\b(\d{1,3}(?:\.\d+)?)\s*%\)?")
+_TERM = re.compile(r"\b(spring|summer|fall|autumn|winter)\s+(?:semester\s+|term\s+|quarter\s+)?(20\d{2})\b", re.IGNORECASE)
+_YEAR = re.compile(r"\b(20\d{2})\b")
+_COURSE_CODE = re.compile(r"\b[A-Z]{2,4}\s?-?\d{3,4}[A-Z]?\b")
+_INSTRUCTOR = re.compile(r"^\s*(?:instructor|professor|lecturer|taught by)\s*:?\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_WEEKDAY = re.compile(r"\b(?:mon|tues?|wed(?:nes)?|thu(?:rs?)?|fri|sat(?:ur)?|sun)(?:day)?\b\.?,?", re.IGNORECASE)
+_FILLER = re.compile(r"\b(?:due(?:\s+(?:on|by|date))?|deadline|submit(?:ted)?(?:\s+by)?|by|at|before)\b:?", re.IGNORECASE)
+_WEEK_CELL = re.compile(r"^(?:week|wk|class|session|lecture|day)\s*#?\s*\d+$", re.IGNORECASE)
+_CELL_SPLIT = re.compile(r"\s*(?:\||\t)\s*")
+
+# Type keywords plus other words that mark a line as an assignment. Matched
+# at a word start so "lab" doesn't fire on "syllabus"
+_TYPE_WORDS = [word for _, words in TYPE_KEYWORDS for word in words]
+_ASSIGNMENT_WORDS = re.compile(
+    r"\b(?:" + "|".join(_TYPE_WORDS + ["due", "problem set", "pset", "worksheet", "proposal",
+                                       "milestone", "deliverable", "test"]) + ")",
+    re.IGNORECASE
+)
+_LEADING_TYPE_WORD = re.compile(r"^[-•*·\d.)\s]*(?:" + "|".join(_TYPE_WORDS) + ")", re.IGNORECASE)
+
+# Lines longer than this are prose, not schedule entries
+_MAX_LINE = 160
+_MAX_TITLE = 120
+
+
+class RuleBasedExtractor:
+    """Deterministic extractor for syllabi with a dated schedule.
+
+    Looks at schedule table rows (the " | "-joined rows the DOCX parser
+    produces, or tab-separated PDF text) and short lines that carry both
+    a date and an assignment keyword, and pulls out title, due date (via
+    dateutil), due time and weight. Output has the same shape as
+    ``OllamaExtractor.extract_assignments`` plus a ``confidence`` between
+    0 and 1: the share of assignment-looking lines it could date, scaled
+    down when it found fewer than ``min_assignments`` items. Callers fall
+    back to the LLM when confidence is low.
+    """
+
+    def __init__(self, min_assignments: int = 3):
+        self.min_assignments = min_assignments
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        term, year = self._term_and_year(text)
+        found: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        unresolved = 0
+        table_rows = 0
+
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+            if not line or len(line) > _MAX_LINE:
+                continue
+            cells = [cell for cell in _CELL_SPLIT.split(line) if cell]
+            is_row = len(cells) > 1
+
+            dates = [self._parse_date(match.group(0), year, term) for match in DATE_PATTERN.finditer(line)]
+            due_date = next((d for d in dates if d is not None), None)
+
+            if is_row:
+                cells = [cell for cell in cells if not _WEEK_CELL.match(cell) and not DATE_PATTERN.fullmatch(cell.strip(" ,."))]
+                # "Finals | 12/13 | Final Exam": a leading cell is a row label when later cells name the item
+                if len(cells) > 1 and any(self._looks_like_assignment(cell) for cell in cells[1:]):
+                    cells = cells[1:]
+                segments = [part for cell in cells for part in re.split(r"\s*;\s*", cell)]
+            else:
+                segments = [line]
+            segments = [segment for segment in segments if self._looks_like_assignment(segment)]
+            if not segments:
+                continue
+
+            if due_date is None:
+                # Schedule rows and list entries we can't date mean the rules are missing something
+                if is_row or self._starts_with_keyword(line):
+                    unresolved += len(segments)
+                continue
+
+            table_rows += is_row
+            due_time = self._parse_time(line)
+            for segment in segments:
+                title = self._clean_title(segment)
+                if not title:
+                    continue
+                key = (title_key(title), due_date.isoformat())
+                if key in found:
+                    continue
+                # The weight may sit in its own cell of a one-item row
+                weight = _WEIGHT.search(segment) or (_WEIGHT.search(line) if len(segments) == 1 else None)
+                found[key] = {
+                    "title": title,
+                    "description": None,
+                    "assignment_type": detect_type(title),
+                    "due_date": due_date.isoformat(),
+                    "due_time": due_time,
+                    "estimated_hours": None,
+                    "weight_percentage": float(weight.group(1)) if weight else None,
+                    "confidence_score": 0.9 if is_row else 0.75
+                }
+
+        assignments = [
+            a for a in found.values()
+            if not any(keyword in a["title"].lower() for keyword in EXCLUDE_KEYWORDS)
+        ]
+        estimates = time_estimator.estimate_batch(assignments)
+        for assignment, hours in zip(assignments, estimates):
+            assignment["estimated_hours"] = hours
+
+        count = len(assignments)
+        confidence = 0.0
+        if count:
+            confidence = count / (count + unresolved) * min(1.0, count / self.min_assignments)
+
+        return {
+            "course_info": self._course_info(text, term, year),
+            "assignments": assignments,
+            "confidence": round(confidence, 3),
+            "table_rows": table_rows,
+            "unresolved": unresolved
+        }
+
+    @staticmethod
+    def _term_and_year(text: str) -> Tuple[Optional[str], int]:
+        term = _TERM.search(text)
+        if term:
+            return term.group(1).lower(), int(term.group(2))
+        years = Counter(_YEAR.findall(text))
+        if years:
+            return None, int(years.most_common(1)[0][0])
+        return None, date.today().year
+
+    @staticmethod
+    def _parse_date(token: str, year: int, term: Optional[str]) -> Optional[date]:
+        try:
+            # A fall term's January-June dates belong to the next year. Pick the
+            # year before parsing so "Feb 29" is checked against the right one;
+            # 2000 is a leap year, so any month/day parses for the month check
+            if term in ("fall", "autumn") and not _HAS_YEAR.search(token):
+                if date_parser.parse(token, default=datetime(2000, 1, 1)).month < 7:
+                    year += 1
+            return date_parser.parse(token, default=datetime(year, 1, 1)).date()
+        except (ValueError, OverflowError):
+            return None
+
+    @staticmethod
+    def _parse_time(line: str) -> Optional[str]:
+        match = _TIME.search(line)
+        if not match:
+            return None
+        if match.group(3):
+            hour, minute = int(match.group(1)) % 12, int(match.group(2) or 0)
+            if match.group(3).lower() == "p":
+                hour += 12
+        else:
+            hour, minute = int(match.group(4)), int(match.group(5))
+        if hour > 23 or minute > 59:
+            return None
+        return f"{hour:02d}:{minute:02d}"
+
+    @staticmethod
+    def _looks_like_assignment(segment: str) -> bool:
+        return _ASSIGNMENT_WORDS.search(segment) is not None
+
+    @staticmethod
+    def _starts_with_keyword(line: str) -> bool:
+        return _LEADING_TYPE_WORD.match(line) is not None
+
+    @staticmethod
+    def _clean_title(segment: str) -> Optional[str]:
+        title = DATE_PATTERN.sub(" ", segment)
+        title = _TIME.sub(" ", title)
+        title = _WEIGHT.sub(" ", title)
+        title = _WEEKDAY.sub(" ", title)
+        title = _FILLER.sub(" ", title)
+        title = re.sub(r"\s+", " ", title).strip(" -–—•*·:,;()[]")
+        if len(title) < 3 or len(title) > _MAX_TITLE:
+            return None
+        return title
+
+    @staticmethod
+    def _course_info(text: str, term: Optional[str], year: int) -> Dict[str, Optional[str]]:
+        course_name = None
+        for line in text.splitlines()[:30]:
+            line = line.strip()
+            if line and len(line) <= 100 and _COURSE_CODE.search(line):
+                course_name = line
+                break
+        instructor = _INSTRUCTOR.search(text)
+        return {
+            "course_name": course_name,
+            "instructor": instructor.group(1).strip()[:100] if instructor else None,
+            "semester": f"{term.title()} {year}" if term else None
+        }
+
+
+# Singleton instance
+rule_extractor = RuleBasedExtractor(settings.rules_min_assignments)
@@ -1,5 +1,6 @@
-from typing import Optional
-import re
+from typing import Any, Dict, List, Optional
+
+from app.services.keyword_classifier import Classification, KeywordClassifier
 
 
 class TimeEstimator:
@@ -56,16 +57,22 @@ class TimeEstimator:
         "weekly": 0.8,        # Weekly assignments are usually smaller
     }
 
-    # Length patterns and their hour estimates
-    LENGTH_PATTERNS = [
-        (r'(\d+)\s*pages?', lambda x: int(x) * 0.5),       # 0.5 hrs per page
-        (r'(\d+)\s*words?', lambda x: int(x) / 500),       # ~500 words/hr
-        (r'(\d+)\s*problems?', lambda x: int(x) * 0.25),   # 15 min per problem
-        (r'(\d+)\s*questions?', lambda x: int(x) * 0.15),  # 10 min per question
-        (r'(\d+)\s*chapters?', lambda x: int(x) * 2.0),    # 2 hrs per chapter
-        (r'(\d+)\s*exercises?', lambda x: int(x) * 0.2),   # 12 min per exercise
+    # Length units (after a number) and their hour estimates, in priority order
+    LENGTH_UNITS = [
+        (r'pages?', lambda x: int(x) * 0.5),       # 0.5 hrs per page
+        (r'words?', lambda x: int(x) / 500),       # ~500 words/hr
+        (r'problems?', lambda x: int(x) * 0.25),   # 15 min per problem
+        (r'questions?', lambda x: int(x) * 0.15),  # 10 min per question
+        (r'chapters?', lambda x: int(x) * 2.0),    # 2 hrs per chapter
+        (r'exercises?', lambda x: int(x) * 0.2),   # 12 min per exercise
     ]
 
+    def __init__(self):
+        # Keyword and length tables compiled once, not per call
+        self.classifier = KeywordClassifier(
+            self.NO_TIME_KEYWORDS, self.COMPLEXITY_MULTIPLIERS, self.LENGTH_UNITS
+        )
+
     def estimate(
         self,
         assignment_type: str,
@@ -83,55 +90,40 @@ class TimeEstimator:
         3. Type + complexity calculation
         4. LLM estimate used only as sanity check
         """
-        combined_text = f"{title} {description or ''}".lower()
-
-        # Check if this type doesn't need a time estimate
         if assignment_type.lower() in self.NO_TIME_TYPES:
             return None
+        classification = self.classifier.classify(f"{title} {description or ''}")
+        return self._estimate(assignment_type, classification)
 
+    def estimate_batch(self, assignments: List[Dict[str, Any]]) -> List[Optional[float]]:
+        """
+        Estimate hours for many assignments at once.
+        Each item needs "assignment_type" and "title", optionally "description".
+        """
+        classify = self.classifier.classify
+        return [
+            None if a["assignment_type"].lower() in self.NO_TIME_TYPES
+            else self._estimate(a["assignment_type"], classify(f"{a['title']} {a.get('description') or ''}"))
+            for a in assignments
+        ]
+
+    def _estimate(self, assignment_type: str, classification: Classification) -> Optional[float]:
         # Check for keywords indicating no prep time
-        for keyword in self.NO_TIME_KEYWORDS:
-            if keyword in combined_text:
-                return None
+        if classification.no_time:
+            return None
 
         # Try length-based estimation first (most accurate)
-        length_estimate = self._estimate_from_length(combined_text)
-        if length_estimate:
-            return round(max(0.25, min(length_estimate, 40.0)), 1)
+        if classification.length_hours:
+            return round(max(0.25, min(classification.length_hours, 40.0)), 1)
 
         # Calculate type + complexity estimate
         base = self.BASE_HOURS.get(assignment_type.lower(), 1.0)
-        multiplier = self._calculate_complexity_multiplier(combined_text)
-        calculated_estimate = base * multiplier
+        calculated_estimate = base * classification.multiplier
 
         # Clamp to reasonable range and round to nearest 0.5
         final = max(0.5, min(calculated_estimate, 40.0))
         return round(final * 2) / 2  # Round to nearest 0.5
 
-    def _estimate_from_length(self, text: str) -> Optional[float]:
-        """Extract time estimate from length specifications in text."""
-        for pattern, calculator in self.LENGTH_PATTERNS:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    return calculator(match.group(1))
-                except (ValueError, IndexError):
-                    continue
-        return None
-
-    def _calculate_complexity_multiplier(self, text: str) -> float:
-        """Calculate multiplier based on complexity keywords."""
-        multiplier = 1.0
-
-        for keyword, factor in self.COMPLEXITY_MULTIPLIERS.items():
-            if keyword in text:
-                if factor > 1 and factor > multiplier:
-                    multiplier = factor
-                elif factor < 1 and factor < multiplier:
-                    multiplier = factor
-
-        return multiplier
-
 
 # Singleton instance
 time_estimator = TimeEstimator()
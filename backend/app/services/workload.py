@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+# Days in the forward-looking rolling load window
+ROLLING_WINDOW_DAYS = 7
+
+
+def compute_workload(
+    day_offsets: Sequence[int],
+    hours: Sequence[float],
+    courses: Sequence[str],
+    start: date,
+    end: date,
+    peak_weeks: int = 3
+) -> Dict[str, Any]:
+    """Bin assignment hours by day and ISO week, per course.
+
+    ``day_offsets`` are days since ``start`` and may run up to
+    ROLLING_WINDOW_DAYS - 1 past ``end``: those rows only feed the rolling
+    load of the last days in the range. Everything is done with array
+    operations; the only Python loops are over days, weeks and courses
+    when building the response.
+    """
+    n_days = (end - start).days + 1
+    span = n_days + ROLLING_WINDOW_DAYS - 1
+
+    offsets = np.asarray(day_offsets, dtype=np.int64)
+    weights = np.asarray(hours, dtype=np.float64)
+    course_names, course_index = np.unique(np.asarray(courses, dtype=object).astype(str), return_inverse=True)
+    n_courses = len(course_names)
+
+    # (course, day) grid via one bincount over the flattened index
+    grid = np.bincount(
+        course_index * span + offsets,
+        weights=weights,
+        minlength=n_courses * span
+    ).reshape(n_courses, span) if n_courses else np.zeros((0, span))
+
+    daily_all = grid.sum(axis=0)
+    # Hours due in the window starting on each day, from a cumulative sum
+    cumulative = np.concatenate(([0.0], np.cumsum(daily_all)))
+    rolling = cumulative[ROLLING_WINDOW_DAYS:ROLLING_WINDOW_DAYS + n_days] - cumulative[:n_days]
+
+    grid = grid[:, :n_days]
+    daily = daily_all[:n_days]
+    in_range = offsets < n_days
+
+    # Pad the front to the Monday before start and the back to a Sunday,
+    # so weeks are a reshape away
+    lead = start.weekday()
+    n_weeks = -(-(lead + n_days) // 7)
+    padded = np.zeros((n_courses, n_weeks * 7))
+    padded[:, lead:lead + n_days] = grid
+    weekly_by_course = padded.reshape(n_courses, n_weeks, 7).sum(axis=2)
+    weekly = weekly_by_course.sum(axis=0)
+    week_starts = [start - timedelta(days=lead) + timedelta(weeks=w) for w in range(n_weeks)]
+
+    def by_course(column: np.ndarray) -> Dict[str, float]:
+        return {
+            str(course_names[i]): round(float(column[i]), 1)
+            for i in np.flatnonzero(column)
+        }
+
+    peaks = [int(w) for w in np.argsort(-weekly, kind="stable")[:peak_weeks] if weekly[w] > 0]
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "assignment_count": int(in_range.sum()),
+        "total_hours": round(float(weights[in_range].sum()), 1),
+        "courses": [str(name) for name in course_names[np.flatnonzero(grid.sum(axis=1))]],
+        "daily": [
+            {
+                "date": (start + timedelta(days=d)).isoformat(),
+                "hours": round(float(daily[d]), 1),
+                "rolling_7_day_hours": round(float(rolling[d]), 1),
+                "by_course": by_course(grid[:, d])
+            }
+            for d in range(n_days)
+        ],
+        "weekly": [
+            {
+                "week_start": week_starts[w].isoformat(),
+                "hours": round(float(weekly[w]), 1),
+                "by_course": by_course(weekly_by_course[:, w])
+            }
+            for w in range(n_weeks)
+        ],
+        "peak_weeks": [
+            {"week_start": week_starts[w].isoformat(), "hours": round(float(weekly[w]), 1)}
+            for w in peaks
+        ],
+    }
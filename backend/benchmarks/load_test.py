@@ -0,0 +1,158 @@
+"""Push a batch of uploads through the processing queue against the stub LLM server.
+
+    cd backend && python -m benchmarks.load_test [--syllabi 50] [--assignments 20] \\
+        [--backend ollama] [--latency 0.2] [--tokens-per-second 200] [--failure-rate 0.05]
+
+Starts ``stub_llm_server.py`` in-process on a free port, points the app at
+it, writes ``--syllabi`` distinct text syllabi to a scratch upload dir and
+enqueues them all at once, the way a batch upload does. The rule
+extractor and extraction cache are turned off so every job goes through
+parse, the LLM over HTTP and persist. Prints jobs per second, queue and
+service latency percentiles, time to first assignment and the stub's
+request counts.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+# The engine is created and settings read on import, so point them at scratch space first
+_tmp = Path(tempfile.mkdtemp(prefix="syllabus-load-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp / 'load.db'}"
+os.environ["UPLOAD_DIR"] = str(_tmp / "uploads")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db import crud  # noqa: E402
+from app.db.database import async_session, engine, init_db  # noqa: E402
+from app.db.models import ProcessingJobDB  # noqa: E402
+from stub_llm_server import create_app, parse_args as stub_args  # noqa: E402
+
+TYPES = ["Homework", "Quiz", "Lab", "Project", "Exam"]
+
+
+def make_syllabus(index: int, count: int) -> str:
+    start = date(2026, 9, 1)
+    lines = [f"CS {100 + index}: Load Test Course {index}", "", "Schedule"]
+    for i in range(count):
+        due = start + timedelta(days=3 * i)
+        lines.append(f"{TYPES[i % len(TYPES)]} {i + 1} (section {index}) due {due:%b %d}")
+    return "\n".join(lines) + "\n"
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def main(args: argparse.Namespace):
+    port = args.port or free_port()
+    server = uvicorn.Server(uvicorn.Config(
+        create_app(stub_args([
+            "--latency", str(args.latency),
+            "--tokens-per-second", str(args.tokens_per_second),
+            "--failure-rate", str(args.failure_rate),
+            "--disconnect-rate", str(args.disconnect_rate),
+            "--empty-rate", str(args.empty_rate),
+        ])),
+        host="127.0.0.1", port=port, log_level="warning"
+    ))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    settings.llm_backend = args.backend
+    settings.llm_base_url = f"http://127.0.0.1:{port}"
+    settings.rules_extractor_enabled = False
+    settings.extraction_cache_enabled = False
+    settings.worker_concurrency = args.workers
+    settings.llm_concurrency = args.llm_concurrency
+    # The extractor builds its backend and endpoints from settings on import
+    from app.services.ollama_extractor import ollama_extractor
+    from app.services.parser import parser
+    from app.services.processing import ProcessingQueue
+
+    await init_db()
+    settings.upload_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(args.syllabi):
+        path = settings.upload_dir / f"syllabus-{i}.txt"
+        path.write_text(make_syllabus(i, args.assignments), encoding="utf-8")
+        files.append((path.name, str(path)))
+
+    print(
+        f"{args.syllabi} syllabi x {args.assignments} assignments, backend={args.backend}, "
+        f"workers={args.workers}, llm_concurrency={args.llm_concurrency}, "
+        f"latency={args.latency}s, {args.tokens_per_second} tokens/s, failure_rate={args.failure_rate}"
+    )
+
+    queue = ProcessingQueue()
+    async with async_session() as db:
+        await crud.create_syllabi_with_jobs(db, files, batch_id="load-test")
+    started = time.perf_counter()
+    await queue.start()
+    queue.notify()
+
+    while True:
+        async with async_session() as db:
+            jobs = (await db.execute(select(ProcessingJobDB))).scalars().all()
+        if all(job.status in ("completed", "failed") for job in jobs):
+            break
+        await asyncio.sleep(0.2)
+    elapsed = time.perf_counter() - started
+
+    await queue.stop()
+    async with async_session() as db:
+        assignments = len(await crud.get_all_assignments(db))
+    async with httpx.AsyncClient() as client:
+        stub_stats = (await client.get(f"{settings.llm_base_url}/stats")).json()
+    await ollama_extractor.close()
+    parser.shutdown()
+    server.should_exit = True
+    await serving
+    await engine.dispose()
+
+    completed = [job for job in jobs if job.status == "completed"]
+    waits = [(job.started_at - job.created_at).total_seconds() for job in completed]
+    service = [(job.finished_at - job.started_at).total_seconds() for job in completed]
+    print(f"{len(completed)} completed, {len(jobs) - len(completed)} failed, {assignments} assignments saved")
+    print(f"{elapsed:.1f} s total, {len(completed) / elapsed:.2f} jobs/s")
+    if completed:
+        for label, values in (("queue wait", waits), ("processing", service)):
+            print(
+                f"{label:<12} p50 {percentile(values, 0.5):6.2f} s  p95 {percentile(values, 0.95):6.2f} s  "
+                f"max {max(values):6.2f} s"
+            )
+    first = queue.stats()["time_to_first_assignment"]
+    print(f"first assignment avg {first['avg_seconds']} s, max {first['max_seconds']} s")
+    print("stub server:", ", ".join(f"{key}={value}" for key, value in stub_stats.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--syllabi", type=int, default=50)
+    parser.add_argument("--assignments", type=int, default=20, help="Assignment lines per syllabus")
+    parser.add_argument("--backend", choices=["ollama", "openai"], default="ollama")
+    parser.add_argument("--port", type=int, default=0, help="Stub server port, 0 for a free one")
+    parser.add_argument("--workers", type=int, default=settings.worker_concurrency)
+    parser.add_argument("--llm-concurrency", type=int, default=settings.llm_concurrency)
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub: seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Stub: streaming rate, 0 for no delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Stub: share of requests answered with HTTP 503")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Stub: share of responses cut off halfway")
+    parser.add_argument("--empty-rate", type=float, default=0.0, help="Stub: share of whitespace-only answers")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""Time persisting one syllabus's assignments, per row vs batched.
+
+    cd backend && python -m benchmarks.persist [--syllabi 20] [--assignments 40]
+
+Runs against a throwaway SQLite file with the app's engine settings and
+writes every syllabus three ways: ``create_assignment`` per row (commit
+and refresh each), the streaming path before batching (one INSERT and
+commit per row) and the streaming path now (``persist_batch_size`` rows
+per INSERT, the rest committed with the final status). Prints the
+average time per syllabus for each.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# The engine is created on import, so point it at a scratch file first
+_tmp = Path(tempfile.mkdtemp(prefix="syllabus-bench-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp / 'bench.db'}"
+
+from app.config import settings  # noqa: E402
+from app.db import crud  # noqa: E402
+from app.db.database import async_session, engine, init_db  # noqa: E402
+from app.models.assignment import SyllabusCreate  # noqa: E402
+
+
+def make_assignments(count: int):
+    return [
+        {
+            "title": f"Homework {i + 1}",
+            "assignment_type": "homework",
+            "due_date": date(2026, 9, 1) + timedelta(days=i),
+            "estimated_hours": 1.5,
+            "confidence_score": 0.8,
+        }
+        for i in range(count)
+    ]
+
+
+async def per_row_refresh(db, syllabus_id, assignments):
+    for assignment in assignments:
+        await crud.create_assignment(db, syllabus_id, assignment)
+    await crud.update_syllabus_status(db, syllabus_id, "completed")
+
+
+async def streamed_per_row(db, syllabus_id, assignments):
+    for assignment in assignments:
+        await crud.create_assignments_bulk(db, syllabus_id, [assignment])
+    await crud.create_assignments_bulk(db, syllabus_id, [], status="completed")
+
+
+async def streamed_batched(db, syllabus_id, assignments):
+    # Same buffering as ProcessingQueue._process_job's persist callback
+    pending = []
+    for assignment in assignments:
+        pending.append(assignment)
+        if len(pending) >= settings.persist_batch_size:
+            batch = pending[:]
+            del pending[:]
+            await crud.create_assignments_bulk(db, syllabus_id, batch)
+    await crud.create_assignments_bulk(db, syllabus_id, pending, status="completed")
+
+
+async def main(syllabi: int, count: int):
+    await init_db()
+    assignments = make_assignments(count)
+    print(f"{syllabi} syllabi x {count} assignments, persist_batch_size={settings.persist_batch_size}")
+
+    for label, write in (
+        ("create_assignment per row", per_row_refresh),
+        ("streamed, commit per row", streamed_per_row),
+        ("streamed, batched", streamed_batched),
+    ):
+        seconds = 0.0
+        async with async_session() as db:
+            for _ in range(syllabi):
+                syllabus = await crud.create_syllabus(db, SyllabusCreate(filename="bench.pdf"))
+                started = time.perf_counter()
+                await write(db, syllabus.id, assignments)
+                seconds += time.perf_counter() - started
+        print(f"{label:<28} {seconds / syllabi * 1000:8.1f} ms/syllabus")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--syllabi", type=int, default=20)
+    parser.add_argument("--assignments", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(main(args.syllabi, args.assignments))
@@ -0,0 +1,96 @@
+"""Assignments found with and without the relevance filter.
+
+    cd backend && python -m benchmarks.relevance_filter [file ...]
+
+Parses each syllabus (by default the PDFs in uploads/, skipping ones
+that parse to the same text) and runs two stand-ins for the model over
+the full text and over what the filter keeps: the rule extractor, and
+the fake LLM backend's keyword rules fed the real prompt. Recall is the share of
+titles found in the full text that are still found in the filtered text.
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from app.config import settings
+from app.services.keyword_classifier import title_key
+from app.services.llm_backends import fake_response
+from app.services.ollama_extractor import ollama_extractor
+from app.services.parser import parser
+from app.services.relevance_filter import relevance_filter
+from app.services.rule_extractor import rule_extractor
+
+UPLOADS = Path(__file__).resolve().parent.parent / "uploads"
+
+
+def rule_titles(text: str) -> Set[str]:
+    return {title_key(a["title"]) for a in rule_extractor.extract(text)["assignments"]}
+
+
+def fake_llm_titles(text: str) -> Set[str]:
+    # Chunked and prompted the way extract_assignments does it
+    chunks = ollama_extractor._split_into_chunks(text) if settings.ollama_chunking else [text]
+    titles = set()
+    for chunk in chunks:
+        system_msg, user_msg = ollama_extractor._build_chat_messages(chunk)
+        answer = json.loads(fake_response([
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_msg}
+        ]))
+        titles.update(title_key(title) for title in answer["assignments"])
+    return titles
+
+
+ORACLES = {"rules": rule_titles, "fake_llm": fake_llm_titles}
+
+
+def recall_report(paths: List[Path]) -> List[Dict[str, Any]]:
+    report = []
+    seen = set()
+    for path in paths:
+        text = parser.parse(path)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+
+        relevance = relevance_filter.select(text)
+        row = {
+            "file": path.name,
+            "filtered": relevance.filtered,
+            "sections": f"{relevance.sections_kept}/{relevance.sections_total}",
+            "chars": f"{relevance.chars_after}/{relevance.chars_before}",
+        }
+        for name, titles in ORACLES.items():
+            full, kept = titles(text), titles(relevance.text)
+            row[name] = {
+                "full": len(full),
+                "filtered": len(kept),
+                "recall": round(len(full & kept) / len(full), 3) if full else 1.0,
+                "missed": sorted(full - kept),
+            }
+        report.append(row)
+    return report
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("files", nargs="*", type=Path)
+    args = arg_parser.parse_args()
+
+    for row in recall_report(args.files or sorted(UPLOADS.glob("*.pdf"))):
+        print(f"{row['file']}: kept {row['sections']} sections, {row['chars']} chars")
+        for name in ORACLES:
+            result = row[name]
+            print(
+                f"  {name:<9} {result['full']:>3} found in full text, {result['filtered']:>3} after filtering, "
+                f"recall {result['recall']:.3f}"
+            )
+            for title in result["missed"]:
+                print(f"    missed: {title}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Time the keyword classifier against the substring checks it replaced.
+
+    cd backend && python -m benchmarks.time_estimator [--rows 100000]
+
+Estimates the same rows with ``ReferenceEstimator`` (a keyword ``in``
+check and a ``re.search`` per length pattern on every call, as before
+the classifier) and with the app's ``TimeEstimator``, one call per row
+and through ``estimate_batch``, does the same for ``detect_type``,
+checks the answers agree and prints rows per second for each.
+"""
+import argparse
+import random
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from app.services.keyword_classifier import TYPE_KEYWORDS, detect_type
+from app.services.time_estimator import TimeEstimator
+
+FILLER = "the of week due intro to data set part cs unit module on and for in".split()
+UNITS = ["pages", "page", "words", "problems", "question", "chapters", "exercises"]
+
+
+class ReferenceEstimator(TimeEstimator):
+    """The estimator as it was before the keyword classifier, for comparison."""
+
+    def estimate(self, assignment_type, title, description=None, llm_estimate=None):
+        combined_text = f"{title} {description or ''}".lower()
+        if assignment_type.lower() in self.NO_TIME_TYPES:
+            return None
+        for keyword in self.NO_TIME_KEYWORDS:
+            if keyword in combined_text:
+                return None
+
+        for unit, calculator in self.LENGTH_UNITS:
+            match = re.search(rf'(\d+)\s*{unit}', combined_text, re.IGNORECASE)
+            if match:
+                length_estimate = calculator(match.group(1))
+                break
+        else:
+            length_estimate = None
+        if length_estimate:
+            return round(max(0.25, min(length_estimate, 40.0)), 1)
+
+        multiplier = 1.0
+        for keyword, factor in self.COMPLEXITY_MULTIPLIERS.items():
+            if keyword in combined_text:
+                if factor > 1 and factor > multiplier:
+                    multiplier = factor
+                elif factor < 1 and factor < multiplier:
+                    multiplier = factor
+        final = max(0.5, min(self.BASE_HOURS.get(assignment_type.lower(), 1.0) * multiplier, 40.0))
+        return round(final * 2) / 2
+
+    def estimate_batch(self, assignments):
+        return [
+            self.estimate(a["assignment_type"], a["title"], a.get("description")) for a in assignments
+        ]
+
+
+def reference_detect_type(title: str) -> str:
+    title_lower = title.lower()
+    for assignment_type, keywords in TYPE_KEYWORDS:
+        if any(keyword in title_lower for keyword in keywords):
+            return assignment_type
+    return "other"
+
+
+def generate_assignments(count: int, seed: int = 0, glued: float = 0.25) -> List[Dict[str, Any]]:
+    """Random assignment rows, keyword heavy, some with words glued together ("chaptermajor")."""
+    estimator = TimeEstimator()
+    keywords = sorted(
+        set(estimator.NO_TIME_KEYWORDS) | set(estimator.COMPLEXITY_MULTIPLIERS)
+        | {word for _, words in TYPE_KEYWORDS for word in words}
+    )
+    types = list(estimator.BASE_HOURS)
+    rng = random.Random(seed)
+
+    def text() -> str:
+        parts = []
+        for _ in range(rng.randint(1, 6)):
+            r = rng.random()
+            if r < 0.45:
+                parts.append(rng.choice(keywords))
+            elif r < 0.6:
+                parts.append(f"{rng.randint(0, 30)}{rng.choice(['', ' '])}{rng.choice(UNITS)}")
+            else:
+                parts.append(rng.choice(FILLER))
+        joined = ("" if rng.random() < glued else " ").join(parts)
+        return joined.title() if rng.random() < 0.3 else joined
+
+    return [
+        {"assignment_type": rng.choice(types), "title": text(), "description": rng.choice([None, text()])}
+        for _ in range(count)
+    ]
+
+
+def _time(label: str, rows: int, fn) -> Optional[list]:
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    print(f"{label:<28} {seconds:6.2f}s  {rows / seconds:>10,.0f} rows/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = generate_assignments(args.rows, args.seed)
+    reference, current = ReferenceEstimator(), TimeEstimator()
+
+    def per_call(estimator):
+        estimate = estimator.estimate
+        return lambda: [estimate(a["assignment_type"], a["title"], a.get("description")) for a in rows]
+
+    expected = _time("reference estimate", len(rows), per_call(reference))
+    got = _time("classifier estimate", len(rows), per_call(current))
+    _time("reference estimate_batch", len(rows), lambda: reference.estimate_batch(rows))
+    batch = _time("classifier estimate_batch", len(rows), lambda: current.estimate_batch(rows))
+
+    titles = [a["title"] for a in rows]
+    expected_types = _time("reference detect_type", len(rows), lambda: [reference_detect_type(t) for t in titles])
+    types = _time("matcher detect_type", len(rows), lambda: [detect_type(t) for t in titles])
+
+    mismatches = (
+        sum(a != b for a, b in zip(expected, got)) + sum(a != b for a, b in zip(expected, batch))
+        + sum(a != b for a, b in zip(expected_types, types))
+    )
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Stand-in LLM server for load and soak tests on machines without a GPU.
+
+Speaks both Ollama's /api/chat and the OpenAI-compatible
+/v1/chat/completions, streamed or not. Answers come from recorded
+responses (the JSONL files the app writes when ``LLM_RECORD_PATH`` is
+set) when the prompt matches one, otherwise from the same keyword rules
+as the fake backend, so every prompt gets a deterministic answer.
+
+    python stub_llm_server.py --port 11435 --recordings responses.jsonl \\
+        --latency 0.8 --tokens-per-second 40 --failure-rate 0.05
+
+then point the app at it with LLM_BASE_URL=http://localhost:11435
+(LLM_BACKEND=ollama or openai).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.llm_backends import fake_response, prompt_key, split_tokens
+
+
+class StubLLM:
+    """Pick the answer for a prompt and decide which failures to inject."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.recordings: Dict[Tuple[str, bool], str] = {}
+        for path in args.recordings:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.recordings[(record["prompt_key"], record["json_mode"])] = record["content"]
+        self.stats = {"requests": 0, "replayed": 0, "generated": 0, "failed": 0, "empty": 0, "disconnected": 0}
+
+    def answer(self, messages: List[Dict[str, str]], json_mode: bool) -> str:
+        key = prompt_key(messages)
+        content = self.recordings.get((key, json_mode)) or self.recordings.get((key, not json_mode))
+        if content is not None:
+            self.stats["replayed"] += 1
+            return content
+        self.stats["generated"] += 1
+        return fake_response(messages)
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+    async def first_token_delay(self):
+        delay = self.args.latency + self.random.uniform(0, self.args.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def pieces(self, content: str, empty: bool, disconnect: bool):
+        """Yield the answer at the configured token rate, or whitespace, or cut it off halfway."""
+        pieces = ["\n"] * 40 if empty else split_tokens(content)
+        delay = 1 / self.args.tokens_per_second if self.args.tokens_per_second > 0 else 0
+        for i, piece in enumerate(pieces):
+            if disconnect and i >= len(pieces) // 2:
+                raise ConnectionResetError("Injected disconnect")
+            if delay:
+                await asyncio.sleep(delay)
+            yield piece
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="Stub LLM server")
+    stub = StubLLM(args)
+
+    async def handle(request: Request, json_mode_of, frame_stream, frame_whole):
+        body = await request.json()
+        stub.stats["requests"] += 1
+        if stub.roll(args.failure_rate):
+            stub.stats["failed"] += 1
+            return JSONResponse({"error": "Injected failure"}, status_code=503)
+
+        model = body.get("model", "stub")
+        messages = body.get("messages", [])
+        empty = stub.roll(args.empty_rate)
+        disconnect = stub.roll(args.disconnect_rate)
+        stub.stats["empty"] += empty
+        stub.stats["disconnected"] += disconnect
+        content = stub.answer(messages, json_mode_of(body))
+        await stub.first_token_delay()
+
+        if body.get("stream", True):
+            async def events():
+                count = 0
+                async for piece in stub.pieces(content, empty, disconnect):
+                    count += 1
+                    yield frame_stream(model, piece, None)
+                yield frame_stream(model, "", count)
+            media_type = "text/event-stream" if request.url.path.startswith("/v1") else "application/x-ndjson"
+            return StreamingResponse(events(), media_type=media_type)
+
+        whole = "".join([piece async for piece in stub.pieces(content, empty, disconnect)])
+        return JSONResponse(frame_whole(model, whole))
+
+    # Ollama
+
+    def ollama_chunk(model: str, piece: str, done_count: Optional[int]) -> str:
+        message: Dict[str, Any] = {
+            "model": model,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "message": {"role": "assistant", "content": piece},
+            "done": done_count is not None,
+        }
+        if done_count is not None:
+            message.update(done_reason="stop", eval_count=done_count)
+        return json.dumps(message) + "\n"
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        return await handle(
+            request,
+            lambda body: body.get("format") == "json",
+            ollama_chunk,
+            lambda model, content: {
+                "model": model,
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                "done_reason": "stop",
+            }
+        )
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": args.model, "model": args.model}]}
+
+    # OpenAI-compatible
+
+    def openai_chunk(model: str, piece: str, done_count: Optional[int]) -> str:
+        chunk = {
+            "object": "chat.completion.chunk",
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "delta": {"content": piece} if piece else {},
+                "finish_reason": "stop" if done_count is not None else None,
+            }],
+        }
+        frame = f"data: {json.dumps(chunk)}\n\n"
+        return frame + "data: [DONE]\n\n" if done_count is not None else frame
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        return await handle(
+            request,
+            lambda body: (body.get("response_format") or {}).get("type") == "json_object",
+            openai_chunk,
+            lambda model, content: {
+                "object": "chat.completion",
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+            }
+        )
+
+    @app.get("/v1/models")
+    async def openai_models():
+        return {"object": "list", "data": [{"id": args.model, "object": "model"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return {**stub.stats, "recordings": len(stub.recordings)}
+
+    return app
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="stub", help="Model name reported by /api/tags and /v1/models")
+    parser.add_argument("--recordings", nargs="*", default=[], help="JSONL files of recorded responses to replay")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="Extra random seconds (0..jitter) before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Streaming rate, 0 for no delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with HTTP 503")
+    parser.add_argument("--empty-rate", type=float, default=0.0, help="Share of requests answered with whitespace only")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Share of responses cut off halfway")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and failure injection")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="warning")
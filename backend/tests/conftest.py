@@ -0,0 +1,29 @@
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings are read when app.config is first imported, so point the app at
+# a throwaway file database and upload dir before any test imports it
+_tmp = Path(tempfile.mkdtemp(prefix="syllabus-tests-"))
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{_tmp / 'test.db'}")
+os.environ.setdefault("UPLOAD_DIR", str(_tmp / "uploads"))
+
+FIXTURES = Path(__file__).resolve().parent.parent / "uploads"
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh event loop, then drop pooled connections bound to it."""
+    def runner(coro):
+        from app.db.database import engine
+
+        async def wrapped():
+            try:
+                return await coro
+            finally:
+                await engine.dispose()
+        return asyncio.run(wrapped())
+    return runner
@@ -0,0 +1,50 @@
+from starlette.requests import Request
+
+from app.db import crud
+from app.routers.export import _assignments, _export_response
+from app.services.calendar_export import iter_json_export
+from app.services.response_cache import export_cache
+
+
+def get_request():
+    return Request({"type": "http", "method": "GET", "path": "/api/export/json", "headers": [], "query_string": b""})
+
+
+async def export_json(db, during_render=None):
+    """Render the JSON export through the cache, running ``during_render`` after the first chunk."""
+    response = await _export_response(
+        get_request(), db, "json", None, lambda: iter_json_export(_assignments(None)),
+        "application/json", "assignments.json"
+    )
+    body = b""
+    async for chunk in response.body_iterator:
+        if during_render and not body:
+            await during_render()
+        body += chunk
+    return body
+
+
+def test_export_changed_while_rendering_is_not_cached(run):
+    from app.db.database import async_session, init_db
+
+    async def scenario():
+        await init_db()
+        async with async_session() as db:
+            [(syllabus, _)] = await crud.create_syllabi_with_jobs(db, [("s.txt", "missing.txt")])
+            await crud.create_assignments_bulk(db, syllabus.id, [{"title": "Homework 1"}])
+
+        async def write():
+            async with async_session() as db:
+                await crud.create_assignments_bulk(db, syllabus.id, [{"title": "Homework 2"}])
+
+        entries = export_cache.stats()["entries"]
+        async with async_session() as db:
+            await export_json(db, during_render=write)
+        raced = export_cache.stats()["entries"] - entries
+
+        async with async_session() as db:
+            await export_json(db)
+        settled = export_cache.stats()["entries"] - entries
+        return raced, settled
+
+    assert run(scenario()) == (0, 1)
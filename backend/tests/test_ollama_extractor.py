@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.llm_endpoints import EndpointPool
+from app.services.ollama_extractor import OllamaExtractor
+
+
+def test_failed_chunk_cancels_the_other_chunks():
+    extractor = OllamaExtractor()
+    titles = []
+    finished = []
+
+    async def fake_chat(chunk, on_title=None):
+        if chunk == "bad":
+            await asyncio.sleep(0.01)
+            raise RuntimeError("chunk failed")
+        await asyncio.sleep(0.05)
+        await on_title(f"title from {chunk}")
+        finished.append(chunk)
+        return '{"assignments": ["Homework 1"]}'
+
+    async def on_title(title):
+        titles.append(title)
+
+    extractor._chat = fake_chat
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="chunk failed"):
+            await extractor._extract_chunks(["good", "bad", "slow"], on_title)
+        # Give any leftover task time to run its callback
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert titles == []
+    assert finished == []
+
+
+def extractor_with_servers(handlers):
+    """Extractor talking to fake Ollama servers, one httpx handler per URL."""
+    extractor = OllamaExtractor()
+
+    def handle(request):
+        return handlers[f"{request.url.scheme}://{request.url.host}"](request)
+
+    extractor._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    extractor.endpoints = EndpointPool(list(handlers), extractor._get_client, None)
+    return extractor
+
+
+def ollama_answer(request):
+    content = json.dumps({"assignments": ["Homework 1", "Final exam", "Quiz 2"]})
+    return httpx.Response(200, text=json.dumps({"message": {"content": content}, "done": True}) + "\n")
+
+
+def raise_error(error):
+    def handler(request):
+        raise error("injected", request=request)
+    return handler
+
+
+def test_pool_timeout_is_not_retried_or_blamed_on_the_endpoint():
+    # The connection limit belongs to the client, so another endpoint would wait on it too
+    called = []
+
+    def ok(request):
+        called.append(request.url.host)
+        return ollama_answer(request)
+
+    extractor = extractor_with_servers({"http://busy": raise_error(httpx.PoolTimeout), "http://ok": ok})
+
+    async def scenario():
+        try:
+            with pytest.raises(ConnectionError, match="PoolTimeout"):
+                await extractor.extract_assignments("Homework 1 due Sept 5")
+        finally:
+            await extractor.close()
+
+    asyncio.run(scenario())
+    assert called == []
+    assert extractor.endpoints.retries == 0
+    busy = extractor.endpoints.endpoints[0]
+    assert busy.counters["errors"] == 0 and busy.breaker == "closed"
+
+
+@pytest.mark.parametrize("error", [httpx.ReadTimeout, httpx.RemoteProtocolError, httpx.ConnectTimeout])
+def test_transport_errors_become_connection_errors(error):
+    extractor = extractor_with_servers({"http://down": raise_error(error)})
+
+    async def scenario():
+        try:
+            with pytest.raises(ConnectionError):
+                await extractor.extract_assignments("Homework 1 due Sept 5")
+        finally:
+            await extractor.close()
+
+    asyncio.run(scenario())
+
+
+def test_client_pool_fits_every_endpoint(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ollama_max_connections", 10)
+    monkeypatch.setattr(settings, "ollama_endpoint_concurrency", 4)
+    extractor = OllamaExtractor()
+    extractor.endpoints = EndpointPool(["http://a", "http://b", "http://c"], extractor._get_client, None)
+
+    # Four request slots and a health check per endpoint
+    assert extractor.max_connections == 15
+    assert extractor.pool_stats()["max_connections"] == 15
+    client = extractor._get_client()
+    assert client._transport._pool._max_connections == 15
+    asyncio.run(extractor.close())
+
+    extractor.endpoints = EndpointPool(["http://a"], extractor._get_client, None)
+    assert extractor.max_connections == 10
+
+
+def test_titles_from_a_discarded_variant_are_left_out_of_the_result(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ollama_fallback_strategy", "sequential")
+    monkeypatch.setattr(settings, "ollama_chunking", False)
+    extractor = OllamaExtractor()
+    answer = json.dumps({"assignments": ["Homework 1", "Final exam", "Quiz 2"]})
+
+    async def fake_complete(messages, json_mode, on_title=None, abort_if_empty=False):
+        if json_mode:
+            # Streams one title, then the response turns out too short to use
+            await on_title("Quiz 9")
+            return '{"assignments": ["Quiz 9"'
+        for title in json.loads(answer)["assignments"]:
+            await on_title(title)
+        return answer
+
+    extractor._complete = fake_complete
+    streamed = []
+
+    async def on_assignment(assignment):
+        streamed.append(assignment["title"])
+
+    result = asyncio.run(extractor.extract_assignments("Homework 1 due Sept 5", on_assignment))
+    assert streamed == ["Quiz 9", "Homework 1", "Final exam", "Quiz 2"]
+    assert [a["title"] for a in result["assignments"]] == ["Homework 1", "Final exam", "Quiz 2"]
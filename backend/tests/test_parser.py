@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.services.parser import DocumentParser, _count_pdf_pages
+from tests.conftest import FIXTURES
+
+
+def write_pdf(path, texts, lines):
+    """One-page PDF with Helvetica text at (x, y) and stroked (x1, y1, x2, y2) lines, origin bottom left."""
+    ops = ["0.5 w"] + [f"{x1} {y1} m {x2} {y2} l S" for x1, y1, x2, y2 in lines]
+    ops += [f"BT /F1 11 Tf {x} {y} Td ({text}) Tj ET" for x, y, text in texts]
+    stream = "\n".join(ops).encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def table(top, cells):
+    """Ruled two-column table of 20pt rows starting at top: (lines, texts)."""
+    bottom = top - 20 * len(cells)
+    lines = [(72, top - 20 * i, 372, top - 20 * i) for i in range(len(cells) + 1)]
+    lines += [(x, bottom, x, top) for x in (72, 222, 372)]
+    texts = []
+    for i, (left, right) in enumerate(cells):
+        texts += [(76, top - 20 * i - 14, left), (226, top - 20 * i - 14, right)]
+    return lines, texts
+
+
+def test_text_around_tables_keeps_reading_order(tmp_path):
+    schedule_lines, schedule_texts = table(700, [("Week", "Topic"), ("1", "Intro"), ("2", "Homework 1 due")])
+    grading_lines, grading_texts = table(560, [("Item", "Weight"), ("Exams", "60%")])
+    pdf = tmp_path / "syllabus.pdf"
+    write_pdf(pdf, [
+        (72, 740, "Course schedule"),
+        *schedule_texts,
+        (400, 670, "Office hours Tue"),
+        (72, 610, "Grading"),
+        *grading_texts,
+        (72, 490, "Final exam December 10"),
+    ], schedule_lines + grading_lines)
+
+    blocks = DocumentParser().parse_structured(pdf)["pages"][0]["blocks"]
+
+    assert [block.get("text") or block["rows"] for block in blocks] == [
+        "Course schedule",
+        [["Week", "Topic"], ["1", "Intro"], ["2", "Homework 1 due"]],
+        "Office hours Tue",
+        "Grading",
+        [["Item", "Weight"], ["Exams", "60%"]],
+        "Final exam December 10",
+    ]
+
+
+def test_pool_restart_reruns_other_jobs_on_the_new_pool(run, monkeypatch):
+    monkeypatch.setattr(settings, "parse_workers", 1)
+    parser = DocumentParser()
+    pdf = str(sorted(FIXTURES.glob("*.pdf"))[0])
+
+    async def scenario():
+        # One worker: the page count queues behind the stuck call
+        stuck = asyncio.create_task(parser._run_in_pool(time.sleep, 60))
+        queued = asyncio.create_task(parser._run_in_pool(_count_pdf_pages, pdf))
+        await asyncio.sleep(0.5)
+
+        # What parse_structured_async does when the stuck job times out
+        stuck.cancel()
+        parser._kill_pool()
+        return await asyncio.wait_for(queued, 60)
+
+    try:
+        assert run(scenario()) == _count_pdf_pages(pdf)
+    finally:
+        parser.shutdown()
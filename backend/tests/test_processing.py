@@ -0,0 +1,219 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.db import crud
+from app.services.processing import ProcessingQueue
+
+
+def test_worker_survives_a_job_that_raises(run, monkeypatch):
+    queue = ProcessingQueue()
+    jobs = [SimpleNamespace(id=1, attempts=1), SimpleNamespace(id=2, attempts=1)]
+    processed = []
+
+    async def claim_next_job(db):
+        return jobs.pop(0) if jobs else None
+
+    async def process_job(job):
+        processed.append(job.id)
+        if job.id == 1:
+            raise RuntimeError("database went away")
+
+    monkeypatch.setattr(crud, "claim_next_job", claim_next_job)
+    queue._process_job = process_job
+
+    async def scenario():
+        queue._wakeup = asyncio.Event()
+        worker = asyncio.create_task(queue._worker(0))
+        await asyncio.sleep(0.1)
+        alive = not worker.done()
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+        return alive
+
+    assert run(scenario())
+    assert processed == [1, 2]
+
+
+def test_streamed_assignments_are_written_in_batches(run, monkeypatch):
+    from app.config import settings
+    from app.db.database import async_session, init_db
+
+    monkeypatch.setattr(settings, "persist_batch_size", 2)
+    queue = ProcessingQueue()
+    writes = []
+    create_assignments_bulk = crud.create_assignments_bulk
+
+    async def recording_bulk(db, syllabus_id, assignments, **kwargs):
+        writes.append((len(assignments), kwargs.get("status")))
+        return await create_assignments_bulk(db, syllabus_id, assignments, **kwargs)
+
+    async def fake_extract(db, file_path, on_assignment, on_stage):
+        assignments = [{"title": f"Homework {i}", "assignment_type": "homework"} for i in range(5)]
+        for assignment in assignments:
+            await on_assignment(assignment)
+        return "", {"course_info": {"course_name": "CS 101"}, "assignments": assignments}, True
+
+    monkeypatch.setattr(crud, "create_assignments_bulk", recording_bulk)
+    queue._extract = fake_extract
+
+    async def scenario():
+        await init_db()
+        queue._persist_limit = asyncio.Semaphore(1)
+        async with async_session() as db:
+            [(syllabus, job)] = await crud.create_syllabi_with_jobs(db, [("s.txt", "missing.txt")])
+        await queue._process_job(job)
+        async with async_session() as db:
+            rows = await crud.get_all_assignments(db, syllabus.id)
+            summary, _ = await crud.get_syllabus_summary(db, syllabus.id)
+        return [(row.title, row.course_name) for row in rows], summary.processing_status
+
+    rows, status = run(scenario())
+    assert writes == [(2, None), (2, None), (1, "completed")]
+    assert sorted(rows) == [(f"Homework {i}", "CS 101") for i in range(5)]
+    assert status == "completed"
+
+
+def test_bulk_insert_keeps_missing_estimates_null(run):
+    from app.db.database import async_session, init_db
+
+    async def scenario():
+        await init_db()
+        async with async_session() as db:
+            [(syllabus, _)] = await crud.create_syllabi_with_jobs(db, [("s.txt", "missing.txt")])
+            await crud.create_assignments_bulk(db, syllabus.id, [
+                {"title": "Quiz 1", "assignment_type": "quiz", "estimated_hours": None},
+                {"title": "Homework 1", "assignment_type": "homework", "estimated_hours": 2.0},
+            ])
+            rows = await crud.get_all_assignments(db, syllabus.id)
+        return {row.title: row.estimated_hours for row in rows}
+
+    assert run(scenario()) == {"Quiz 1": None, "Homework 1": 2.0}
+
+
+def test_streamed_quizzes_keep_no_time_estimate(run, monkeypatch):
+    from app.config import settings
+    from app.db.database import async_session, init_db
+
+    # Two rows go in with a batch flush, the third with the final status
+    monkeypatch.setattr(settings, "persist_batch_size", 2)
+    queue = ProcessingQueue()
+
+    async def fake_extract(db, file_path, on_assignment, on_stage):
+        assignments = [
+            {"title": f"Quiz #{i}: blocking and other things!", "assignment_type": "quiz", "estimated_hours": None}
+            for i in range(3)
+        ]
+        for assignment in assignments:
+            await on_assignment(assignment)
+        return "", {"course_info": {}, "assignments": assignments}, True
+
+    queue._extract = fake_extract
+
+    async def scenario():
+        await init_db()
+        queue._persist_limit = asyncio.Semaphore(1)
+        async with async_session() as db:
+            [(syllabus, job)] = await crud.create_syllabi_with_jobs(db, [("s.txt", "missing.txt")])
+        await queue._process_job(job)
+        async with async_session() as db:
+            return [row.estimated_hours for row in await crud.get_all_assignments(db, syllabus.id)]
+
+    assert run(scenario()) == [None, None, None]
+
+
+def test_recovery_clears_rows_written_by_the_interrupted_attempt(run, tmp_path):
+    from app.db.database import async_session, init_db
+
+    retried_upload = tmp_path / "retried.txt"
+    failed_upload = tmp_path / "failed.txt"
+    retried_upload.write_text("retry me")
+    failed_upload.write_text("give up")
+
+    async def scenario():
+        await init_db()
+        async with async_session() as db:
+            [(retried, retried_job), (failed, failed_job)] = await crud.create_syllabi_with_jobs(
+                db, [("a.txt", str(retried_upload)), ("b.txt", str(failed_upload))]
+            )
+            # Both crashed mid-write; the second has no attempts left
+            retried_job.status = failed_job.status = "running"
+            retried_job.attempts, failed_job.attempts = 1, 3
+            for syllabus in (retried, failed):
+                await crud.create_assignments_bulk(db, syllabus.id, [{"title": "Homework 1", "assignment_type": "homework"}])
+            requeued, failed_jobs = await crud.recover_interrupted_jobs(db, max_attempts=3)
+            remaining = [
+                len(await crud.get_all_assignments(db, syllabus.id)) for syllabus in (retried, failed)
+            ]
+            await db.refresh(retried_job)
+        return requeued, [job.id for job in failed_jobs] == [failed_job.id], remaining, retried_job.status
+
+    assert run(scenario()) == (1, True, [0, 0], "queued")
+
+
+def test_rule_extractor_failure_falls_back_to_the_llm(run, monkeypatch, tmp_path):
+    from app.db.database import async_session, init_db
+    from app.services import processing
+
+    queue = ProcessingQueue()
+    file_path = tmp_path / "schedule.pdf"
+    file_path.write_bytes(b"rules fallback test")
+    document = {"pages": [{"blocks": [{"type": "text", "text": "Week 3 | Feb 29 | Quiz 1"}]}]}
+
+    async def parse_structured_async(path, content_key=None):
+        return document
+
+    def broken_rules(text):
+        raise ValueError("day is out of range for month")
+
+    async def extract_assignments(text, on_assignment=None):
+        return {"course_info": {}, "assignments": [{"title": "Quiz 1", "assignment_type": "quiz"}]}
+
+    monkeypatch.setattr(processing.settings, "rules_extractor_enabled", True)
+    monkeypatch.setattr(processing.parser, "parse_structured_async", parse_structured_async)
+    monkeypatch.setattr(processing.rule_extractor, "extract", broken_rules)
+    monkeypatch.setattr(processing.ollama_extractor, "extract_assignments", extract_assignments)
+
+    async def scenario():
+        await init_db()
+        queue._parse_limit = asyncio.Semaphore(1)
+        queue._llm_limit = asyncio.Semaphore(1)
+
+        async def on_assignment(assignment):
+            pass
+
+        async with async_session() as db:
+            return await queue._extract(db, file_path, on_assignment, lambda stage: None)
+
+    _, result, streamed = run(scenario())
+    assert streamed
+    assert [a["title"] for a in result["assignments"]] == ["Quiz 1"]
+    assert result["extraction"]["path"] in ("llm", "llm_filtered")
+
+
+def test_rows_streamed_from_a_discarded_response_are_removed(run, monkeypatch):
+    from app.config import settings
+    from app.db.database import async_session, init_db
+
+    # "Quiz 9" is flushed on its own before the fallback answer arrives
+    monkeypatch.setattr(settings, "persist_batch_size", 1)
+    queue = ProcessingQueue()
+
+    async def fake_extract(db, file_path, on_assignment, on_stage):
+        await on_assignment({"title": "Quiz 9", "assignment_type": "quiz"})
+        kept = [{"title": "Homework 1", "assignment_type": "homework"}, {"title": "Quiz 2", "assignment_type": "quiz"}]
+        for assignment in kept:
+            await on_assignment(assignment)
+        return "", {"course_info": {}, "assignments": kept}, True
+
+    queue._extract = fake_extract
+
+    async def scenario():
+        await init_db()
+        queue._persist_limit = asyncio.Semaphore(1)
+        async with async_session() as db:
+            [(syllabus, job)] = await crud.create_syllabi_with_jobs(db, [("s.txt", "missing.txt")])
+        await queue._process_job(job)
+        async with async_session() as db:
+            return sorted(row.title for row in await crud.get_all_assignments(db, syllabus.id))
+
+    assert run(scenario()) == ["Homework 1", "Quiz 2"]
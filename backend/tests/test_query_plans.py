@@ -0,0 +1,82 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.db import crud
+from app.db.database import async_session, engine, init_db
+
+
+async def query_plans(call):
+    """EXPLAIN QUERY PLAN details of every SELECT the crud call runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    await init_db()
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with async_session() as db:
+            await call(db)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" / ".join(row[-1] for row in result.all()))
+    return plans
+
+
+@pytest.mark.parametrize("name, call, index", [
+    (
+        "assignments of a syllabus",
+        lambda db: crud.get_all_assignments(db, syllabus_id=1),
+        "ix_assignments_syllabus_due_date",
+    ),
+    (
+        "upcoming assignments",
+        crud.get_upcoming_assignments,
+        "ix_assignments_due_date",
+    ),
+    (
+        "assignments of a syllabus by title",
+        lambda db: crud.update_assignments_by_title(db, 1, "Homework 1", {"notes": "x"}),
+        "ix_assignments_syllabus_title",
+    ),
+    (
+        "assignments of a syllabus by due date",
+        lambda db: crud.list_assignments(db, syllabus_id=1, sort="due_date"),
+        "ix_assignments_syllabus_due_date",
+    ),
+    (
+        "keyset page after a cursor",
+        lambda db: crud.list_assignments(
+            db, syllabus_id=1, cursor=crud._encode_cursor("due_date", False, date(2026, 9, 1), 5)
+        ),
+        "ix_assignments_syllabus_due_date",
+    ),
+    (
+        "assignments due in a range",
+        lambda db: crud.list_assignments(db, due_after=date(2026, 9, 1), due_before=date(2026, 12, 1)),
+        "ix_assignments_due_date",
+    ),
+    (
+        "assignments of a type",
+        lambda db: crud.list_assignments(db, assignment_type="exam"),
+        "ix_assignments_type_due_date",
+    ),
+    (
+        "queue claim",
+        crud.claim_next_job,
+        "ix_processing_jobs_status",
+    ),
+])
+def test_hot_queries_use_their_index(run, name, call, index):
+    plans = run(query_plans(call))
+    assert plans, f"{name} ran no SELECT"
+    assert index in plans[0], f"{name}: {plans[0]}"
+    assert "SCAN" not in plans[0], f"{name}: {plans[0]}"
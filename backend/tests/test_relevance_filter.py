@@ -0,0 +1,13 @@
+from benchmarks.relevance_filter import recall_report
+from tests.conftest import FIXTURES
+
+
+def test_filter_keeps_the_assignments_of_fixture_syllabi():
+    report = recall_report(sorted(FIXTURES.glob("*.pdf")))
+
+    assert report
+    assert any(row["filtered"] for row in report)
+    for row in report:
+        assert row["rules"]["recall"] == 1.0, row
+        # The keyword oracle also picks up prose lines, which the filter may drop
+        assert row["fake_llm"]["recall"] >= 0.9, row
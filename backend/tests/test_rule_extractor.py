@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from app.services.rule_extractor import RuleBasedExtractor
+
+
+@pytest.mark.parametrize("token, year, term, expected", [
+    ("Sep 5", 2024, "fall", date(2024, 9, 5)),
+    ("Jan 15", 2024, "fall", date(2025, 1, 15)),
+    # Fall 2023 runs into 2024, which has a Feb 29
+    ("Feb 29", 2023, "fall", date(2024, 2, 29)),
+    # ... and Fall 2024 into 2025, which doesn't
+    ("Feb 29", 2024, "fall", None),
+    ("Feb 29", 2024, "spring", date(2024, 2, 29)),
+    ("Feb 29", 2023, "spring", None),
+    ("2/14/2025", 2024, "fall", date(2025, 2, 14)),
+])
+def test_parse_date_picks_the_term_year(token, year, term, expected):
+    assert RuleBasedExtractor._parse_date(token, year, term) == expected
+
+
+def test_undated_leap_day_in_a_fall_schedule_is_skipped():
+    text = "\n".join([
+        "CS 101 Fall 2024",
+        "Week 1 | Sep 5 | Homework 1",
+        "Week 2 | Sep 12 | Homework 2",
+        "Week 3 | Feb 29 | Quiz 1",
+    ])
+    result = RuleBasedExtractor().extract(text)
+
+    assert [a["title"] for a in result["assignments"]] == ["Homework 1", "Homework 2"]
+    assert result["unresolved"] == 1
+
+
+def test_weight_is_read_from_its_own_cell():
+    text = "\n".join([
+        "CS 101 Spring 2025",
+        "Week 2 | Feb 3 | Homework 1 | 5%",
+        "Week 4 | Feb 17 | Midterm exam (25%)",
+        "Week 6 | Mar 3 | Quiz 1; Quiz 2 | 10%",
+        "Final project due May 2 | 30%",
+    ])
+    weights = {a["title"]: a["weight_percentage"] for a in RuleBasedExtractor().extract(text)["assignments"]}
+
+    assert weights == {
+        "Homework 1": 5.0,
+        "Midterm exam": 25.0,
+        # Shared by two items, so it can't be pinned on either
+        "Quiz 1": None,
+        "Quiz 2": None,
+        "Final project": 30.0,
+    }
+
+
+def test_participation_is_not_an_assignment():
+    text = "Week 1 | Sep 5 | Homework 1\nWeek 2 | Sep 12 | Class participation quiz\nWeek 3 | Sep 19 | Homework 2"
+    titles = [a["title"] for a in RuleBasedExtractor().extract(text)["assignments"]]
+
+    assert titles == ["Homework 1", "Homework 2"]
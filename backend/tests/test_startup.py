@@ -0,0 +1,19 @@
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+def test_app_imports_and_initialises_file_database(run):
+    import app.main  # noqa: F401  (creating the engine used to raise TypeError)
+    from app.config import settings
+    from app.db.database import async_session, engine, init_db
+
+    assert settings.database_url.endswith("test.db")
+    assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+    assert engine.pool.size() == settings.database_pool_size
+
+    async def check():
+        await init_db()
+        async with async_session() as db:
+            return (await db.execute(text("PRAGMA journal_mode"))).scalar()
+
+    assert run(check()).lower() == settings.sqlite_journal_mode.lower()
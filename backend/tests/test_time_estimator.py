@@ -0,0 +1,38 @@
+import pytest
+
+from app.services.keyword_classifier import detect_type
+from app.services.time_estimator import TimeEstimator
+from benchmarks.time_estimator import ReferenceEstimator, generate_assignments, reference_detect_type
+
+
+@pytest.mark.parametrize("title, description", [
+    ("Chaptermajor", None),               # "term" spans "chapter" and "major"
+    ("Finalab writeup", None),            # "final" and "lab" share the "l"
+    ("Midterm review", "term project"),   # "term" nested in "midterm"
+    ("Quick research analysis", None),    # order-dependent multipliers
+    ("Essay", "12 pages, 3000 words"),    # two length units, pages wins
+    ("Problem set", "0 pages or 8 problems"),
+    ("Reading", "Chapters 3 and 4"),      # no number before the unit
+    ("In-class participation", None),
+])
+def test_matches_reference_on_tricky_titles(title, description):
+    reference, estimator = ReferenceEstimator(), TimeEstimator()
+    for assignment_type in ("homework", "paper", "reading", "exam", "other"):
+        assert estimator.estimate(assignment_type, title, description) == \
+            reference.estimate(assignment_type, title, description)
+
+
+def test_keyword_spanning_two_words_counts():
+    # "term" (1.8) hides across "chapter" and "major" (1.5); one scan for
+    # non-overlapping matches only saw the latter
+    assert TimeEstimator().estimate("reading", "chaptermajor") == 2.0
+
+
+def test_matches_reference_on_random_titles():
+    rows = generate_assignments(5000, seed=1, glued=0.5)
+    reference, estimator = ReferenceEstimator(), TimeEstimator()
+
+    expected = reference.estimate_batch(rows)
+    assert estimator.estimate_batch(rows) == expected
+    assert [estimator.estimate(a["assignment_type"], a["title"], a["description"]) for a in rows] == expected
+    assert [detect_type(a["title"]) for a in rows] == [reference_detect_type(a["title"]) for a in rows]
@@ -2,7 +2,14 @@ import { useState, useCallback } from 'react'
 import { useDropzone } from 'react-dropzone'
 import { useMutation, useQueryClient } from '@tanstack/react-query'
 import { Upload, FileText, CheckCircle, AlertCircle, Loader2 } from 'lucide-react'
-import { uploadSyllabus, getUploadStatus } from '../services/api'
+import { uploadSyllabus, getUploadStatus, subscribeToUploadEvents } from '../services/api'
+
+const STAGE_LABELS = {
+  queued: 'Waiting in queue',
+  parsing: 'Reading document',
+  extracting: 'Extracting assignments and due dates',
+  persisting: 'Saving assignments',
+}
 
 export default function FileUpload({ onUploadComplete }) {
   const [uploadState, setUploadState] = useState('idle') // idle, uploading, processing, complete, error
@@ -14,25 +21,30 @@ export default function FileUpload({ onUploadComplete }) {
     mutationFn: uploadSyllabus,
     onSuccess: async (data) => {
       setUploadState('processing')
-      // Poll for completion
+
+      const handleComplete = async () => {
+        setUploadState('complete')
+        // Invalidate and refetch all related queries
+        await Promise.all([
+          queryClient.invalidateQueries({ queryKey: ['assignments'] }),
+          queryClient.invalidateQueries({ queryKey: ['syllabi'] }),
+        ])
+        // Force immediate refetch
+        await Promise.all([
+          queryClient.refetchQueries({ queryKey: ['assignments'] }),
+          queryClient.refetchQueries({ queryKey: ['syllabi'] }),
+        ])
+        if (onUploadComplete) onUploadComplete(data.id)
+      }
+
+      // Poll for completion (fallback when the event stream is unavailable)
       const pollStatus = async () => {
         try {
           const status = await getUploadStatus(data.id)
           setProcessingStatus(status)
 
           if (status.status === 'completed') {
-            setUploadState('complete')
-            // Invalidate and refetch all related queries
-            await Promise.all([
-              queryClient.invalidateQueries({ queryKey: ['assignments'] }),
-              queryClient.invalidateQueries({ queryKey: ['syllabi'] }),
-            ])
-            // Force immediate refetch
-            await Promise.all([
-              queryClient.refetchQueries({ queryKey: ['assignments'] }),
-              queryClient.refetchQueries({ queryKey: ['syllabi'] }),
-            ])
-            if (onUploadComplete) onUploadComplete(data.id)
+            await handleComplete()
           } else if (status.status.startsWith('failed')) {
             setUploadState('error')
             setError(status.status)
@@ -44,7 +56,31 @@ export default function FileUpload({ onUploadComplete }) {
           setError('Failed to check processing status')
         }
       }
-      pollStatus()
+
+      // Follow progress pushed by the server
+      let found = 0
+      const unsubscribe = subscribeToUploadEvents(data.id, {
+        onStatus: (status) => {
+          setProcessingStatus((prev) => ({
+            ...prev,
+            ...status,
+            assignment_count: status.assignment_count ?? found,
+          }))
+          if (status.status === 'completed') {
+            unsubscribe()
+            handleComplete()
+          } else if (status.status === 'failed') {
+            unsubscribe()
+            setUploadState('error')
+            setError(status.error || 'Processing failed')
+          }
+        },
+        onAssignment: () => {
+          found += 1
+          setProcessingStatus((prev) => ({ ...prev, assignment_count: found }))
+        },
+        onError: () => pollStatus(),
+      })
     },
     onError: (err) => {
       setUploadState('error')
@@ -122,9 +158,14 @@ export default function FileUpload({ onUploadComplete }) {
         </h3>
         <p className="mt-2 text-sm text-blue-600">
           {uploadState === 'processing'
-            ? 'Extracting assignments and due dates'
+            ? STAGE_LABELS[processingStatus?.status] || 'Extracting assignments and due dates'
             : 'Please wait'}
         </p>
+        {uploadState === 'processing' && processingStatus?.assignment_count > 0 && (
+          <p className="mt-1 text-xs text-blue-500">
+            {processingStatus.assignment_count} assignments found so far
+          </p>
+        )}
       </div>
     )
   }
@@ -41,7 +41,7 @@ export default function SyllabusList() {
                 {syllabus.course_name || syllabus.filename}
               </p>
               <p className="text-xs text-gray-500">
-                {syllabus.assignments?.length || 0} assignments
+                {syllabus.assignment_count || 0} assignments
               </p>
             </div>
           </div>
@@ -19,6 +19,18 @@ export const getUploadStatus = async (syllabusId) => {
   return response.data
 }
 
+// Follow processing progress over Server-Sent Events; returns a function that closes the stream
+export const subscribeToUploadEvents = (syllabusId, { onStatus, onAssignment, onError }) => {
+  const source = new EventSource(`/api/upload/events/${syllabusId}`)
+  source.addEventListener('status', (event) => onStatus?.(JSON.parse(event.data)))
+  source.addEventListener('assignment', (event) => onAssignment?.(JSON.parse(event.data)))
+  source.onerror = (event) => {
+    source.close()
+    onError?.(event)
+  }
+  return () => source.close()
+}
+
 export const getUploadHistory = async () => {
   const response = await api.get('/upload/history')
   return response.data
@@ -30,10 +42,23 @@ export const deleteSyllabus = async (syllabusId) => {
 }
 
 // Assignment endpoints
+
+// Largest page the server allows (assignments_max_page_size)
+const ASSIGNMENTS_PAGE_SIZE = 1000
+
+// The list is paged; follow the X-Next-Cursor header until the last page
 export const getAssignments = async (syllabusId = null) => {
-  const params = syllabusId ? { syllabus_id: syllabusId } : {}
-  const response = await api.get('/assignments', { params })
-  return response.data
+  const params = { limit: ASSIGNMENTS_PAGE_SIZE }
+  if (syllabusId) params.syllabus_id = syllabusId
+
+  const assignments = []
+  let cursor = null
+  do {
+    const response = await api.get('/assignments', { params: cursor ? { ...params, cursor } : params })
+    assignments.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return assignments
 }
 
 export const getUpcomingAssignments = async (days = 14) => {